@@ -0,0 +1,80 @@
+#!/usr/bin/env python
+"""
+Comparativa de rendimiento: una petición por tarea vs peticiones bulk
+
+Requiere el servidor de prueba corriendo: python test_server.py
+"""
+
+import sys
+import argparse
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core.batch_processor import BatchProcessor
+from services.batch_adapter import JSONArrayBatchAdapter, MultiGetBatchAdapter
+from models.task import Task, HTTPMethod
+from config.settings import config
+import requests
+
+def build_tasks(num_tasks: int):
+    """Mezcla de GET y PATCH contra el servidor de prueba"""
+    return [
+        Task(method=HTTPMethod.GET, endpoint=f"/users/{i % 100}") if i % 2 == 0 else
+        Task(method=HTTPMethod.PATCH, endpoint=f"/users/{i % 100}", data={"status": "active"})
+        for i in range(num_tasks)
+    ]
+
+def run(name: str, processor: BatchProcessor, num_tasks: int):
+    """Ejecuta un batch y devuelve tareas/segundo"""
+    processor.start()
+    try:
+        tasks = build_tasks(num_tasks)
+        start_time = time.time()
+        processor.process_batch_sync(tasks)
+        elapsed_time = time.time() - start_time
+        stats = processor.get_statistics()
+    finally:
+        processor.stop()
+
+    throughput = num_tasks / elapsed_time
+    requests_sent = stats.get("bulk", {}).get("bulk_requests", 0) or num_tasks
+    print(f"  {name:<22} {elapsed_time:8.2f} s  {throughput:8.1f} tareas/s  "
+          f"peticiones ~{requests_sent}  éxito {stats['success_rate']:.1f}%")
+    return throughput
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tasks", type=int, default=1000)
+    parser.add_argument("--workers", type=int, default=config.NUM_WORKERS)
+    parser.add_argument("--batch-size", type=int, default=config.BATCH_SIZE)
+    parser.add_argument("--linger", type=float, default=config.BATCH_LINGER)
+    parser.add_argument("--base-url", default="http://localhost:5000")
+    args = parser.parse_args()
+
+    try:
+        requests.get(f"{args.base_url}/health", timeout=1)
+    except requests.exceptions.RequestException:
+        print("❌ Error: El servidor de prueba no está corriendo")
+        print("Por favor, ejecuta en otra terminal: python test_server.py")
+        return
+
+    config.API_BASE_URL = args.base_url
+    config.ENABLE_TRANSACTION_LOGS = False
+    config.BATCH_SIZE = args.batch_size
+    config.BATCH_LINGER = args.linger
+
+    print(f"\n⚙️  {args.tasks} tareas GET/PATCH contra {args.base_url}\n")
+    single = run("una por tarea", BatchProcessor(num_workers=args.workers), args.tasks)
+    bulk = run(f"bulk (hasta {args.batch_size})", BatchProcessor(
+        num_workers=args.workers,
+        batch_adapters=[
+            MultiGetBatchAdapter("/users/{id}", "/users"),
+            JSONArrayBatchAdapter("/users/{id}", "/users/bulk", methods=[HTTPMethod.PATCH])
+        ]
+    ), args.tasks)
+    print(f"\n📊 Aceleración bulk vs una por tarea: x{bulk / single:.1f}")
+
+if __name__ == "__main__":
+    main()
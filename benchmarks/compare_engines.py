@@ -0,0 +1,75 @@
+#!/usr/bin/env python
+"""
+Comparativa de rendimiento: BatchProcessor (threads) vs AsyncBatchProcessor
+
+Requiere el servidor de prueba corriendo: python test_server.py
+"""
+
+import sys
+import argparse
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core.batch_processor import BatchProcessor
+from core.async_batch_processor import AsyncBatchProcessor
+from models.task import Task, HTTPMethod
+from config.settings import config
+import requests
+
+def build_tasks(num_tasks: int):
+    """Crea un batch de GET contra el servidor de prueba"""
+    return [
+        Task(method=HTTPMethod.GET, endpoint=f"/users/{i % 100}")
+        for i in range(num_tasks)
+    ]
+
+def run_engine(name: str, processor, num_tasks: int):
+    """Ejecuta un batch y devuelve tareas/segundo"""
+    processor.start()
+    try:
+        tasks = build_tasks(num_tasks)
+        start_time = time.time()
+        processor.process_batch_sync(tasks)
+        elapsed_time = time.time() - start_time
+    finally:
+        processor.stop()
+
+    stats = processor.get_statistics()
+    throughput = num_tasks / elapsed_time
+    print(f"  {name:<28} {elapsed_time:8.2f} s  {throughput:8.1f} tareas/s  "
+          f"éxito {stats['success_rate']:.1f}%")
+    return throughput
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tasks", type=int, default=500)
+    parser.add_argument("--workers", type=int, default=config.NUM_WORKERS)
+    parser.add_argument("--max-in-flight", type=int, default=200)
+    parser.add_argument("--base-url", default="http://localhost:5000")
+    args = parser.parse_args()
+
+    try:
+        requests.get(f"{args.base_url}/health", timeout=1)
+    except requests.exceptions.RequestException:
+        print("❌ Error: El servidor de prueba no está corriendo")
+        print("Por favor, ejecuta en otra terminal: python test_server.py")
+        return
+
+    config.API_BASE_URL = args.base_url
+    config.ENABLE_TRANSACTION_LOGS = False
+
+    print(f"\n⚙️  {args.tasks} tareas GET contra {args.base_url}\n")
+    threaded = run_engine(
+        f"threads ({args.workers} workers)",
+        BatchProcessor(num_workers=args.workers), args.tasks
+    )
+    async_ = run_engine(
+        f"asyncio ({args.max_in_flight} in-flight)",
+        AsyncBatchProcessor(max_in_flight=args.max_in_flight), args.tasks
+    )
+    print(f"\n📊 Aceleración asyncio vs threads: x{async_ / threaded:.1f}")
+
+if __name__ == "__main__":
+    main()
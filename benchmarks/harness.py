@@ -0,0 +1,234 @@
+#!/usr/bin/env python
+"""
+Suite de benchmarks de BatchProcessor contra un upstream simulado
+
+Ejecuta la combinación de escenarios workers × tamaño de batch × mezcla de
+métodos × tasa de errores contra benchmarks/mock_upstream.py y guarda
+throughput, percentiles de latencia, CPU y RSS en un JSON para comparar
+entre commits. No requiere el servidor de prueba.
+
+Uso:
+    python benchmarks/harness.py --workers 5,20 --batch-size 100,1000 --mix get,mixed
+    python benchmarks/harness.py --compare benchmarks/results/<commit>.json
+"""
+
+import sys
+import argparse
+import itertools
+import json
+import os
+import platform
+import random
+import subprocess
+import time
+from dataclasses import dataclass, asdict
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+try:
+    import resource
+except ImportError:  # solo Unix: sin CPU/RSS por proceso en otras plataformas
+    resource = None
+
+from benchmarks.mock_upstream import MockUpstream
+from core.batch_processor import BatchProcessor
+from core.result_store import ResultRetention
+from models.request_template import RequestTemplate
+from models.task import HTTPMethod
+from config.settings import config
+
+HEADERS = {"Authorization": "Bearer token123"}
+GET_USER = RequestTemplate(HTTPMethod.GET, "/users/{id}", headers=HEADERS, name="bench-get")
+PATCH_USER = RequestTemplate(HTTPMethod.PATCH, "/users/{id}", headers=HEADERS, name="bench-patch")
+CREATE_USER = RequestTemplate(HTTPMethod.POST, "/users", headers=HEADERS, name="bench-post")
+
+# Mezclas de métodos: fracción de cada plantilla
+METHOD_MIXES = {
+    "get": [(GET_USER, 1.0)],
+    "write": [(PATCH_USER, 0.5), (CREATE_USER, 0.5)],
+    "mixed": [(GET_USER, 0.6), (PATCH_USER, 0.3), (CREATE_USER, 0.1)]
+}
+
+@dataclass
+class Scenario:
+    workers: int
+    batch_size: int
+    mix: str
+    error_rate: float
+
+    @property
+    def name(self) -> str:
+        return f"w{self.workers}-b{self.batch_size}-{self.mix}-e{self.error_rate:g}"
+
+def build_batches(scenario: Scenario, num_tasks: int):
+    """Tareas del escenario repartidas en batches de ``batch_size``"""
+    tasks = []
+    for template, fraction in METHOD_MIXES[scenario.mix]:
+        count = round(num_tasks * fraction)
+        if template is CREATE_USER:
+            tasks += [template.task(data={"name": f"Bench {i}"}) for i in range(count)]
+        elif template is PATCH_USER:
+            tasks += template.tasks((i % 100 for i in range(count)), data={"status": "active"})
+        else:
+            tasks += template.tasks(i % 100 for i in range(count))
+    # Intercalar métodos como llegarían en un batch real (mismo orden en cada ejecución)
+    random.Random(0).shuffle(tasks)
+    return [tasks[start:start + scenario.batch_size] for start in range(0, len(tasks), scenario.batch_size)]
+
+def cpu_seconds() -> float:
+    if resource is None:
+        return time.process_time()
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    return usage.ru_utime + usage.ru_stime
+
+def rss_mb() -> Optional[float]:
+    """RSS actual del proceso (Linux) o pico si no hay /proc"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except (OSError, ValueError, AttributeError):
+        if resource is None:
+            return None
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def run_scenario(scenario: Scenario, num_tasks: int, base_url: str) -> Dict[str, Any]:
+    """Ejecuta un escenario y devuelve sus métricas"""
+    config.API_BASE_URL = base_url
+    batches = build_batches(scenario, num_tasks)
+    total = sum(len(batch) for batch in batches)
+
+    processor = BatchProcessor(num_workers=scenario.workers, retention=ResultRetention.NONE)
+    processor.start()
+    try:
+        rss_before = rss_mb()
+        cpu_before = cpu_seconds()
+        start_time = time.perf_counter()
+        handles = [processor.submit_batch(batch) for batch in batches]
+        for handle in handles:
+            handle.wait()
+        elapsed_time = time.perf_counter() - start_time
+        cpu_used = cpu_seconds() - cpu_before
+        rss_after = rss_mb()
+        stats = processor.get_statistics()
+    finally:
+        processor.stop()
+
+    latency = stats["latency_ms"]
+    return {
+        "scenario": scenario.name,
+        **asdict(scenario),
+        "tasks": total,
+        "elapsed_s": round(elapsed_time, 3),
+        "throughput": round(total / elapsed_time, 2),
+        "success_rate": round(stats["success_rate"], 2),
+        "attempts": stats["attempts"],
+        "latency_ms": {
+            "processing": latency["processing"],
+            "end_to_end": latency["end_to_end"]
+        },
+        "cpu_s": round(cpu_used, 3),
+        "cpu_us_per_task": round(cpu_used / total * 1e6, 1),
+        "rss_mb": {"before": rss_before and round(rss_before, 1), "after": rss_after and round(rss_after, 1)}
+    }
+
+def git_commit() -> Optional[str]:
+    """Commit actual (None fuera de un repositorio git)"""
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True, cwd=Path(__file__).resolve().parent).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def compare(current: Dict[str, Any], baseline_path: str, threshold: float) -> bool:
+    """Compara con un fichero anterior; devuelve False si hay regresiones"""
+    with open(baseline_path) as f:
+        baseline = {result["scenario"]: result for result in json.load(f)["scenarios"]}
+
+    print(f"\n📊 Comparación con {baseline_path} (umbral {threshold:g}%):")
+    ok = True
+    for result in current["scenarios"]:
+        before = baseline.get(result["scenario"])
+        if before is None:
+            continue
+        throughput = (result["throughput"] / before["throughput"] - 1) * 100
+        p99_before = before["latency_ms"]["end_to_end"]["p99"]
+        p99 = ((result["latency_ms"]["end_to_end"]["p99"] / p99_before - 1) * 100) if p99_before else 0.0
+        regression = throughput < -threshold or p99 > threshold
+        ok = ok and not regression
+        print(f"  {'❌' if regression else '✅'} {result['scenario']:<28} "
+              f"throughput {throughput:+6.1f}%  p99 end-to-end {p99:+6.1f}%")
+    return ok
+
+def parse_list(value: str, cast):
+    return [cast(item) for item in value.split(",") if item]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, default=2000, help="Tareas por escenario")
+    parser.add_argument("--workers", default="5,20")
+    parser.add_argument("--batch-size", default="100,1000")
+    parser.add_argument("--mix", default="get,mixed", help=f"Mezclas: {', '.join(METHOD_MIXES)}")
+    parser.add_argument("--error-rate", default="0,0.05")
+    parser.add_argument("--latency", default="uniform:1:5", help="Latencia del upstream simulado")
+    parser.add_argument("--max-rps", type=float, default=0.0, help="Límite de peticiones/s del upstream")
+    parser.add_argument("--seed", type=int, default=0, help="Semilla de los errores del upstream (mismos fallos en cada ejecución)")
+    parser.add_argument("--transaction-logs", action="store_true", help="Mantener los logs de transacciones")
+    parser.add_argument("--output", help="Fichero JSON de resultados (por defecto benchmarks/results/<commit>.json)")
+    parser.add_argument("--compare", help="Fichero JSON de una ejecución anterior")
+    parser.add_argument("--threshold", type=float, default=10.0, help="Regresión máxima tolerada (%%)")
+    args = parser.parse_args()
+
+    mixes = parse_list(args.mix, str)
+    unknown = [mix for mix in mixes if mix not in METHOD_MIXES]
+    if unknown:
+        parser.error(f"unknown method mix: {', '.join(unknown)}")
+
+    scenarios = [
+        Scenario(workers, batch_size, mix, error_rate)
+        for error_rate, workers, batch_size, mix in itertools.product(
+            parse_list(args.error_rate, float), parse_list(args.workers, int),
+            parse_list(args.batch_size, int), mixes
+        )
+    ]
+
+    config.ENABLE_TRANSACTION_LOGS = args.transaction_logs
+    config.RETRY_DELAY = 0  # los reintentos no deben dominar el tiempo medido
+    results = []
+
+    print(f"\n⚙️  {len(scenarios)} escenarios de {args.tasks} tareas (latencia {args.latency})\n")
+    # Un upstream por tasa de errores: se reutiliza entre escenarios
+    for error_rate, group in itertools.groupby(scenarios, key=lambda scenario: scenario.error_rate):
+        with MockUpstream(latency=args.latency, error_rate=error_rate, max_rps=args.max_rps,
+                          seed=args.seed) as upstream:
+            for scenario in group:
+                result = run_scenario(scenario, args.tasks, upstream.url)
+                results.append(result)
+                print(f"  {scenario.name:<28} {result['throughput']:9.1f} tareas/s  "
+                      f"p99 {result['latency_ms']['end_to_end']['p99']:8.1f} ms  "
+                      f"CPU {result['cpu_us_per_task']:7.1f} µs/tarea  éxito {result['success_rate']:.1f}%")
+
+    commit = git_commit()
+    report = {
+        "commit": commit,
+        "timestamp": datetime.now().isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "settings": {"tasks": args.tasks, "latency": args.latency, "max_rps": args.max_rps,
+                     "seed": args.seed, "transaction_logs": args.transaction_logs},
+        "scenarios": results
+    }
+
+    output = Path(args.output or Path(__file__).resolve().parent / "results" / f"{commit or 'worktree'}.json")
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\n💾 Resultados en {output}")
+
+    if args.compare and not compare(report, args.compare, args.threshold):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
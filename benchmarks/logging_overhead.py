@@ -0,0 +1,91 @@
+#!/usr/bin/env python
+"""
+Micro-benchmark: coste de logging por tarea en el thread del worker
+
+Emite las cuatro líneas INFO de cada tarea (encolada, intento, procesando,
+completada) con la configuración actual (FileHandler síncrono y f-strings)
+y con la nueva (handler asíncrono, formateo diferido y muestreo). No
+requiere el servidor de prueba.
+"""
+
+import sys
+import argparse
+import logging
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from config.settings import config
+from log_system.logger import TransactionLogger
+
+URL = "http://localhost:5000/users/1"
+
+def fresh_logger(log_dir: str, **settings) -> TransactionLogger:
+    """TransactionLogger nuevo sobre un directorio temporal"""
+    for name in ("app", "errors"):
+        for handler in list(logging.getLogger(name).handlers):
+            logging.getLogger(name).removeHandler(handler)
+            handler.close()
+    config.LOG_DIR = log_dir
+    for name, value in settings.items():
+        setattr(config, name, value)
+    return TransactionLogger()
+
+def eager_lines(logger: TransactionLogger, task_id: str):
+    """Antes: f-strings formateados siempre, escritura síncrona"""
+    logger.info(f"Added task {task_id} to queue")
+    logger.info(f"Worker {3} processing task {task_id}")
+    logger.info(f"Task {task_id}: Attempt {1} - {'GET'} {URL}")
+    logger.info(f"Task {task_id} completed successfully")
+
+def lazy_lines(logger: TransactionLogger, task_id: str):
+    """Después: argumentos diferidos y muestreo por tarea"""
+    logger.task_info(task_id, "Added task %s to queue", task_id)
+    logger.task_info(task_id, "Worker %s processing task %s", 3, task_id)
+    logger.task_info(task_id, "Task %s: Attempt %d - %s %s", task_id, 1, "GET", URL)
+    logger.task_info(task_id, "Task %s completed successfully", task_id)
+
+def measure(name: str, emit, logger: TransactionLogger, task_ids):
+    """CPU por tarea del thread que loguea y tiempo hasta tenerlo todo en disco"""
+    start = time.perf_counter()
+    start_cpu = time.thread_time()
+    for task_id in task_ids:
+        emit(logger, task_id)
+    hot_path = time.thread_time() - start_cpu
+    logger.flush()
+    total = time.perf_counter() - start
+    logger.close()
+
+    count = len(task_ids)
+    print(f"  {name:<38} {hot_path / count * 1e6:8.2f} µs/tarea CPU del worker  "
+          f"{total / count * 1e6:8.2f} µs/tarea hasta disco")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tasks", type=int, default=50000)
+    args = parser.parse_args()
+
+    task_ids = [str(uuid.uuid4()) for _ in range(args.tasks)]
+    print(f"\nLogging por tarea ({args.tasks} tareas, 4 líneas INFO cada una):")
+
+    with tempfile.TemporaryDirectory() as log_dir:
+        base = {"LOG_ASYNC": False, "LOG_TASK_SAMPLE_RATE": 1.0, "LOG_LEVEL": "INFO"}
+        measure("síncrono + f-strings (antes)", eager_lines,
+                fresh_logger(log_dir, **base), task_ids)
+        measure("síncrono + formateo diferido", lazy_lines,
+                fresh_logger(log_dir, **base), task_ids)
+        measure("asíncrono por lotes", lazy_lines,
+                fresh_logger(log_dir, **{**base, "LOG_ASYNC": True}), task_ids)
+        measure("asíncrono + muestreo 1%", lazy_lines,
+                fresh_logger(log_dir, **{**base, "LOG_ASYNC": True, "LOG_TASK_SAMPLE_RATE": 0.01}),
+                task_ids)
+        measure("nivel WARNING + f-strings (antes)", eager_lines,
+                fresh_logger(log_dir, **{**base, "LOG_LEVEL": "WARNING"}), task_ids)
+        measure("nivel WARNING + formateo diferido", lazy_lines,
+                fresh_logger(log_dir, **{**base, "LOG_LEVEL": "WARNING"}), task_ids)
+
+if __name__ == "__main__":
+    main()
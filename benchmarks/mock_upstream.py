@@ -0,0 +1,325 @@
+#!/usr/bin/env python
+"""
+Upstream simulado de alto rendimiento (aiohttp) para pruebas de carga
+
+Sirve las mismas rutas que test_server.py (``/users/<id>`` GET/PATCH,
+``/users`` POST y multi-GET, ``/users/bulk``, ``/stats`` y ``/health``) pero
+con latencia simulada no bloqueante, un log de peticiones acotado (anillo de
+``--log-size`` entradas) y errores 503 deterministas: con ``--seed`` la
+decisión de fallar depende solo de la semilla, el método, la ruta y cuántas
+veces se ha pedido esa ruta, no del orden en que llegan las peticiones.
+Corre en procesos aparte para que su CPU no compita con la del procesador
+que se mide; ``--processes N`` reparte el puerto entre N procesos
+(SO_REUSEPORT, cada uno con su propio estado).
+
+Uso:
+    python benchmarks/mock_upstream.py --port 5001 --latency uniform:1:5 --error-rate 0.05 --seed 42
+"""
+
+import sys
+import argparse
+import asyncio
+import hashlib
+import json
+import multiprocessing
+import random
+import socket
+import time
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from aiohttp import web
+import requests
+from services.serializer import serializer
+
+def parse_latency(spec: str) -> Callable[[random.Random], float]:
+    """Distribución de latencia en ms: "0", "fixed:5", "uniform:1:5" o "exp:5" (media)"""
+    kind, _, params = spec.partition(":")
+    values = [float(value) for value in params.split(":")] if params else []
+    if kind in ("0", "none"):
+        return lambda rng: 0.0
+    if kind == "fixed" and len(values) == 1:
+        return lambda rng: values[0]
+    if kind == "uniform" and len(values) == 2:
+        return lambda rng: rng.uniform(values[0], values[1])
+    if kind == "exp" and len(values) == 1:
+        return lambda rng: rng.expovariate(1 / values[0]) if values[0] > 0 else 0.0
+    raise ValueError(f"Unsupported latency distribution: {spec}")
+
+def json_response(payload: Any, status: int = 200, headers: Dict[str, str] = None) -> web.Response:
+    return web.Response(body=serializer.dumps(payload), status=status, headers=headers,
+                        content_type="application/json")
+
+def etag_for(record: Dict[str, Any]) -> str:
+    """ETag estable (entre reinicios) de un registro, aunque contenga listas o dicts"""
+    encoded = json.dumps(record, sort_keys=True, default=str).encode()
+    return f'"{hashlib.sha1(encoded).hexdigest()}"'
+
+UNAVAILABLE = {"error": "Service temporarily unavailable"}
+
+class _Upstream:
+    """Estado del servidor: usuarios en memoria, latencia, errores, límite de tasa y log"""
+
+    def __init__(self, latency: str, error_rate: float, max_rps: float,
+                 seed: Optional[int], log_size: int):
+        self.latency = parse_latency(latency)
+        self.error_rate = error_rate
+        self.interval = 1 / max_rps if max_rps > 0 else 0.0
+        self.next_slot = 0.0
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.hits: Dict[Tuple[str, str], int] = {}
+        self.users = {str(i): {"id": i, "name": f"User {i}", "status": "inactive"} for i in range(100)}
+        self.request_log: Deque[Tuple[float, str, str, Any]] = deque(maxlen=log_size)
+        self.total_requests = 0
+        self.errors = 0
+
+    def _fails(self, method: str, key: str) -> bool:
+        """Error simulado; con semilla es determinista por (método, ruta, n-ésima petición)"""
+        if not self.error_rate:
+            return False
+        if self.seed is None:
+            return self.rng.random() < self.error_rate
+        hit = self.hits.get((method, key), 0)
+        self.hits[(method, key)] = hit + 1
+        digest = hashlib.blake2b(f"{self.seed}:{method}:{key}:{hit}".encode(), digest_size=8).digest()
+        return int.from_bytes(digest, "big") / 2**64 < self.error_rate
+
+    async def simulate(self, method: str, path: str, detail: Any = None, key: str = None) -> bool:
+        """Registra la petición, aplica límite de tasa y latencia; True si debe fallar"""
+        self.total_requests += 1
+        self.request_log.append((time.time(), method, path, detail))
+
+        if self.interval:
+            # Cada petición reserva el siguiente hueco libre del límite
+            now = time.monotonic()
+            slot = max(now, self.next_slot)
+            self.next_slot = slot + self.interval
+            if slot > now:
+                await asyncio.sleep(slot - now)
+
+        delay_ms = self.latency(self.rng)
+        if delay_ms > 0:
+            await asyncio.sleep(delay_ms / 1000)
+
+        if self._fails(method, key or path):
+            self.errors += 1
+            return True
+        return False
+
+    async def get_user(self, request: web.Request) -> web.Response:
+        user_id = request.match_info["user_id"]
+        if await self.simulate("GET", request.path):
+            return json_response(UNAVAILABLE, status=503)
+
+        user = self.users.get(user_id)
+        if user is None:
+            return json_response({"error": "User not found"}, status=404)
+        # ETag para revalidación condicional (If-None-Match -> 304)
+        etag = etag_for(user)
+        if request.headers.get("If-None-Match") == etag:
+            return web.Response(status=304, headers={"ETag": etag})
+        return json_response(user, headers={"ETag": etag})
+
+    async def patch_user(self, request: web.Request) -> web.Response:
+        data = await request.json(loads=serializer.loads)
+        if await self.simulate("PATCH", request.path, data):
+            return json_response(UNAVAILABLE, status=503)
+
+        user = self.users.get(request.match_info["user_id"])
+        if user is None:
+            return json_response({"error": "User not found"}, status=404)
+        user.update(data)
+        return json_response(user)
+
+    async def create_user(self, request: web.Request) -> web.Response:
+        data = await request.json(loads=serializer.loads)
+        # Clave de error por cuerpo: cada alta distinta tiene su propia secuencia
+        if await self.simulate("POST", request.path, data, key=f"{request.path}:{serializer.dumps(data).decode()}"):
+            return json_response(UNAVAILABLE, status=503)
+
+        user_id = str(len(self.users))
+        self.users[user_id] = {"id": user_id, **data}
+        return json_response(self.users[user_id], status=201)
+
+    async def get_users(self, request: web.Request) -> web.Response:
+        """Multi-GET: /users?ids=1,2,3"""
+        ids = [user_id for user_id in request.query.get("ids", "").split(",") if user_id]
+        if await self.simulate("GET", request.path, {"ids": len(ids)}, key=request.path_qs):
+            return json_response(UNAVAILABLE, status=503)
+        return json_response({"items": {user_id: self.users[user_id] for user_id in ids
+                                        if user_id in self.users}})
+
+    async def bulk_users(self, request: web.Request) -> web.Response:
+        """Bulk: array de operaciones {method, path, body} con fallo parcial por operación"""
+        operations = await request.json(loads=serializer.loads)
+        if await self.simulate("POST", request.path, {"operations": len(operations)}):
+            return json_response(UNAVAILABLE, status=503)
+
+        results: List[Dict[str, Any]] = []
+        for operation in operations:
+            body = operation.get("body") or {}
+            if self._fails(operation["method"], operation["path"]):
+                results.append({"status": 503, "body": UNAVAILABLE})
+                continue
+
+            if operation["method"] == "POST" and operation["path"] == "/users":
+                user_id = str(len(self.users))
+                self.users[user_id] = {"id": user_id, **body}
+                results.append({"status": 201, "body": self.users[user_id]})
+                continue
+
+            user_id = operation["path"].rsplit("/", 1)[-1]
+            if operation["method"] == "PATCH" and user_id in self.users:
+                self.users[user_id].update(body)
+                results.append({"status": 200, "body": self.users[user_id]})
+            elif user_id in self.users:
+                results.append({"status": 405, "body": {"error": "Method not allowed"}})
+            else:
+                results.append({"status": 404, "body": {"error": "User not found"}})
+        return json_response(results)
+
+    async def stats(self, request: web.Request) -> web.Response:
+        """Estadísticas (mismo formato que test_server.py, más errores y tamaño del log)"""
+        last_requests = []
+        for timestamp, method, path, detail in list(self.request_log)[-10:]:
+            entry = {"timestamp": datetime.fromtimestamp(timestamp).isoformat(),
+                     "method": method, "endpoint": path}
+            if detail is not None:
+                entry["data"] = detail
+            last_requests.append(entry)
+        return json_response({
+            "total_users": len(self.users),
+            "total_requests": self.total_requests,
+            "errors": self.errors,
+            "logged_requests": len(self.request_log),
+            "last_requests": last_requests
+        })
+
+    async def health(self, request: web.Request) -> web.Response:
+        return json_response({"status": "healthy", "timestamp": datetime.now().isoformat()})
+
+def create_app(latency: str = "0", error_rate: float = 0.0, max_rps: float = 0.0,
+               seed: Optional[int] = None, log_size: int = 1000) -> web.Application:
+    """Aplicación aiohttp del upstream simulado"""
+    upstream = _Upstream(latency, error_rate, max_rps, seed, log_size)
+    app = web.Application()
+    app.add_routes([
+        web.get("/users/{user_id}", upstream.get_user),
+        web.patch("/users/{user_id}", upstream.patch_user),
+        web.get("/users", upstream.get_users),
+        web.post("/users", upstream.create_user),
+        web.post("/users/bulk", upstream.bulk_users),
+        web.get("/stats", upstream.stats),
+        web.get("/health", upstream.health)
+    ])
+    return app
+
+def serve(port: int, latency: str = "0", error_rate: float = 0.0, max_rps: float = 0.0,
+          seed: Optional[int] = None, log_size: int = 1000, reuse_port: bool = False):
+    """Arranca el servidor (bloquea)"""
+    web.run_app(create_app(latency, error_rate, max_rps, seed, log_size), host="127.0.0.1", port=port,
+                reuse_port=reuse_port or None, print=None, access_log=None)
+
+def free_port() -> int:
+    """Puerto TCP libre en localhost"""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+class MockUpstream:
+    """Upstream simulado en procesos hijo; ``url`` sirve como API_BASE_URL.
+
+    Con varios procesos el límite de tasa y los datos son por proceso.
+    """
+
+    def __init__(self, latency: str = "0", error_rate: float = 0.0, max_rps: float = 0.0,
+                 seed: Optional[int] = None, log_size: int = 1000, processes: int = 1,
+                 port: int = None):
+        parse_latency(latency)  # validar antes de lanzar los procesos
+        self.latency = latency
+        self.error_rate = error_rate
+        self.max_rps = max_rps
+        self.seed = seed
+        self.log_size = log_size
+        self.num_processes = processes
+        self.port = port or free_port()
+        self.processes: List[multiprocessing.Process] = []
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.port}"
+
+    def start(self, timeout: float = 10.0) -> "MockUpstream":
+        """Lanza los procesos y espera a que responda /health"""
+        context = multiprocessing.get_context("spawn")
+        for index in range(self.num_processes):
+            process = context.Process(
+                target=serve,
+                args=(self.port, self.latency, self.error_rate, self.max_rps / self.num_processes,
+                      self.seed, self.log_size, self.num_processes > 1),
+                name=f"mock-upstream-{index}",
+                daemon=True
+            )
+            process.start()
+            self.processes.append(process)
+
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            try:
+                requests.get(f"{self.url}/health", timeout=0.5)
+                return self
+            except requests.exceptions.RequestException:
+                time.sleep(0.05)
+        self.stop()
+        raise RuntimeError(f"Mock upstream did not start on port {self.port}")
+
+    def stop(self):
+        """Detiene los procesos del servidor"""
+        for process in self.processes:
+            process.terminate()
+        for process in self.processes:
+            process.join(timeout=5)
+        self.processes = []
+
+    def __enter__(self) -> "MockUpstream":
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=5001)
+    parser.add_argument("--latency", default="0", help='"0", "fixed:MS", "uniform:MIN:MAX" o "exp:MEDIA"')
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, help="Semilla para errores deterministas")
+    parser.add_argument("--max-rps", type=float, default=0.0, help="Límite de peticiones/segundo (0 = sin límite)")
+    parser.add_argument("--log-size", type=int, default=1000, help="Peticiones que guarda el log en anillo")
+    parser.add_argument("--processes", type=int, default=1)
+    args = parser.parse_args()
+
+    print(f"🚀 Mock upstream on http://127.0.0.1:{args.port} "
+          f"(latencia {args.latency}, errores {args.error_rate:.0%}, {args.processes} procesos)")
+    print(f"📊 Check stats at http://127.0.0.1:{args.port}/stats")
+    upstream = MockUpstream(args.latency, args.error_rate, args.max_rps, args.seed,
+                            args.log_size, args.processes, args.port)
+    if args.processes == 1:
+        serve(args.port, args.latency, args.error_rate, args.max_rps, args.seed, args.log_size)
+        return
+
+    upstream.start()
+    try:
+        for process in upstream.processes:
+            process.join()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        upstream.stop()
+
+if __name__ == "__main__":
+    main()
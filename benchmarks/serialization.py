@@ -0,0 +1,85 @@
+#!/usr/bin/env python
+"""
+Micro-benchmark: coste de CPU por tarea de la serialización JSON
+
+Reproduce el trabajo JSON de una tarea PATCH con reintentos: codificar el
+cuerpo en cada intento, decodificar la respuesta y serializar el registro
+de transacción. No requiere el servidor de prueba.
+"""
+
+import sys
+import argparse
+import json
+import time
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from services.serializer import JSONSerializer, create_serializer, orjson
+
+BODY = {"status": "active", "updated": True, "tags": ["a", "b", "c"], "score": 12.5}
+RESPONSE = json.dumps({"id": 1, "name": "User 1", "status": "active",
+                       "profile": {"email": "user1@example.com", "roles": ["reader", "writer"]},
+                       "history": [{"at": "2025-09-01T15:00:00", "event": "login"}] * 10}).encode("utf-8")
+
+def transaction_record(response):
+    return {
+        "task_id": "6f1c1c5e-1f7d-4f0e-9c49-2d8f3c1c0a11",
+        "timestamp": datetime.now().isoformat(),
+        "endpoint": "/users/1",
+        "request": {"method": "PATCH", "url": "http://localhost:5000/users/1", "data": BODY,
+                    "headers": {"Authorization": "Bearer token123"}},
+        "response": {"status_code": 200, "response": response},
+        "attempt": 3,
+        "status": "success"
+    }
+
+def baseline(attempts: int):
+    """Antes: stdlib, el cuerpo se codifica en cada intento y la respuesta siempre se decodifica"""
+    for _ in range(attempts):
+        json.dumps(BODY).encode("utf-8")
+    response = json.loads(RESPONSE)
+    (json.dumps(transaction_record(response), default=str) + "\n").encode("utf-8")
+
+def with_serializer(serializer, decode: bool = True):
+    """Después: cuerpo codificado una vez, respuesta opcional, registro con el serializador"""
+    def run(attempts: int):
+        encoded = None
+        for _ in range(attempts):
+            if encoded is None:
+                encoded = serializer.dumps(BODY)
+        response = serializer.loads(RESPONSE) if decode else None
+        serializer.dumps(transaction_record(response)) + b"\n"
+    return run
+
+def measure(name: str, run, num_tasks: int, attempts: int, reference: float = None) -> float:
+    """CPU por tarea en microsegundos"""
+    start = time.process_time()
+    for _ in range(num_tasks):
+        run(attempts)
+    per_task_us = (time.process_time() - start) / num_tasks * 1e6
+    speedup = f"  {reference / per_task_us:5.1f}x" if reference else ""
+    print(f"  {name:<34} {per_task_us:8.2f} µs/tarea{speedup}")
+    return per_task_us
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tasks", type=int, default=50000)
+    parser.add_argument("--attempts", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"\nCPU por tarea ({args.tasks} tareas, {args.attempts} intentos cada una):")
+    reference = measure("stdlib, re-codificando (antes)", baseline, args.tasks, args.attempts)
+    measure("stdlib, cuerpo cacheado", with_serializer(JSONSerializer()),
+            args.tasks, args.attempts, reference)
+    if orjson is not None:
+        fast = create_serializer("orjson")
+        measure("orjson, cuerpo cacheado", with_serializer(fast), args.tasks, args.attempts, reference)
+        measure("orjson, solo estado", with_serializer(fast, decode=False),
+                args.tasks, args.attempts, reference)
+    else:
+        print("  (orjson no está instalado: pip install orjson)")
+
+if __name__ == "__main__":
+    main()
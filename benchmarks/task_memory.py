@@ -0,0 +1,80 @@
+#!/usr/bin/env python
+"""
+Comparativa de memoria: Task por tarea vs TaskBatch columnar
+
+Mide con tracemalloc lo que ocupa construir N tareas GET/PATCH como en
+main.py. No requiere el servidor de prueba.
+"""
+
+import sys
+import argparse
+import dataclasses
+import gc
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from models.task import Task, HTTPMethod
+from models.task_batch import TaskBatch
+
+# Task tal como era antes de slots=True (con __dict__ por instancia), como referencia
+DictTask = dataclasses.make_dataclass(
+    "DictTask",
+    [(f.name, f.type, dataclasses.field(default=f.default, default_factory=f.default_factory))
+     for f in dataclasses.fields(Task)]
+)
+
+HEADERS = {"Authorization": "Bearer token123"}
+BODY = {"status": "active"}
+
+def build_objects(task_class, num_tasks: int):
+    """Un objeto por tarea, cada uno con su copia de las cabeceras"""
+    return [
+        task_class(method=HTTPMethod.GET if i % 2 == 0 else HTTPMethod.PATCH,
+                   endpoint=f"/users/{i}", data=None if i % 2 == 0 else BODY,
+                   headers=dict(HEADERS))
+        for i in range(num_tasks)
+    ]
+
+def build_batch(num_tasks: int):
+    """Las mismas tareas en columnas, con cabeceras compartidas"""
+    batch = TaskBatch(headers=dict(HEADERS))
+    for i in range(num_tasks):
+        if i % 2 == 0:
+            batch.append(HTTPMethod.GET, f"/users/{i}")
+        else:
+            batch.append(HTTPMethod.PATCH, f"/users/{i}", data=BODY)
+    return batch
+
+def measure(name: str, build, num_tasks: int):
+    """Construye las tareas y devuelve los bytes retenidos"""
+    gc.collect()
+    tracemalloc.start()
+    start_time = time.time()
+    tasks = build(num_tasks)
+    elapsed_time = time.time() - start_time
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del tasks
+
+    print(f"  {name:<24} {retained / 2**20:9.1f} MiB  {retained / num_tasks:7.1f} B/tarea  "
+          f"pico {peak / 2**20:8.1f} MiB  {elapsed_time:6.2f} s")
+    return retained
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tasks", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    print(f"\nMemoria para {args.tasks} tareas:")
+    legacy = measure("dataclass (__dict__)", lambda n: build_objects(DictTask, n), args.tasks)
+    slots = measure("Task (slots)", lambda n: build_objects(Task, n), args.tasks)
+    columnar = measure("TaskBatch", build_batch, args.tasks)
+
+    print(f"\n  Task con slots: {legacy / slots:.1f}x menos memoria que con __dict__")
+    print(f"  TaskBatch: {legacy / columnar:.1f}x menos memoria que con __dict__")
+
+if __name__ == "__main__":
+    main()
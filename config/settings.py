@@ -1,6 +1,6 @@
 import os
-from dataclasses import dataclass
-from typing import Optional
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional
 
 @dataclass
 class Config:
@@ -9,15 +9,114 @@ class Config:
     API_TIMEOUT: int = 30
     MAX_RETRIES: int = 3
     RETRY_DELAY: int = 1
+    RETRY_MAX_DELAY: int = 30
+    RETRY_ON_STATUS: tuple = (429, 500, 502, 503, 504)
+
+    # Connection Pool (compartido por todos los workers)
+    POOL_MAXSIZE: int = 20
+    POOL_HOST_MAXSIZE: Dict[str, int] = field(default_factory=dict)  # {"host[:puerto]": tamaño}
+    POOL_BLOCK: bool = True
+    POOL_IDLE_TIMEOUT: float = 60.0
+    POOL_TCP_KEEPALIVE: bool = True
+    POOL_HTTP2: bool = False  # requiere httpx[http2]
+
+    # Response Cache (solo GET)
+    RESPONSE_CACHE_ENABLED: bool = False
+    RESPONSE_CACHE_TTL: float = 30.0
+    RESPONSE_CACHE_MAX_ENTRIES: int = 10000
+
+    # Rate Limiting
+    RATE_LIMITS: Dict[str, Any] = field(default_factory=dict)  # {"/users": 50.0, "https://host/path": (rate, burst)}
+    RATE_LIMIT_BURST: int = 10
+    RETRY_AFTER_MAX: float = 60.0
+
+    # Adaptive Concurrency (AIMD por host)
+    ADAPTIVE_CONCURRENCY: bool = False
+    ADAPTIVE_INITIAL_CONCURRENCY: int = 5
+    ADAPTIVE_MIN_CONCURRENCY: int = 1
+    ADAPTIVE_MAX_CONCURRENCY: int = 100
+    ADAPTIVE_BACKOFF_RATIO: float = 0.7
+    ADAPTIVE_LATENCY_TOLERANCE: float = 2.0
+    ADAPTIVE_ERROR_THRESHOLD: float = 0.2
 
     # Queue Configuration
     QUEUE_MAX_SIZE: int = 1000
     NUM_WORKERS: int = 5
-    BATCH_SIZE: int = 100
+    BATCH_SIZE: int = 100  # máximo de tareas por petición bulk
+    BATCH_LINGER: float = 0.01  # segundos que un grupo bulk espera a llenarse
+    PATCH_WRITE_COMBINING: bool = False
+
+    # Queue Backend
+    QUEUE_BACKEND: str = "memory"  # "memory" o "sqlite"
+    QUEUE_DB_PATH: str = "data/queue.db"
+    QUEUE_DB_SYNCHRONOUS: str = "NORMAL"  # "NORMAL" o "FULL"
+    QUEUE_GROUP_COMMIT_INTERVAL: float = 0.002
+    QUEUE_GROUP_COMMIT_MAX: int = 1000
+
+    # Queue Scheduling
+    QUEUE_SCHEDULING: str = "fifo"  # "fifo" o "fair" (prioridades + deficit round robin)
+    QUEUE_TENANT_WEIGHTS: Dict[str, float] = field(default_factory=dict)  # {"tenant": peso}
+
+    # Results
+    RESULTS_RETENTION: str = "all"  # "all", "last_n", "failures" o "none"
+    RESULTS_KEEP_LAST: int = 10000
+    RESULTS_SPILL_PATH: str = ""
+
+    # Ingestion
+    INGESTION_CHECKPOINT_INTERVAL: float = 1.0
+
+    # Async Engine
+    MAX_IN_FLIGHT: int = 1000
+
+    # Process Pool
+    NUM_PROCESSES: int = 0  # 0 = un proceso por núcleo
+    PROCESS_ENGINE: str = "threads"  # "threads" o "async" dentro de cada proceso
+    PROCESS_CHUNK_SIZE: int = 100
+    PROCESS_PREFETCH: int = 1000  # tareas sin terminar que acepta cada proceso
+
+    # Cluster (modo distribuido)
+    CLUSTER_HOST: str = "127.0.0.1"
+    CLUSTER_PORT: int = 8765
+    CLUSTER_LEASE_TIMEOUT: float = 10.0  # sin heartbeat en este tiempo, las tareas se reasignan
+    CLUSTER_HEARTBEAT_INTERVAL: float = 2.0
+    CLUSTER_LEASE_SIZE: int = 100
+    CLUSTER_NODE_PREFETCH: int = 1000
+
+    # Serialization
+    JSON_SERIALIZER: str = "auto"  # "auto" (orjson si está instalado), "orjson" o "json"
 
     # Logging
     LOG_LEVEL: str = "INFO"
     LOG_DIR: str = "logs"
     ENABLE_TRANSACTION_LOGS: bool = True
+    LOG_ASYNC: bool = False  # app.log/errors.log escritos por lotes desde un thread aparte
+    LOG_BUFFER_SIZE: int = 10000
+    LOG_FLUSH_BATCH: int = 500
+    LOG_FLUSH_INTERVAL: float = 0.2
+    LOG_BACKPRESSURE: str = "block"  # "block" o "drop"
+    LOG_TASK_SAMPLE_RATE: float = 1.0  # fracción de tareas con líneas INFO por tarea (0 = ninguna)
+
+    # Tracing (tiempos por etapa y profiler por muestreo)
+    TRACE_ENABLED: bool = False
+    TRACE_SAMPLE_RATE: float = 1.0  # fracción de tareas trazadas
+    TRACE_BUFFER_SIZE: int = 10000  # últimas tareas trazadas que se guardan para exportar
+    TRACE_EXPORT_PATH: str = ""  # si se indica, se exporta al detener el procesador
+    TRACE_EXPORT_FORMAT: str = "chrome"  # "chrome" (chrome://tracing, Perfetto) u "otlp" (OpenTelemetry JSON)
+    PROFILE_INTERVAL: float = 0.0  # segundos entre muestras del profiler (0 = desactivado)
+    PROFILE_OUTPUT: str = ""  # pilas en formato collapsed al detener el procesador
+
+    # Metrics (endpoint /metrics en formato de texto de Prometheus)
+    METRICS_ENABLED: bool = False  # solo BatchProcessor; desactivado en procesos hijo y nodos
+    METRICS_HOST: str = "127.0.0.1"
+    METRICS_PORT: int = 9108  # 0 = puerto libre cualquiera
+
+    # Transaction Log Writer
+    TRANSACTION_BUFFER_SIZE: int = 10000
+    TRANSACTION_FLUSH_INTERVAL: float = 1.0
+    TRANSACTION_FLUSH_BATCH: int = 500
+    TRANSACTION_SEGMENT_MAX_BYTES: int = 64 * 1024 * 1024
+    TRANSACTION_SEGMENT_MAX_AGE: int = 3600
+    TRANSACTION_COMPRESSION: str = ""  # "", "gzip" o "zstd"
+    TRANSACTION_BACKPRESSURE: str = "block"  # "block" o "drop"
 
 config = Config()
@@ -0,0 +1,223 @@
+import asyncio
+import threading
+from datetime import datetime
+from typing import List, Dict, Any, Optional
+from models.task import Task, TaskStatus
+from services.async_api_client import AsyncAPIClient
+from services.api_client import RetryableRequestError
+from core.retry_scheduler import compute_backoff
+from core.batch_handle import BatchHandle
+from core.result_store import ResultStore, ResultRetention, ResultListener
+from core.statistics import ProcessorStatistics
+from config.settings import config
+from log_system.logger import logger
+
+class AsyncBatchProcessor:
+    """Alternativa a BatchProcessor basada en un event loop de asyncio.
+
+    En lugar de un thread por worker, todas las peticiones corren como
+    corutinas en un único thread; la concurrencia la limita
+    ``max_in_flight`` (peticiones simultáneas) y no el número de threads.
+    """
+
+    def __init__(self, max_in_flight: int = None, retention: ResultRetention = None,
+                 keep_last: int = None, spill_path: str = None,
+                 on_result: Optional[ResultListener] = None):
+        self.max_in_flight = max_in_flight or config.MAX_IN_FLIGHT
+        self.loop: asyncio.AbstractEventLoop = None
+        self.loop_thread: threading.Thread = None
+        self.api_client: AsyncAPIClient = None
+        self.semaphore: asyncio.Semaphore = None
+        self.pending: Dict[asyncio.Task, Task] = {}  # corutina -> tarea
+        self.in_flight = 0
+        self.retrying = 0
+        self.result_store = ResultStore(
+            retention=retention or config.RESULTS_RETENTION,
+            keep_last=config.RESULTS_KEEP_LAST if keep_last is None else keep_last,
+            spill_path=spill_path or config.RESULTS_SPILL_PATH or None
+        )
+        if on_result is not None:
+            self.result_store.add_listener(on_result)
+        self.statistics = ProcessorStatistics()
+        self.handles: Dict[str, BatchHandle] = {}
+        self.is_running = False
+
+    def start(self):
+        """Inicia el event loop en un thread de fondo"""
+        if self.is_running:
+            logger.warning("Async batch processor already running")
+            return
+
+        logger.info(f"Starting async batch processor with max {self.max_in_flight} in-flight requests")
+
+        self.loop = asyncio.new_event_loop()
+        self.loop_thread = threading.Thread(target=self.loop.run_forever)
+        self.loop_thread.daemon = True
+        self.loop_thread.start()
+
+        asyncio.run_coroutine_threadsafe(self._setup(), self.loop).result()
+        self.is_running = True
+
+    def stop(self):
+        """Cancela las tareas pendientes y detiene el event loop"""
+        if not self.is_running:
+            return
+
+        logger.info("Stopping async batch processor")
+
+        asyncio.run_coroutine_threadsafe(self._shutdown(), self.loop).result(timeout=10)
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.loop_thread.join(timeout=5)
+        self.loop.close()
+
+        self.is_running = False
+        self.result_store.close()
+        logger.flush()
+        logger.info("Async batch processor stopped")
+
+    def add_task(self, task: Task):
+        """Añade una tarea al event loop"""
+        if not self.is_running:
+            raise RuntimeError("Batch processor is not running")
+
+        self.loop.call_soon_threadsafe(self._schedule, task)
+        logger.task_info(task.task_id, "Added task %s to queue", task.task_id)
+
+    def add_batch(self, tasks: List[Task]):
+        """Añade un batch de tareas"""
+        for task in tasks:
+            self.add_task(task)
+
+        logger.info(f"Added batch of {len(tasks)} tasks")
+
+    def submit_batch(self, tasks: List[Task]) -> BatchHandle:
+        """Añade un batch y devuelve un handle para seguir su finalización"""
+        handle = BatchHandle(tasks)
+
+        # Registrar antes de encolar: los resultados se notifican desde el loop
+        self.loop.call_soon_threadsafe(self._register_handle, handle)
+
+        self.add_batch(handle.tasks)
+        return handle
+
+    def process_batch_sync(self, tasks: List[Task], timeout: float = None) -> List[Task]:
+        """Procesa un batch de manera síncrona (espera a que termine)"""
+        if not self.is_running:
+            self.start()
+
+        handle = self.submit_batch(tasks)
+
+        return handle.results(timeout)
+
+    async def _setup(self):
+        """Crea los recursos ligados al event loop"""
+        self.semaphore = asyncio.Semaphore(self.max_in_flight)
+        self.api_client = AsyncAPIClient(max_connections=self.max_in_flight)
+        await self.api_client.open()
+
+    async def _shutdown(self):
+        """Cancela las corutinas pendientes y cierra la sesión HTTP"""
+        pending = list(self.pending.items())
+        for coro, _ in pending:
+            coro.cancel()
+        if pending:
+            await asyncio.gather(*(coro for coro, _ in pending), return_exceptions=True)
+
+        # Las tareas canceladas terminan como fallidas para que sus handles se completen
+        now = datetime.now()
+        for coro, task in pending:
+            if coro.cancelled():
+                task.status = TaskStatus.FAILED
+                task.completed_at = now
+                task.error_message = "Processor stopped before the task finished"
+                self._collect_result(task)
+        await self.api_client.close()
+
+    def _schedule(self, task: Task) -> asyncio.Task:
+        """Crea la corutina de una tarea (se ejecuta dentro del loop)"""
+        coro = self.loop.create_task(self._process_task(task))
+        self.pending[coro] = task
+        coro.add_done_callback(lambda done: self.pending.pop(done, None))
+        return coro
+
+    def _register_handle(self, handle: BatchHandle):
+        """Asocia las tareas del batch a su handle (se ejecuta dentro del loop)"""
+        for task in handle.tasks:
+            self.handles[task.task_id] = handle
+
+    async def _process_task(self, task: Task):
+        """Procesa una tarea individual respetando el límite in-flight"""
+        while True:
+            try:
+                async with self.semaphore:
+                    self.in_flight += 1
+                    try:
+                        task.status = TaskStatus.PROCESSING
+                        if task.started_at is None:
+                            task.started_at = datetime.now()
+                        logger.task_info(task.task_id, "Async engine processing task %s", task.task_id)
+
+                        result = await self.api_client.execute_request(task)
+                    finally:
+                        self.in_flight -= 1
+
+                task.status = TaskStatus.COMPLETED
+                task.completed_at = datetime.now()
+                task.response_data = result
+                break
+
+            except RetryableRequestError as e:
+                # La espera se hace fuera del semáforo: no ocupa hueco in-flight
+                task.status = TaskStatus.RETRYING
+                task.error_message = str(e)
+                self.retrying += 1
+                try:
+                    await asyncio.sleep(compute_backoff(task.attempts))
+                finally:
+                    self.retrying -= 1
+
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                task.status = TaskStatus.FAILED
+                task.completed_at = datetime.now()
+                task.error_message = str(e)
+                break
+
+        self._collect_result(task)
+
+    def _collect_result(self, task: Task):
+        """Guarda el resultado y lo procesa"""
+        self.statistics.record_result(task)
+        self.result_store.add(task)
+
+        if task.status == TaskStatus.COMPLETED:
+            logger.task_info(task.task_id, "Task %s completed successfully", task.task_id)
+        else:
+            logger.error(f"Task {task.task_id} failed: {task.error_message}")
+
+        handle = self.handles.pop(task.task_id, None)
+        if handle is not None:
+            handle._task_done(task)
+
+    def add_result_listener(self, listener: ResultListener):
+        """Registra un callback que recibe cada tarea terminada"""
+        self.result_store.add_listener(listener)
+
+    def remove_result_listener(self, listener: ResultListener):
+        """Elimina un callback registrado con add_result_listener"""
+        self.result_store.remove_listener(listener)
+
+    def get_results(self) -> List[Task]:
+        """Obtiene los resultados retenidos en memoria"""
+        return self.result_store.snapshot()
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Obtiene estadísticas del procesamiento (lectura de contadores, O(1))"""
+        stats = self.statistics.snapshot()
+        stats.update({
+            "queue_size": len(self.pending) - self.in_flight - self.retrying,
+            "in_flight": self.in_flight,
+            "retrying": self.retrying
+        })
+        return stats
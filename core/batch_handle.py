@@ -0,0 +1,121 @@
+import threading
+import time
+import uuid
+from typing import List, Iterator, Optional
+from models.task import Task, TaskStatus
+
+class BatchHandle:
+    """Seguimiento de la finalización de un batch concreto.
+
+    El procesador notifica cada tarea terminada con ``_task_done``; el
+    llamante puede esperar al batch completo (``wait``/``results``) o
+    consumir las tareas según terminan (``as_completed``) sin mezclar
+    resultados de otros batches.
+    """
+
+    def __init__(self, tasks: List[Task]):
+        self.batch_id = str(uuid.uuid4())
+        self.tasks = list(tasks)
+        self._pending = {task.task_id for task in self.tasks}
+        self._completed: List[Task] = []
+        self._condition = threading.Condition()
+
+    def __len__(self) -> int:
+        return len(self.tasks)
+
+    def _task_done(self, task: Task):
+        """Marca una tarea del batch como terminada (lo llama el procesador)"""
+        with self._condition:
+            if task.task_id not in self._pending:
+                return
+            self._pending.discard(task.task_id)
+            self._completed.append(task)
+            self._condition.notify_all()
+
+    def done(self) -> bool:
+        """Indica si todas las tareas del batch han terminado"""
+        with self._condition:
+            return not self._pending
+
+    def pending_count(self) -> int:
+        """Número de tareas del batch aún sin terminar"""
+        with self._condition:
+            return len(self._pending)
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Espera a que termine el batch; devuelve False si vence el timeout"""
+        with self._condition:
+            return self._condition.wait_for(lambda: not self._pending, timeout=timeout)
+
+    def results(self, timeout: Optional[float] = None) -> List[Task]:
+        """Devuelve las tareas del batch en orden de envío cuando terminan"""
+        if not self.wait(timeout):
+            raise TimeoutError(
+                f"Batch {self.batch_id}: {self.pending_count()} tasks still pending"
+            )
+        return list(self.tasks)
+
+    def as_completed(self, timeout: Optional[float] = None) -> Iterator[Task]:
+        """Itera las tareas del batch en el orden en que terminan"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        index = 0
+
+        while True:
+            with self._condition:
+                while index >= len(self._completed) and self._pending:
+                    remaining = None if deadline is None else deadline - time.monotonic()
+                    if remaining is not None and remaining <= 0:
+                        raise TimeoutError(
+                            f"Batch {self.batch_id}: {len(self._pending)} tasks still pending"
+                        )
+                    self._condition.wait(remaining)
+
+                if index >= len(self._completed):
+                    return
+                ready = self._completed[index:]
+
+            for task in ready:
+                yield task
+            index += len(ready)
+
+class TaskBatchHandle:
+    """Seguimiento de un TaskBatch: solo cuenta tareas terminadas.
+
+    A diferencia de BatchHandle no guarda las tareas (un TaskBatch puede
+    tener millones); los resultados se consumen con ``add_result_listener``
+    o ``stream_results`` del procesador.
+    """
+
+    def __init__(self, batch_id: str, total: int):
+        self.batch_id = batch_id
+        self.total = total
+        self.completed = 0
+        self.failed = 0
+        self._condition = threading.Condition()
+
+    def __len__(self) -> int:
+        return self.total
+
+    def _task_done(self, task: Task):
+        """Cuenta una tarea del batch como terminada (lo llama el procesador)"""
+        with self._condition:
+            self.completed += 1
+            if task.status != TaskStatus.COMPLETED:
+                self.failed += 1
+            if self.completed >= self.total:
+                self._condition.notify_all()
+
+    def done(self) -> bool:
+        """Indica si todas las tareas del batch han terminado"""
+        with self._condition:
+            return self.completed >= self.total
+
+    def pending_count(self) -> int:
+        """Número de tareas del batch aún sin terminar"""
+        with self._condition:
+            return max(self.total - self.completed, 0)
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Espera a que termine el batch; devuelve False si vence el timeout"""
+        with self._condition:
+            return self._condition.wait_for(lambda: self.completed >= self.total, timeout=timeout)
@@ -1,20 +1,69 @@
 import queue
 import threading
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator, Optional
 from models.task import Task, TaskStatus
+from models.task_batch import TaskBatch
 from core.worker import Worker
+from core.batch_handle import BatchHandle, TaskBatchHandle
+from core.retry_scheduler import RetryScheduler
+from core.queue_backend import QueueBackend, create_queue_backend
+from core.result_store import ResultStore, ResultRetention, ResultListener
+from core.statistics import ProcessorStatistics
+from core.tracing import StageTracer
+from core.profiler import SamplingProfiler
+from core.metrics import MetricsServer
+from core.write_combiner import WriteCombiner
+from core.bulk_dispatcher import BulkDispatcher
+from services.batch_adapter import BatchAdapter
+from services.connection_pool import connection_pool
+from services.rate_limiter import request_limiter
+from services.response_cache import response_cache
 from config.settings import config
 from log_system.logger  import logger
-import time
 
 class BatchProcessor:
-    def __init__(self, num_workers: int = None):
+    def __init__(self, num_workers: int = None, retention: ResultRetention = None,
+                 keep_last: int = None, spill_path: str = None,
+                 on_result: Optional[ResultListener] = None,
+                 queue_backend: Optional[QueueBackend] = None,
+                 combine_writes: bool = None,
+                 batch_adapters: Optional[List[BatchAdapter]] = None):
         self.num_workers = num_workers or config.NUM_WORKERS
-        self.task_queue = queue.Queue(maxsize=config.QUEUE_MAX_SIZE)
+        # Cola en memoria o persistente (ver core.queue_backend)
+        self.task_queue = create_queue_backend(queue_backend)
         self.result_queue = queue.Queue()
         self.workers: List[Worker] = []
         self.stop_event = threading.Event()
-        self.results: List[Task] = []
+        # Scheduler de reintentos compartido por todos los workers
+        self.retry_scheduler = RetryScheduler(self.task_queue, self.stop_event)
+        # Resultados con memoria acotada según la política de retención
+        self.result_store = ResultStore(
+            retention=retention or config.RESULTS_RETENTION,
+            keep_last=config.RESULTS_KEEP_LAST if keep_last is None else keep_last,
+            spill_path=spill_path or config.RESULTS_SPILL_PATH or None
+        )
+        if on_result is not None:
+            self.result_store.add_listener(on_result)
+        self.statistics = ProcessorStatistics()
+        # Tiempos por etapa de cada tarea (TRACE_ENABLED) y profiler opcional
+        self.tracer = StageTracer(config.TRACE_ENABLED, config.TRACE_SAMPLE_RATE, config.TRACE_BUFFER_SIZE)
+        self.profiler: Optional[SamplingProfiler] = None
+        self.metrics_server: Optional[MetricsServer] = None
+        # Fusión opcional de PATCH al mismo recurso antes de encolar
+        if combine_writes is None:
+            combine_writes = config.PATCH_WRITE_COMBINING
+        self.write_combiner = WriteCombiner() if combine_writes else None
+        # Empaquetado opcional en peticiones bulk (BATCH_SIZE / BATCH_LINGER)
+        self.bulk_dispatcher = None
+        if batch_adapters:
+            self.bulk_dispatcher = BulkDispatcher(
+                batch_adapters, self.task_queue, self.stop_event, self.retry_scheduler
+            )
+        self.subscribers: List[queue.Queue] = []
+        self.subscribers_lock = threading.Lock()
+        self.handles: Dict[str, BatchHandle] = {}
+        self.batch_handles: Dict[str, TaskBatchHandle] = {}  # TaskBatch: batch_id -> handle
+        self.handles_lock = threading.Lock()
         self.is_running = False
 
     def start(self):
@@ -25,18 +74,42 @@ class BatchProcessor:
 
         logger.info(f"Starting batch processor with {self.num_workers} workers")
 
+        # Endpoint /metrics opcional (METRICS_ENABLED): se enlaza antes de arrancar ningún thread
+        if config.METRICS_ENABLED:
+            try:
+                self.metrics_server = MetricsServer(self)
+                self.metrics_server.start()
+            except OSError as e:
+                self.metrics_server = None
+                logger.error(f"Metrics endpoint disabled: cannot listen on "
+                             f"{config.METRICS_HOST}:{config.METRICS_PORT} - {str(e)}")
+
+        self.retry_scheduler.start()
+        if self.bulk_dispatcher is not None:
+            self.bulk_dispatcher.start()
+
         for i in range(self.num_workers):
             worker = Worker(
                 task_queue=self.task_queue,
                 result_queue=self.result_queue,
                 worker_id=i,
-                stop_event=self.stop_event
+                stop_event=self.stop_event,
+                retry_scheduler=self.retry_scheduler
             )
             worker.start()
             self.workers.append(worker)
 
+        if config.PROFILE_INTERVAL > 0:
+            self.profiler = SamplingProfiler(config.PROFILE_INTERVAL, threads=self.workers)
+            self.profiler.start()
+
         self.is_running = True
 
+        # Reentregar lo que quedó sin terminar en una ejecución anterior
+        recovered = self.task_queue.recover()
+        if recovered:
+            logger.info(f"Re-delivering {recovered} tasks recovered from the queue backend")
+
         # Thread para recolectar resultados
         self.result_collector = threading.Thread(target=self._collect_results)
         self.result_collector.daemon = True
@@ -44,20 +117,48 @@ class BatchProcessor:
 
     def stop(self):
         """Detiene los workers"""
+        if not self.is_running:
+            logger.warning("Batch processor is not running")
+            return
+
         logger.info("Stopping batch processor")
 
+        if self.metrics_server is not None:
+            self.metrics_server.stop()
+            self.metrics_server = None
+
+        # Los grupos bulk sin enviar fallan: el recolector los entrega y sus handles terminan
+        if self.bulk_dispatcher is not None:
+            for task in self.bulk_dispatcher.stop():
+                self.result_queue.put(task)
+
         # Señal de parada
         self.stop_event.set()
+        self.retry_scheduler.stop()
 
         # Añadir None para cada worker para que terminen
         for _ in range(self.num_workers):
             self.task_queue.put(None)
 
-        # Esperar a que terminen
+        # Esperar a que terminen; después ya nadie programa reintentos
         for worker in self.workers:
             worker.join(timeout=5)
+        self.retry_scheduler.join(timeout=5)
+        self.result_queue.put(None)
+        self.result_collector.join(timeout=5)
+
+        if self.profiler is not None:
+            self.profiler.stop()
+            if config.PROFILE_OUTPUT:
+                samples = self.profiler.export(config.PROFILE_OUTPUT)
+                logger.info(f"Wrote {samples} profiler samples to {config.PROFILE_OUTPUT}")
+        if self.tracer.enabled and config.TRACE_EXPORT_PATH:
+            self.export_trace(config.TRACE_EXPORT_PATH)
 
         self.is_running = False
+        self.task_queue.close()
+        self.result_store.close()
+        logger.flush()
         logger.info("Batch processor stopped")
 
     def add_task(self, task: Task):
@@ -65,63 +166,216 @@ class BatchProcessor:
         if not self.is_running:
             raise RuntimeError("Batch processor is not running")
 
+        if self.bulk_dispatcher is not None and self.bulk_dispatcher.route(task):
+            logger.task_info(task.task_id, "Added task %s to bulk dispatcher", task.task_id)
+            return
+
+        self.tracer.start(task)
         self.task_queue.put(task)
-        logger.info(f"Added task {task.task_id} to queue")
+        logger.task_info(task.task_id, "Added task %s to queue", task.task_id)
 
     def add_batch(self, tasks: List[Task]):
-        """Añade un batch de tareas"""
-        for task in tasks:
-            self.add_task(task)
+        """Añade un batch de tareas (una sola escritura si el backend es persistente)"""
+        if not self.is_running:
+            raise RuntimeError("Batch processor is not running")
+
+        dispatch = tasks
+        if self.write_combiner is not None:
+            dispatch = self.write_combiner.combine(tasks)
+        if self.bulk_dispatcher is not None:
+            dispatch = [task for task in dispatch if not self.bulk_dispatcher.route(task)]
 
-        logger.info(f"Added batch of {len(tasks)} tasks")
+        if self.tracer.enabled:
+            for task in dispatch:
+                self.tracer.start(task)
+        self.task_queue.put_many(dispatch)
+        for task in dispatch:
+            logger.task_info(task.task_id, "Added task %s to queue", task.task_id)
 
-    def process_batch_sync(self, tasks: List[Task]) -> List[Task]:
+        if len(dispatch) < len(tasks):
+            logger.info(f"Added batch of {len(tasks)} tasks ({len(dispatch)} queued as individual requests)")
+        else:
+            logger.info(f"Added batch of {len(tasks)} tasks")
+
+    def submit_batch(self, tasks: List[Task]) -> BatchHandle:
+        """Añade un batch y devuelve un handle para seguir su finalización"""
+        handle = BatchHandle(tasks)
+
+        # Registrar antes de encolar: un worker puede terminar enseguida
+        with self.handles_lock:
+            for task in handle.tasks:
+                self.handles[task.task_id] = handle
+                if task.batch_id is None:
+                    task.batch_id = handle.batch_id
+
+        self.add_batch(handle.tasks)
+        return handle
+
+    def submit_task_batch(self, batch: TaskBatch, chunk_size: int = None) -> TaskBatchHandle:
+        """Añade un TaskBatch; sus Task se materializan por bloques según avanza la cola"""
+        if not self.is_running:
+            raise RuntimeError("Batch processor is not running")
+
+        handle = TaskBatchHandle(batch.batch_id, len(batch))
+        if len(batch) == 0:
+            return handle
+        with self.handles_lock:
+            self.batch_handles[batch.batch_id] = handle
+
+        feeder = threading.Thread(
+            target=self._feed_task_batch,
+            args=(batch, chunk_size or config.BATCH_SIZE),
+            name=f"task-batch-feeder-{batch.batch_id[:8]}",
+            daemon=True
+        )
+        feeder.start()
+        logger.info(f"Submitted task batch {batch.batch_id} with {len(batch)} tasks")
+        return handle
+
+    def _feed_task_batch(self, batch: TaskBatch, chunk_size: int):
+        """Thread que encola un TaskBatch por bloques (la cola acotada marca el ritmo)"""
+        for start in range(0, len(batch), chunk_size):
+            if self.stop_event.is_set():
+                logger.warning(f"Task batch {batch.batch_id} interrupted at task {start} of {len(batch)}")
+                return
+            self.add_batch([batch.task(index)
+                            for index in range(start, min(start + chunk_size, len(batch)))])
+
+    def process_batch_sync(self, tasks: List[Task], timeout: float = None) -> List[Task]:
         """Procesa un batch de manera síncrona (espera a que termine)"""
         if not self.is_running:
             self.start()
 
-        # Añadir tareas
-        self.add_batch(tasks)
+        handle = self.submit_batch(tasks)
 
-        # Esperar a que se procesen todas
-        self.task_queue.join()
+        # Devuelve en cuanto termina la última tarea de este batch
+        return handle.results(timeout)
 
-        # Dar tiempo para que se recolecten los resultados
-        time.sleep(0.5)
+    def _collect_results(self):
+        """Thread que recolecta resultados de la cola hasta la señal de fin (None)"""
+        while True:
+            result = self.result_queue.get()
+            if result is None:
+                break
+            self._record_result(result)
 
-        return self.get_results()
+        # Los reintentos pendientes ya no se harán: fallan para que sus handles terminen
+        for task in self.retry_scheduler.cancel_pending():
+            self._record_result(task)
 
-    def _collect_results(self):
-        """Thread que recolecta resultados de la cola"""
-        while not self.stop_event.is_set() or not self.result_queue.empty():
-            try:
-                result = self.result_queue.get(timeout=1)
-                if result:
-                    self.results.append(result)
-                    self._process_result(result)
-            except queue.Empty:
-                continue
+        # Fin del stream para los consumidores de stream_results
+        self._publish(None)
+
+    def _record_result(self, result: Task):
+        """Registra un resultado y avisa a su handle y a los suscriptores"""
+        self.tracer.record(result)
+        self.task_queue.ack(result)
+        for task in self._expand(result):
+            self.statistics.record_result(task)
+            self.result_store.add(task)
+            self._process_result(task)
+            self._notify_handle(task)
+            self._publish(task)
+
+    def _expand(self, result: Task) -> List[Task]:
+        """Tareas originales representadas por un resultado (bulk y/o PATCH combinado)"""
+        tasks = [result]
+        if self.bulk_dispatcher is not None:
+            tasks = self.bulk_dispatcher.expand(result)
+        if self.write_combiner is not None:
+            tasks = [original for task in tasks for original in self.write_combiner.expand(task)]
+        return tasks
 
     def _process_result(self, task: Task):
         """Procesa un resultado (puede extenderse para guardar en BD, etc.)"""
         if task.status == TaskStatus.COMPLETED:
-            logger.info(f"Task {task.task_id} completed successfully")
+            logger.task_info(task.task_id, "Task %s completed successfully", task.task_id)
         else:
             logger.error(f"Task {task.task_id} failed: {task.error_message}")
 
+    def _notify_handle(self, task: Task):
+        """Avisa al handle del batch al que pertenece la tarea"""
+        with self.handles_lock:
+            handle = self.handles.pop(task.task_id, None)
+            batch_handle = self.batch_handles.get(task.batch_id) if handle is None else None
+
+        if handle is not None:
+            handle._task_done(task)
+        elif batch_handle is not None:
+            batch_handle._task_done(task)
+            if batch_handle.done():
+                with self.handles_lock:
+                    self.batch_handles.pop(task.batch_id, None)
+
+    def _publish(self, task: Optional[Task]):
+        """Entrega la tarea a los consumidores de stream_results"""
+        with self.subscribers_lock:
+            subscribers = list(self.subscribers)
+
+        for subscriber in subscribers:
+            subscriber.put(task)
+
+    def add_result_listener(self, listener: ResultListener):
+        """Registra un callback que recibe cada tarea terminada"""
+        self.result_store.add_listener(listener)
+
+    def remove_result_listener(self, listener: ResultListener):
+        """Elimina un callback registrado con add_result_listener"""
+        self.result_store.remove_listener(listener)
+
+    def stream_results(self, timeout: float = None) -> Iterator[Task]:
+        """Itera las tareas según terminan, hasta que se detiene el procesador.
+
+        La suscripción empieza al llamar al método; la cola del suscriptor es
+        acotada, así que un consumidor lento frena la recolección.
+        """
+        subscriber = queue.Queue(maxsize=config.QUEUE_MAX_SIZE)
+        with self.subscribers_lock:
+            self.subscribers.append(subscriber)
+
+        def iterate():
+            try:
+                while True:
+                    try:
+                        task = subscriber.get(timeout=timeout)
+                    except queue.Empty:
+                        raise TimeoutError("No results received within timeout")
+                    if task is None:
+                        return
+                    yield task
+            finally:
+                with self.subscribers_lock:
+                    if subscriber in self.subscribers:
+                        self.subscribers.remove(subscriber)
+
+        return iterate()
+
     def get_results(self) -> List[Task]:
-        """Obtiene los resultados procesados"""
-        return self.results.copy()
+        """Obtiene los resultados retenidos en memoria"""
+        return self.result_store.snapshot()
+
+    def export_trace(self, path: str, format: str = None) -> int:
+        """Exporta los tiempos de las últimas tareas trazadas (Chrome Trace u OTLP JSON)"""
+        exported = self.tracer.export(path, format or config.TRACE_EXPORT_FORMAT)
+        logger.info(f"Exported stage timings of {exported} tasks to {path}")
+        return exported
 
     def get_statistics(self) -> Dict[str, Any]:
-        """Obtiene estadísticas del procesamiento"""
-        completed = sum(1 for t in self.results if t.status == TaskStatus.COMPLETED)
-        failed = sum(1 for t in self.results if t.status == TaskStatus.FAILED)
-
-        return {
-            "total_processed": len(self.results),
-            "completed": completed,
-            "failed": failed,
-            "success_rate": (completed / len(self.results) * 100) if self.results else 0,
-            "queue_size": self.task_queue.qsize()
-        }
+        """Obtiene estadísticas del procesamiento (lectura de contadores, O(1))"""
+        stats = self.statistics.snapshot()
+        stats.update({
+            "queue_size": self.task_queue.qsize(),
+            "in_flight": sum(1 for worker in self.workers if worker.current_task is not None),
+            "retrying": self.retry_scheduler.pending_count(),
+            "queue_delay_ms": self.task_queue.queue_delay_stats(),
+            "connections": connection_pool.stats(),
+            "limits": request_limiter.stats(),
+            "cache": response_cache.stats()
+        })
+        if self.write_combiner is not None:
+            stats["write_combining"] = self.write_combiner.stats()
+        if self.bulk_dispatcher is not None:
+            stats["bulk"] = self.bulk_dispatcher.stats()
+        if self.tracer.enabled:
+            stats["stages_ms"] = self.tracer.summary()
+        return stats
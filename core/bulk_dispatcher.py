@@ -0,0 +1,186 @@
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+from models.task import Task, TaskStatus
+from services.batch_adapter import BatchAdapter
+from core.queue_backend import QueueBackend
+from core.retry_scheduler import RetryScheduler
+from config.settings import config
+from log_system.logger import logger
+
+class BulkDispatcher(threading.Thread):
+    """Empaqueta tareas compatibles en peticiones bulk.
+
+    Las tareas que admite algún ``BatchAdapter`` no van directas a la cola:
+    se agrupan por clave hasta reunir ``batch_size`` o hasta que la más
+    antigua del grupo lleva ``linger`` segundos esperando, y entonces se
+    encola una única tarea bulk. Cuando ésta termina, ``expand`` reparte la
+    respuesta entre las tareas originales. Los fallos parciales reintentables
+    se reprograman de forma individual con el scheduler de reintentos; si
+    falla la petición bulk entera fallan todas sus tareas.
+    """
+
+    def __init__(self, adapters: List[BatchAdapter], task_queue: QueueBackend,
+                 stop_event: threading.Event, retry_scheduler: Optional[RetryScheduler] = None,
+                 batch_size: int = None, linger: float = None):
+        super().__init__()
+        self.adapters = adapters
+        self.task_queue = task_queue
+        self.stop_event = stop_event
+        self.retry_scheduler = retry_scheduler
+        self.batch_size = batch_size or config.BATCH_SIZE
+        self.linger = linger if linger is not None else config.BATCH_LINGER
+        self._groups: Dict[Tuple[int, Hashable], Tuple[float, List[Task]]] = {}
+        self._in_flight: Dict[str, Tuple[BatchAdapter, List[Task]]] = {}
+        self._condition = threading.Condition()
+        self._stopped = False
+        self.bulk_requests = 0
+        self.bulk_tasks = 0
+        self.partial_retries = 0
+        self.daemon = True
+
+    def route(self, task: Task) -> bool:
+        """Acepta la tarea si algún adapter la admite (True) o la deja pasar (False)"""
+        for index, adapter in enumerate(self.adapters):
+            key = adapter.group_key(task)
+            if key is not None:
+                break
+        else:
+            return False
+
+        group_key = (index, key)
+        with self._condition:
+            if self._stopped:
+                return False
+            if group_key not in self._groups:
+                self._groups[group_key] = (time.monotonic(), [])
+                self._condition.notify()
+            tasks = self._groups[group_key][1]
+            tasks.append(task)
+            full = len(tasks) >= self.batch_size
+            if full:
+                del self._groups[group_key]
+
+        if full:
+            self._dispatch(adapter, tasks)
+        return True
+
+    def run(self):
+        """Despacha los grupos cuya ventana de espera ha vencido"""
+        while not self.stop_event.is_set():
+            with self._condition:
+                now = time.monotonic()
+                due = [key for key, (since, _) in self._groups.items() if now - since >= self.linger]
+                expired = [(key[0], self._groups.pop(key)[1]) for key in due]
+                if not expired:
+                    oldest = min((since for since, _ in self._groups.values()), default=None)
+                    wait_time = 1 if oldest is None else oldest + self.linger - now
+                    self._condition.wait(timeout=min(max(wait_time, 0), 1))
+                    continue
+
+            for index, tasks in expired:
+                self._dispatch(self.adapters[index], tasks)
+
+    def stop(self) -> List[Task]:
+        """Despierta al thread y falla los grupos que no llegaron a enviarse.
+
+        Devuelve esas tareas (FAILED) para que el procesador las entregue
+        como resultado y sus handles terminen; a partir de aquí ``route``
+        deja pasar las tareas nuevas.
+        """
+        with self._condition:
+            self._stopped = True
+            pending = [task for _, tasks in self._groups.values() for task in tasks]
+            self._groups.clear()
+            self._condition.notify()
+
+        now = datetime.now()
+        for task in pending:
+            task.status = TaskStatus.FAILED
+            task.completed_at = now
+            task.error_message = "Processor stopped before the bulk request was sent"
+        if pending:
+            logger.warning(f"Failed {len(pending)} tasks still waiting for a bulk request")
+        return pending
+
+    def _dispatch(self, adapter: BatchAdapter, tasks: List[Task]):
+        """Encola la petición bulk que agrupa ``tasks``"""
+        bulk = adapter.build_request(tasks)
+        # La petición bulk hereda la urgencia y el flujo de sus tareas
+        bulk.priority = max(task.priority for task in tasks)
+        bulk.tenant = tasks[0].tenant
+        bulk.batch_id = tasks[0].batch_id
+        with self._condition:
+            self._in_flight[bulk.task_id] = (adapter, tasks)
+            self.bulk_requests += 1
+            self.bulk_tasks += len(tasks)
+
+        self.task_queue.put(bulk)
+        logger.info(f"Packed {len(tasks)} tasks into bulk request {bulk.task_id} ({bulk.method.value} {bulk.endpoint})")
+
+    def expand(self, task: Task) -> List[Task]:
+        """Tareas originales terminadas de una tarea bulk (ella misma si no es bulk)"""
+        with self._condition:
+            entry = self._in_flight.pop(task.task_id, None)
+        if entry is None:
+            return [task]
+
+        adapter, originals = entry
+        if task.status != TaskStatus.COMPLETED:
+            for original in originals:
+                self._finish(original, task, TaskStatus.FAILED, error=task.error_message)
+            return originals
+
+        try:
+            items = adapter.split_response(originals, (task.response_data or {}).get("response"))
+        except (ValueError, KeyError, TypeError, AttributeError) as e:
+            logger.error(f"Bulk request {task.task_id} returned an unusable response: {str(e)}")
+            for original in originals:
+                self._finish(original, task, TaskStatus.FAILED, error=str(e))
+            return originals
+
+        finished = []
+        for original, item in zip(originals, items):
+            if item.ok:
+                self._finish(original, task, TaskStatus.COMPLETED,
+                             response={"status_code": item.status_code, "response": item.response})
+                finished.append(original)
+                continue
+
+            original.attempts += task.attempts
+            error = f"{item.status_code} in bulk request {task.task_id}: {item.response}"
+            if (self.retry_scheduler is not None and item.status_code in config.RETRY_ON_STATUS
+                    and original.attempts < config.MAX_RETRIES):
+                # Fallo parcial: solo esta tarea se reintenta, de forma individual
+                original.error_message = error
+                self.retry_scheduler.schedule(original)
+                self.partial_retries += 1
+                continue
+
+            self._finish(original, task, TaskStatus.FAILED, error=error, count_attempts=False)
+            finished.append(original)
+
+        return finished
+
+    @staticmethod
+    def _finish(original: Task, bulk: Task, status: TaskStatus, response: Any = None,
+                error: Optional[str] = None, count_attempts: bool = True):
+        if count_attempts:
+            original.attempts += bulk.attempts
+        original.status = status
+        original.started_at = original.started_at or bulk.started_at
+        original.completed_at = bulk.completed_at or datetime.now()
+        original.response_data = response
+        original.error_message = error
+
+    def stats(self) -> Dict[str, int]:
+        """Peticiones bulk enviadas y tareas que agruparon"""
+        with self._condition:
+            return {
+                "bulk_requests": self.bulk_requests,
+                "bulk_tasks": self.bulk_tasks,
+                "partial_retries": self.partial_retries,
+                "lingering": sum(len(tasks) for _, tasks in self._groups.values()),
+                "in_flight": len(self._in_flight)
+            }
@@ -0,0 +1,510 @@
+import dataclasses
+import json
+import math
+import multiprocessing
+import threading
+import time
+import uuid
+from collections import deque
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Deque, Dict, List, Optional
+import requests
+from models.task import Task, TaskStatus
+from core.batch_handle import BatchHandle
+from core.batch_processor import BatchProcessor
+from core.queue_backend import serialize_task, deserialize_task
+from core.process_pool_processor import apply_child_config
+from core.result_store import ResultStore, ResultRetention, ResultListener
+from core.statistics import ProcessorStatistics
+from config.settings import config
+from log_system.logger import logger
+
+def serialize_result(task: Task) -> Dict[str, Any]:
+    """Resultado de una tarea tal como viaja del nodo al coordinador"""
+    return {
+        "task_id": task.task_id,
+        "status": task.status.value,
+        "attempts": task.attempts,
+        "started_at": task.started_at.isoformat() if task.started_at else None,
+        "completed_at": task.completed_at.isoformat() if task.completed_at else None,
+        "error_message": task.error_message,
+        "response_data": task.response_data
+    }
+
+def apply_result(task: Task, result: Dict[str, Any]):
+    """Copia un resultado serializado a la tarea original"""
+    task.status = TaskStatus(result["status"])
+    task.attempts = result["attempts"]
+    task.started_at = datetime.fromisoformat(result["started_at"]) if result["started_at"] else None
+    task.completed_at = datetime.fromisoformat(result["completed_at"]) if result["completed_at"] else None
+    task.error_message = result["error_message"]
+    task.response_data = result["response_data"]
+
+@dataclasses.dataclass
+class _Lease:
+    lease_id: str
+    node_id: str
+    task_ids: set
+    expires: float
+
+class _CoordinatorHandler(BaseHTTPRequestHandler):
+    """Protocolo JSON sobre HTTP entre nodos y coordinador"""
+
+    def do_POST(self):
+        coordinator: "ClusterCoordinator" = self.server.coordinator
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+
+        if self.path == "/lease":
+            self._reply(coordinator.lease(body["node_id"], body.get("max_tasks", config.CLUSTER_LEASE_SIZE),
+                                          body.get("wait", 1.0)))
+        elif self.path == "/heartbeat":
+            self._reply(coordinator.heartbeat(body["node_id"], body.get("stats", {})))
+        elif self.path == "/results":
+            self._reply(coordinator.report(body["node_id"], body["results"]))
+        else:
+            self._reply({"error": "Not found"}, 404)
+
+    def do_GET(self):
+        if self.path == "/stats":
+            self._reply(self.server.coordinator.get_statistics())
+        else:
+            self._reply({"error": "Not found"}, 404)
+
+    def _reply(self, payload: Dict[str, Any], status: int = 200):
+        body = json.dumps(payload, default=str).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        """Sin log por petición: el coordinador registra los eventos relevantes"""
+
+class ClusterCoordinator:
+    """Coordinador del modo distribuido: reparte un trabajo entre nodos remotos.
+
+    Los nodos (``ClusterNode``) piden tareas por HTTP y reciben un *lease*:
+    mientras sigan enviando heartbeats sus leases se renuevan; si un nodo
+    deja de latir durante ``lease_timeout`` sus tareas sin terminar vuelven a
+    la cola y se entregan a otro nodo. La entrega es al-menos-una-vez: si un
+    nodo dado por muerto reporta después, se usa el primer resultado y los
+    duplicados se ignoran. La API es la de BatchProcessor y
+    ``get_statistics`` agrega las estadísticas de todo el cluster.
+    """
+
+    def __init__(self, host: str = None, port: int = None, lease_timeout: float = None,
+                 retention: ResultRetention = None, keep_last: int = None,
+                 spill_path: str = None, on_result: Optional[ResultListener] = None):
+        self.host = host or config.CLUSTER_HOST
+        self.port = port if port is not None else config.CLUSTER_PORT
+        self.lease_timeout = lease_timeout or config.CLUSTER_LEASE_TIMEOUT
+        self.result_store = ResultStore(
+            retention=retention or config.RESULTS_RETENTION,
+            keep_last=config.RESULTS_KEEP_LAST if keep_last is None else keep_last,
+            spill_path=spill_path or config.RESULTS_SPILL_PATH or None
+        )
+        if on_result is not None:
+            self.result_store.add_listener(on_result)
+        self.statistics = ProcessorStatistics()
+        self.pending: Deque[Task] = deque()
+        self.submitted: Dict[str, Task] = {}
+        self.handles: Dict[str, BatchHandle] = {}
+        self.leases: Dict[str, _Lease] = {}
+        self.task_lease: Dict[str, str] = {}
+        self.nodes: Dict[str, Dict[str, Any]] = {}
+        self.redispatched = 0
+        self.duplicates = 0
+        self.condition = threading.Condition()
+        self.local_nodes: List[multiprocessing.Process] = []
+        self.server: ThreadingHTTPServer = None
+        self.is_running = False
+
+    @property
+    def url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        """Arranca el servidor HTTP y el thread que recupera leases vencidos"""
+        if self.is_running:
+            logger.warning("Cluster coordinator already running")
+            return
+
+        self.server = ThreadingHTTPServer((self.host, self.port), _CoordinatorHandler)
+        self.server.daemon_threads = True
+        self.server.coordinator = self
+        self.shutting_down = False
+        self.is_running = True
+
+        threading.Thread(target=self.server.serve_forever, name="cluster-http", daemon=True).start()
+        self.reaper = threading.Thread(target=self._reap_leases, name="cluster-reaper", daemon=True)
+        self.reaper.start()
+        logger.info(f"Cluster coordinator listening on {self.url}")
+
+    def stop(self):
+        """Pide a los nodos que terminen y detiene el servidor"""
+        logger.info("Stopping cluster coordinator")
+        with self.condition:
+            self.shutting_down = True
+            self.condition.notify_all()
+
+        # Los nodos reciben "shutdown" en su siguiente lease
+        for process in self.local_nodes:
+            process.join(timeout=config.CLUSTER_HEARTBEAT_INTERVAL + 10)
+            if process.is_alive():
+                process.terminate()
+        self.local_nodes = []
+
+        self.is_running = False
+        self.server.shutdown()
+        self.server.server_close()
+        self.reaper.join(timeout=5)
+        self.result_store.close()
+        logger.info("Cluster coordinator stopped")
+
+    def spawn_local_nodes(self, num_nodes: int, num_workers: int = None) -> List[str]:
+        """Lanza ``num_nodes`` nodos como procesos locales (cluster de pruebas)"""
+        context = multiprocessing.get_context("spawn")
+        config_values = dataclasses.asdict(config)
+        node_ids = []
+        for index in range(num_nodes):
+            node_id = f"local-{index}-{uuid.uuid4().hex[:6]}"
+            process = context.Process(
+                target=_run_local_node,
+                args=(self.url, node_id, num_workers, config_values),
+                name=f"cluster-node-{index}",
+                daemon=True
+            )
+            process.start()
+            self.local_nodes.append(process)
+            node_ids.append(node_id)
+        return node_ids
+
+    def wait_for_nodes(self, count: int, timeout: float = None) -> bool:
+        """Espera a que haya ``count`` nodos vivos conectados"""
+        with self.condition:
+            return self.condition.wait_for(
+                lambda: sum(1 for node in self.nodes.values() if node["alive"]) >= count,
+                timeout=timeout
+            )
+
+    def add_task(self, task: Task):
+        """Añade una tarea"""
+        self.add_batch([task])
+
+    def add_batch(self, tasks: List[Task]):
+        """Añade un batch de tareas a la cola del cluster"""
+        if not self.is_running:
+            raise RuntimeError("Batch processor is not running")
+
+        with self.condition:
+            for task in tasks:
+                self.submitted[task.task_id] = task
+            self.pending.extend(tasks)
+            self.condition.notify_all()
+
+        logger.info(f"Added batch of {len(tasks)} tasks")
+
+    def submit_batch(self, tasks: List[Task]) -> BatchHandle:
+        """Añade un batch y devuelve un handle para seguir su finalización"""
+        handle = BatchHandle(tasks)
+
+        with self.condition:
+            for task in handle.tasks:
+                self.handles[task.task_id] = handle
+                if task.batch_id is None:
+                    task.batch_id = handle.batch_id
+
+        self.add_batch(handle.tasks)
+        return handle
+
+    def process_batch_sync(self, tasks: List[Task], timeout: float = None) -> List[Task]:
+        """Procesa un batch de manera síncrona (espera a que termine)"""
+        if not self.is_running:
+            self.start()
+
+        return self.submit_batch(tasks).results(timeout)
+
+    def lease(self, node_id: str, max_tasks: int, wait: float = 1.0) -> Dict[str, Any]:
+        """Entrega hasta ``max_tasks`` tareas al nodo (espera hasta ``wait`` s si no hay)"""
+        with self.condition:
+            self._touch(node_id)
+            self.condition.wait_for(lambda: self.pending or self.shutting_down, timeout=wait)
+            if self.shutting_down:
+                return {"shutdown": True}
+
+            # Reparto proporcional: un nodo no se lleva toda la cola si hay otros vivos
+            alive = sum(1 for node in self.nodes.values() if node["alive"])
+            max_tasks = min(max_tasks, max(1, math.ceil(len(self.pending) / max(alive, 1))))
+
+            tasks = []
+            while self.pending and len(tasks) < max_tasks:
+                task = self.pending.popleft()
+                if task.task_id in self.submitted:  # no reentregar lo ya terminado
+                    tasks.append(task)
+            if not tasks:
+                return {"tasks": []}
+
+            lease = _Lease(uuid.uuid4().hex, node_id, {task.task_id for task in tasks},
+                           time.monotonic() + self.lease_timeout)
+            self.leases[lease.lease_id] = lease
+            for task in tasks:
+                self.task_lease[task.task_id] = lease.lease_id
+            self.nodes[node_id]["leased"] += len(tasks)
+
+        return {
+            "lease_id": lease.lease_id,
+            "lease_timeout": self.lease_timeout,
+            "tasks": [serialize_task(task) for task in tasks],
+            "attempts": [task.attempts for task in tasks]
+        }
+
+    def heartbeat(self, node_id: str, stats: Dict[str, Any]) -> Dict[str, Any]:
+        """Renueva los leases del nodo y guarda su estado"""
+        with self.condition:
+            self._touch(node_id)
+            self.nodes[node_id]["stats"] = stats
+            expires = time.monotonic() + self.lease_timeout
+            for lease in self.leases.values():
+                if lease.node_id == node_id:
+                    lease.expires = expires
+            return {"shutdown": self.shutting_down}
+
+    def report(self, node_id: str, results: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Registra resultados de un nodo; el primero de cada tarea gana"""
+        finished = []
+        with self.condition:
+            self._touch(node_id)
+            for result in results:
+                task = self.submitted.pop(result["task_id"], None)
+                lease_id = self.task_lease.pop(result["task_id"], None)
+                if lease_id is not None and lease_id in self.leases:
+                    lease = self.leases[lease_id]
+                    lease.task_ids.discard(result["task_id"])
+                    if not lease.task_ids:
+                        del self.leases[lease_id]
+                if task is None:
+                    self.duplicates += 1
+                    continue
+                self.nodes[node_id]["completed"] += 1
+                finished.append((task, result, self.handles.pop(task.task_id, None)))
+
+        for task, result, handle in finished:
+            apply_result(task, result)
+            self.statistics.record_result(task)
+            self.result_store.add(task)
+            if handle is not None:
+                handle._task_done(task)
+
+        return {"accepted": len(finished)}
+
+    def _touch(self, node_id: str):
+        node = self.nodes.get(node_id)
+        if node is None:
+            node = self.nodes[node_id] = {"leased": 0, "completed": 0, "stats": {}, "alive": False}
+            logger.info(f"Node {node_id} joined the cluster")
+        elif not node["alive"]:
+            logger.info(f"Node {node_id} is back")
+        if not node["alive"]:
+            self.condition.notify_all()
+        node["alive"] = True
+        node["last_seen"] = time.monotonic()
+
+    def _reap_leases(self):
+        """Devuelve a la cola las tareas de los leases que no se renovaron a tiempo"""
+        while self.is_running:
+            time.sleep(min(self.lease_timeout / 4, 1))
+            now = time.monotonic()
+            with self.condition:
+                expired = [lease for lease in self.leases.values() if lease.expires <= now]
+                for lease in expired:
+                    del self.leases[lease.lease_id]
+                    tasks = [self.submitted[task_id] for task_id in lease.task_ids
+                             if task_id in self.submitted]
+                    for task_id in lease.task_ids:
+                        self.task_lease.pop(task_id, None)
+                    # Al frente de la cola: son las tareas que más llevan esperando
+                    self.pending.extendleft(reversed(tasks))
+                    self.redispatched += len(tasks)
+                    self.nodes[lease.node_id]["alive"] = False
+                    logger.warning(f"Lease {lease.lease_id} of node {lease.node_id} expired: "
+                                   f"re-dispatching {len(tasks)} tasks")
+
+                # Nodos sin heartbeat ni petición en lease_timeout, tengan leases o no
+                for node_id, node in self.nodes.items():
+                    if node["alive"] and now - node["last_seen"] > self.lease_timeout:
+                        node["alive"] = False
+                        node["stats"] = {}
+                        logger.warning(f"Node {node_id} stopped sending heartbeats: marked as dead")
+                if expired:
+                    self.condition.notify_all()
+
+    def get_results(self) -> List[Task]:
+        """Obtiene los resultados retenidos en memoria"""
+        return self.result_store.snapshot()
+
+    def add_result_listener(self, listener: ResultListener):
+        """Registra un callback que recibe cada tarea terminada"""
+        self.result_store.add_listener(listener)
+
+    def remove_result_listener(self, listener: ResultListener):
+        """Elimina un callback registrado con add_result_listener"""
+        self.result_store.remove_listener(listener)
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Estadísticas agregadas de todo el cluster"""
+        stats = self.statistics.snapshot()
+        now = time.monotonic()
+        with self.condition:
+            nodes = {
+                node_id: {
+                    "alive": node["alive"],
+                    "last_seen_s": round(now - node["last_seen"], 2),
+                    "leased": node["leased"],
+                    "completed": node["completed"],
+                    **node["stats"]
+                }
+                for node_id, node in self.nodes.items()
+            }
+            stats.update({
+                "queue_size": len(self.pending) + sum(n["stats"].get("queue_size", 0) for n in self.nodes.values()),
+                "in_flight": sum(n["stats"].get("in_flight", 0) for n in self.nodes.values()),
+                "retrying": sum(n["stats"].get("retrying", 0) for n in self.nodes.values()),
+                "leased": len(self.task_lease),
+                "redispatched": self.redispatched,
+                "duplicates": self.duplicates,
+                "nodes": nodes
+            })
+        return stats
+
+class ClusterNode:
+    """Nodo del cluster: procesa con un BatchProcessor local las tareas que le asigna el coordinador"""
+
+    def __init__(self, coordinator_url: str, node_id: str = None, num_workers: int = None):
+        self.coordinator_url = coordinator_url.rstrip("/")
+        self.node_id = node_id or f"{uuid.uuid4().hex[:12]}"
+        self.processor = BatchProcessor(num_workers=num_workers, retention=ResultRetention.NONE)
+        self.session = requests.Session()
+        self.finished: "deque[Task]" = deque()
+        self.capacity = threading.Semaphore(config.CLUSTER_NODE_PREFETCH)
+        self.stop_event = threading.Event()
+
+    def _post(self, path: str, payload: Dict[str, Any], timeout: float = 10) -> Dict[str, Any]:
+        response = self.session.post(f"{self.coordinator_url}{path}", json=payload, timeout=timeout)
+        response.raise_for_status()
+        return response.json()
+
+    def _on_result(self, task: Task):
+        self.finished.append(task)
+        self.capacity.release()
+
+    def run(self):
+        """Pide, procesa y reporta tareas hasta que el coordinador indique parar"""
+        self.processor.add_result_listener(self._on_result)
+        self.processor.start()
+        threads = [
+            threading.Thread(target=self._heartbeat_loop, name="node-heartbeat", daemon=True),
+            threading.Thread(target=self._report_loop, name="node-report", daemon=True)
+        ]
+        for thread in threads:
+            thread.start()
+        logger.info(f"Node {self.node_id} connected to {self.coordinator_url}")
+
+        lease_size = min(config.CLUSTER_LEASE_SIZE, config.CLUSTER_NODE_PREFETCH)
+        try:
+            while not self.stop_event.is_set():
+                # Solo pedir trabajo si cabe entero en el prefetch del nodo
+                if not self._reserve(lease_size):
+                    break
+                try:
+                    reply = self._post("/lease", {"node_id": self.node_id, "max_tasks": lease_size, "wait": 1.0})
+                except requests.exceptions.RequestException as e:
+                    logger.warning(f"Node {self.node_id}: coordinator unreachable - {str(e)}")
+                    self._release(lease_size)
+                    self.stop_event.wait(1)
+                    continue
+
+                if reply.get("shutdown"):
+                    break
+                tasks = [deserialize_task(payload, attempts)
+                         for payload, attempts in zip(reply.get("tasks", []), reply.get("attempts", []))]
+                self._release(lease_size - len(tasks))
+                if tasks:
+                    self.processor.add_batch(tasks)
+        finally:
+            self.stop_event.set()
+            for thread in threads:
+                thread.join(timeout=5)
+            self.processor.stop()
+            logger.info(f"Node {self.node_id} stopped")
+
+    def _reserve(self, count: int) -> bool:
+        """Reserva ``count`` huecos de prefetch; False si el nodo se detiene antes"""
+        reserved = 0
+        while reserved < count:
+            if self.capacity.acquire(timeout=0.5):
+                reserved += 1
+            elif self.stop_event.is_set():
+                self._release(reserved)
+                return False
+        return True
+
+    def _release(self, count: int):
+        for _ in range(count):
+            self.capacity.release()
+
+    def _heartbeat_loop(self):
+        while not self.stop_event.wait(config.CLUSTER_HEARTBEAT_INTERVAL):
+            stats = self.processor.get_statistics()
+            try:
+                reply = self._post("/heartbeat", {"node_id": self.node_id, "stats": {
+                    key: stats[key] for key in ("queue_size", "in_flight", "retrying", "total_processed")
+                }})
+                if reply.get("shutdown"):
+                    self.stop_event.set()
+            except requests.exceptions.RequestException as e:
+                logger.warning(f"Node {self.node_id}: heartbeat failed - {str(e)}")
+
+    def _report_loop(self):
+        """Envía los resultados agrupados (hasta CLUSTER_LEASE_SIZE por petición)"""
+        while not self.stop_event.is_set() or self.finished:
+            batch = []
+            while self.finished and len(batch) < config.CLUSTER_LEASE_SIZE:
+                batch.append(self.finished.popleft())
+            if not batch:
+                time.sleep(0.02)
+                continue
+            try:
+                self._post("/results", {"node_id": self.node_id,
+                                        "results": [serialize_result(task) for task in batch]})
+            except requests.exceptions.RequestException as e:
+                logger.warning(f"Node {self.node_id}: could not report {len(batch)} results - {str(e)}")
+                if self.stop_event.is_set():
+                    return
+                self.finished.extendleft(reversed(batch))
+                time.sleep(1)
+
+def _run_local_node(coordinator_url: str, node_id: str, num_workers: Optional[int],
+                    config_values: Dict[str, Any]):
+    """Punto de entrada de un nodo lanzado con spawn_local_nodes"""
+    apply_child_config(config_values, node_id)
+    ClusterNode(coordinator_url, node_id=node_id, num_workers=num_workers).run()
+
+def main():
+    """CLI: python -m core.cluster node --coordinator http://host:puerto"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Nodo del procesador distribuido")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    node_parser = subparsers.add_parser("node", help="Conecta un nodo a un coordinador")
+    node_parser.add_argument("--coordinator", required=True)
+    node_parser.add_argument("--node-id")
+    node_parser.add_argument("--workers", type=int, default=config.NUM_WORKERS)
+    args = parser.parse_args()
+
+    ClusterNode(args.coordinator, node_id=args.node_id, num_workers=args.workers).run()
+
+if __name__ == "__main__":
+    main()
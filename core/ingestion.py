@@ -0,0 +1,192 @@
+import csv
+import json
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterator, Optional, Tuple
+from models.task import Task, HTTPMethod
+from config.settings import config
+from log_system.logger import logger
+
+def task_from_record(record: Dict[str, Any]) -> Task:
+    """Construye una Task a partir de un registro de entrada"""
+    kwargs = {
+        "method": HTTPMethod(record["method"].upper()),
+        "endpoint": record["endpoint"],
+        "data": record.get("data"),
+        "headers": record.get("headers")
+    }
+    if record.get("task_id"):
+        kwargs["task_id"] = record["task_id"]
+    return Task(**kwargs)
+
+def read_jsonl(stream: BinaryIO, offset: int = 0) -> Iterator[Tuple[Task, int]]:
+    """Lee tareas JSON Lines; produce (tarea, offset tras la línea)"""
+    for line in stream:
+        offset += len(line)
+        if line.strip():
+            yield task_from_record(json.loads(line)), offset
+
+def read_csv(stream: BinaryIO, offset: int = 0) -> Iterator[Tuple[Task, int]]:
+    """Lee tareas CSV (cabecera method,endpoint[,data,headers]).
+
+    ``data`` y ``headers`` van como JSON dentro de la celda. Cada registro
+    debe ocupar una sola línea para que los offsets sean reanudables.
+    """
+    header_line = stream.readline()
+    header = next(csv.reader([header_line.decode("utf-8")]))
+    if offset < len(header_line):
+        offset = len(header_line)
+    elif stream.seekable():
+        stream.seek(offset)
+
+    for line in stream:
+        offset += len(line)
+        if not line.strip():
+            continue
+        values = next(csv.reader([line.decode("utf-8")]))
+        record = dict(zip(header, values))
+        for column in ("data", "headers"):
+            record[column] = json.loads(record[column]) if record.get(column) else None
+        yield task_from_record(record), offset
+
+READERS = {"jsonl": read_jsonl, "csv": read_csv}
+
+class OffsetCheckpoint:
+    """Offset reanudable de un fichero de entrada.
+
+    El offset guardado es el de la última línea tal que ella y todas las
+    anteriores han terminado (completadas o fallidas definitivamente); tras
+    un fallo se reanuda desde ahí sin repetir tareas ya terminadas.
+    """
+
+    def __init__(self, path: Optional[str], interval: float = None):
+        self.path = path
+        self.interval = interval if interval is not None else config.INGESTION_CHECKPOINT_INTERVAL
+        self.committed = self.load()
+        self._outstanding: "OrderedDict[str, int]" = OrderedDict()  # task_id -> offset, en orden de lectura
+        self._done = set()
+        self._condition = threading.Condition()
+        self._last_save = time.monotonic()
+
+    def load(self) -> int:
+        """Offset guardado (0 si no hay checkpoint)"""
+        if self.path and os.path.exists(self.path):
+            with open(self.path) as f:
+                return json.load(f).get("offset", 0)
+        return 0
+
+    def track(self, task: Task, offset: int):
+        """Registra una tarea leída que termina en ``offset``"""
+        with self._condition:
+            self._outstanding[task.task_id] = offset
+
+    def task_done(self, task: Task):
+        """Marca una tarea como terminada y avanza el offset confirmado"""
+        with self._condition:
+            if task.task_id not in self._outstanding:
+                return  # tarea de otro origen
+
+            self._done.add(task.task_id)
+            while self._outstanding:
+                task_id = next(iter(self._outstanding))
+                if task_id not in self._done:
+                    break
+                self.committed = self._outstanding.pop(task_id)
+                self._done.discard(task_id)
+
+            if time.monotonic() - self._last_save >= self.interval:
+                self._save()
+            if not self._outstanding:
+                self._condition.notify_all()
+
+    def pending(self) -> int:
+        with self._condition:
+            return len(self._outstanding)
+
+    def wait(self, timeout: float = None) -> bool:
+        """Espera a que terminen todas las tareas registradas"""
+        with self._condition:
+            return self._condition.wait_for(lambda: not self._outstanding, timeout=timeout)
+
+    def save(self):
+        with self._condition:
+            self._save()
+
+    def _save(self):
+        """Escritura atómica del checkpoint (tmp + rename)"""
+        self._last_save = time.monotonic()
+        if not self.path:
+            return
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"offset": self.committed}, f)
+        os.replace(tmp_path, self.path)
+
+class TaskIngestor:
+    """Alimenta un procesador leyendo tareas de un fichero en streaming.
+
+    Las tareas se leen de una en una y se encolan con ``add_task``; como la
+    cola de BatchProcessor está acotada (QUEUE_MAX_SIZE) la lectura se frena
+    sola cuando los workers no dan abasto, y la memoria queda constante.
+    Para ficheros enormes conviene usar un procesador con retención
+    ``"none"`` o ``"failures"``.
+    """
+
+    def __init__(self, processor, source: str, format: str = None,
+                 checkpoint_path: str = None):
+        self.processor = processor
+        self.source = source
+        self.format = format or self._detect_format(source)
+        if self.format not in READERS:
+            raise ValueError(f"Unsupported input format: {self.format}")
+        if source == "-" and checkpoint_path:
+            raise ValueError("Checkpoints require a seekable input file, not stdin")
+        self.checkpoint = OffsetCheckpoint(checkpoint_path)
+        self.read = 0
+
+    @staticmethod
+    def _detect_format(source: str) -> str:
+        return "csv" if Path(source).suffix.lower() == ".csv" else "jsonl"
+
+    def run(self, timeout: float = None) -> Dict[str, Any]:
+        """Lee toda la entrada, espera a que terminen las tareas y devuelve un resumen"""
+        if not self.processor.is_running:
+            self.processor.start()
+
+        start_offset = self.checkpoint.committed
+        if start_offset:
+            logger.info(f"Resuming ingestion of {self.source} from offset {start_offset}")
+
+        self.processor.add_result_listener(self.checkpoint.task_done)
+        try:
+            with self._open() as stream:
+                if start_offset and self.format == "jsonl":
+                    stream.seek(start_offset)
+
+                for task, offset in READERS[self.format](stream, start_offset):
+                    self.checkpoint.track(task, offset)
+                    self.processor.add_task(task)
+                    self.read += 1
+
+            logger.info(f"Ingested {self.read} tasks from {self.source}")
+            if not self.checkpoint.wait(timeout):
+                raise TimeoutError(f"{self.checkpoint.pending()} ingested tasks still pending")
+        finally:
+            self.processor.remove_result_listener(self.checkpoint.task_done)
+            self.checkpoint.save()
+
+        return {
+            "source": self.source,
+            "tasks_read": self.read,
+            "pending": self.checkpoint.pending(),
+            "committed_offset": self.checkpoint.committed
+        }
+
+    def _open(self):
+        if self.source == "-":
+            return os.fdopen(os.dup(sys.stdin.fileno()), "rb")
+        return open(self.source, "rb")
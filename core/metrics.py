@@ -0,0 +1,180 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Iterable, List, Tuple
+from core.statistics import LatencyHistogram
+from services.connection_pool import connection_pool
+from config.settings import config
+from log_system.logger import logger
+
+# Límites (ms) de los buckets de los histogramas exportados
+HISTOGRAM_BOUNDS_MS = [1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000, 60000]
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+Labels = Tuple[Tuple[str, str], ...]
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+def _number(value) -> str:
+    """Valor de una muestra sin perder precisión en contadores grandes"""
+    return str(value) if isinstance(value, int) else repr(float(value))
+
+def _labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels) + "}"
+
+class _Exposition:
+    """Acumula métricas en el formato de texto de Prometheus"""
+
+    def __init__(self, prefix: str = "batch_processor_"):
+        self.prefix = prefix
+        self.lines: List[str] = []
+
+    def metric(self, kind: str, name: str, help_text: str, samples: Iterable[Tuple[Labels, float]]):
+        name = self.prefix + name
+        self.lines.append(f"# HELP {name} {help_text}")
+        self.lines.append(f"# TYPE {name} {kind}")
+        for labels, value in samples:
+            self.lines.append(f"{name}{_labels(labels)} {_number(value)}")
+
+    def gauge(self, name: str, help_text: str, value: float, labels: Labels = ()):
+        self.metric("gauge", name, help_text, [(labels, value)])
+
+    def histogram(self, name: str, help_text: str, histograms: Iterable[Tuple[Labels, LatencyHistogram]]):
+        """Histogramas en segundos a partir de LatencyHistogram (ms)"""
+        name = self.prefix + name
+        self.lines.append(f"# HELP {name} {help_text}")
+        self.lines.append(f"# TYPE {name} histogram")
+        for labels, histogram in histograms:
+            total = histogram.total
+            cumulative = histogram.cumulative_counts(HISTOGRAM_BOUNDS_MS)
+            for bound, count in zip(HISTOGRAM_BOUNDS_MS, cumulative):
+                self.lines.append(f"{name}_bucket{_labels(labels + (('le', f'{bound / 1000:g}'),))} {count}")
+            self.lines.append(f"{name}_bucket{_labels(labels + (('le', '+Inf'),))} {total}")
+            self.lines.append(f"{name}_sum{_labels(labels)} {_number(histogram.sum_ms / 1000)}")
+            self.lines.append(f"{name}_count{_labels(labels)} {total}")
+
+    def text(self) -> str:
+        return "\n".join(self.lines) + "\n"
+
+def render_metrics(processor) -> str:
+    """Estado del BatchProcessor en formato de texto de Prometheus.
+
+    Solo lee contadores que ya mantienen el procesador, los workers y sus
+    clientes (sin recorrer resultados), así que se puede consultar cada
+    pocos segundos con el procesador a plena carga.
+    """
+    out = _Exposition()
+    statistics = processor.statistics
+    workers = list(processor.workers)
+    now = time.monotonic()
+
+    out.gauge("queue_depth", "Tasks waiting in the task queue", processor.task_queue.qsize())
+    out.gauge("in_flight", "Tasks being processed by a worker",
+              sum(1 for worker in workers if worker.current_task is not None))
+    out.gauge("retrying", "Tasks waiting for a scheduled retry", processor.retry_scheduler.pending_count())
+    out.gauge("workers", "Worker threads", len(workers))
+
+    out.metric("counter", "worker_busy_seconds_total", "Time each worker spent processing tasks",
+               [((("worker", worker.worker_id),), worker.busy_time) for worker in workers])
+    out.metric("counter", "worker_idle_seconds_total", "Time each worker spent waiting for tasks",
+               [((("worker", worker.worker_id),), max(now - worker.started_monotonic - worker.busy_time, 0.0))
+                for worker in workers if worker.started_monotonic is not None])
+    out.metric("counter", "worker_tasks_total", "Task attempts processed by each worker",
+               [((("worker", worker.worker_id),), worker.tasks_processed) for worker in workers])
+
+    # Por worker: cada cliente solo lo escribe su thread
+    status_counts: Dict[int, int] = {}
+    transport_errors: Dict[str, int] = {}
+    for worker in workers:
+        for code, count in list(worker.api_client.status_counts.items()):
+            status_counts[code] = status_counts.get(code, 0) + count
+        for error, count in list(worker.api_client.transport_errors.items()):
+            transport_errors[error] = transport_errors.get(error, 0) + count
+    out.metric("counter", "http_responses_total", "HTTP responses received, by status code",
+               [((("code", code),), count) for code, count in sorted(status_counts.items())])
+    out.metric("counter", "http_transport_errors_total", "Requests that got no HTTP response, by error",
+               [((("error", error),), count) for error, count in sorted(transport_errors.items())])
+
+    out.metric("counter", "tasks_total", "Finished tasks, by final status",
+               [((("status", "completed"),), statistics.completed), ((("status", "failed"),), statistics.failed)])
+    out.metric("counter", "task_attempts_total", "Finished tasks, by number of attempts",
+               [((("attempts", attempts),), count) for attempts, count in sorted(list(statistics.attempts.items()))])
+    out.metric("counter", "retries_scheduled_total", "Retries scheduled after a failed attempt",
+               [((), processor.retry_scheduler.scheduled)])
+    out.metric("gauge", "throughput", "Finished tasks per second over a sliding window",
+               [((("window", "10s"),), statistics.throughput.rate(10)),
+                ((("window", "60s"),), statistics.throughput.rate(60))])
+
+    out.histogram("task_processing_seconds", "Time from first attempt to completion, including retry waits, by HTTP method",
+                  [((("method", method),), histogram)
+                   for method, histogram in sorted(list(statistics.latency_by_method.items()))])
+    out.histogram("task_end_to_end_seconds", "Time from task creation to completion",
+                  [((), statistics.end_to_end)])
+    if processor.tracer.enabled:
+        out.histogram("stage_duration_seconds", "Time spent in each stage of traced tasks",
+                      [((("stage", stage),), histogram) for stage, histogram in list(processor.tracer.stages.items())])
+
+    hosts = connection_pool.stats().get("hosts", {})
+    out.metric("counter", "pool_connections_opened_total", "Connections opened, by host",
+               [((("host", host),), stats["opened"]) for host, stats in hosts.items()])
+    out.metric("gauge", "pool_connections_idle", "Idle keep-alive connections, by host",
+               [((("host", host),), stats["idle"]) for host, stats in hosts.items()])
+    out.metric("gauge", "pool_maxsize", "Connection pool size, by host",
+               [((("host", host),), stats["maxsize"]) for host, stats in hosts.items()])
+    out.metric("counter", "pool_requests_total", "Requests sent through the pool, by host",
+               [((("host", host),), stats["requests"]) for host, stats in hosts.items()])
+    return out.text()
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    """GET /metrics"""
+
+    def do_GET(self):
+        if self.path.split("?", 1)[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = render_metrics(self.server.processor).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+class MetricsServer:
+    """Endpoint HTTP de métricas de un BatchProcessor (thread aparte).
+
+    Solo BatchProcessor (threads) lo expone: los procesos hijo del modo
+    multiproceso y los nodos del cluster lo tienen desactivado, y
+    ProcessPoolBatchProcessor y ClusterCoordinator no tienen workers
+    propios que medir (usar ``get_statistics``).
+    """
+
+    def __init__(self, processor, host: str = None, port: int = None):
+        self.processor = processor
+        self.host = host or config.METRICS_HOST
+        self.port = config.METRICS_PORT if port is None else port
+        self.server: ThreadingHTTPServer = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}/metrics"
+
+    def start(self):
+        self.server = ThreadingHTTPServer((self.host, self.port), _MetricsHandler)
+        self.server.daemon_threads = True
+        self.server.processor = self.processor
+        threading.Thread(target=self.server.serve_forever, name="metrics-http", daemon=True).start()
+        logger.info(f"Metrics endpoint listening on {self.url}")
+
+    def stop(self):
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
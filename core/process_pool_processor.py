@@ -0,0 +1,342 @@
+import dataclasses
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from pathlib import Path
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Set
+from models.task import Task, TaskStatus
+from core.batch_handle import BatchHandle
+from core.result_store import ResultStore, ResultRetention, ResultListener
+from core.statistics import ProcessorStatistics
+from config.settings import config
+from log_system.logger import logger
+
+# Campos que el hijo rellena y se copian a la tarea original del padre
+RESULT_FIELDS = ("status", "attempts", "started_at", "completed_at", "error_message", "response_data")
+
+def _per_process_path(path: str, tag: str) -> str:
+    """trace.json -> trace.<tag>.json (vacío si no hay ruta)"""
+    if not path:
+        return ""
+    path = Path(path)
+    return str(path.with_name(f"{path.stem}.{tag}{path.suffix}"))
+
+def apply_child_config(config_values: Dict[str, Any], tag: str):
+    """Configuración del padre para un proceso hijo o nodo local.
+
+    Lo que no puede compartirse entre procesos se ajusta: la cola es en
+    memoria (el journal sqlite y su ``recover`` son del padre), el spill y
+    el endpoint de métricas quedan desactivados y las trazas y perfiles se
+    escriben en un fichero por proceso.
+    """
+    for name, value in config_values.items():
+        setattr(config, name, value)
+    config.QUEUE_BACKEND = "memory"
+    config.RESULTS_SPILL_PATH = ""  # el spill lo hace el padre
+    config.METRICS_ENABLED = False
+    config.TRACE_EXPORT_PATH = _per_process_path(config.TRACE_EXPORT_PATH, tag)
+    config.PROFILE_OUTPUT = _per_process_path(config.PROFILE_OUTPUT, tag)
+
+def _child_main(index: int, config_values: Dict[str, Any], engine: str, concurrency: int,
+                task_queue, result_queue):
+    """Proceso hijo: ejecuta su propio procesador y devuelve resultados por lotes"""
+    apply_child_config(config_values, f"process-{index}")
+
+    # Import diferido: el hijo aplica la configuración del padre antes de crear nada
+    if engine == "async":
+        from core.async_batch_processor import AsyncBatchProcessor
+        processor = AsyncBatchProcessor(max_in_flight=concurrency, retention=ResultRetention.NONE)
+    else:
+        from core.batch_processor import BatchProcessor
+        processor = BatchProcessor(num_workers=concurrency, retention=ResultRetention.NONE)
+
+    finished: "queue.Queue[Task]" = queue.Queue()
+    outstanding = threading.Semaphore(config.PROCESS_PREFETCH)
+
+    def on_result(task: Task):
+        finished.put(task)
+        outstanding.release()
+
+    processor.add_result_listener(on_result)
+    processor.start()
+    stopping = threading.Event()
+
+    def send_results():
+        """Agrupa resultados para amortizar el coste de IPC; envía estadísticas cada segundo"""
+        last_stats = 0.0
+        while not stopping.is_set() or not finished.empty():
+            batch = []
+            deadline = time.monotonic() + 0.02
+            while len(batch) < config.PROCESS_CHUNK_SIZE:
+                try:
+                    batch.append(finished.get(timeout=max(deadline - time.monotonic(), 0)))
+                except queue.Empty:
+                    break
+            if batch:
+                result_queue.put(("results", index, batch))
+            if time.monotonic() - last_stats >= 1:
+                result_queue.put(("stats", index, _runtime_stats(processor)))
+                last_stats = time.monotonic()
+
+    sender = threading.Thread(target=send_results, name="process-results", daemon=True)
+    sender.start()
+
+    try:
+        while True:
+            chunk = task_queue.get()
+            if chunk is None:
+                break
+            # El padre sabe qué tareas tiene cada hijo por si éste muere
+            result_queue.put(("taken", index, [task.task_id for task in chunk]))
+            # Prefetch acotado: el resto de tareas queda para otros procesos
+            for _ in chunk:
+                outstanding.acquire()
+            processor.add_batch(chunk)
+    finally:
+        processor.stop()
+        stopping.set()
+        sender.join(timeout=10)
+        result_queue.put(("stopped", index, _runtime_stats(processor)))
+
+def _runtime_stats(processor) -> Dict[str, Any]:
+    """Estado de la ejecución de un hijo (lo que el padre no puede deducir de los resultados)"""
+    stats = processor.get_statistics()
+    return {key: stats[key] for key in ("queue_size", "in_flight", "retrying", "connections")
+            if key in stats}
+
+class ProcessPoolBatchProcessor:
+    """Reparte el trabajo entre varios procesos para escalar con los núcleos.
+
+    Cada proceso hijo ejecuta su propio BatchProcessor (``engine="threads"``)
+    o AsyncBatchProcessor (``engine="async"``), así que el decodificado JSON,
+    la serialización de transacciones y el formateo de logs dejan de competir
+    por un único GIL. Las tareas viajan por una cola IPC compartida en
+    bloques de ``PROCESS_CHUNK_SIZE`` (cada hijo toma trabajo según tiene
+    hueco) y los resultados vuelven agrupados; el padre mantiene los
+    handles, la retención y las estadísticas agregadas. La API es la de
+    BatchProcessor.
+    """
+
+    def __init__(self, num_processes: int = None, engine: str = None, concurrency: int = None,
+                 retention: ResultRetention = None, keep_last: int = None,
+                 spill_path: str = None, on_result: Optional[ResultListener] = None):
+        self.num_processes = num_processes or config.NUM_PROCESSES or os.cpu_count() or 1
+        self.engine = engine or config.PROCESS_ENGINE
+        if self.engine not in ("threads", "async"):
+            raise ValueError(f"Unsupported process engine: {self.engine}")
+        self.concurrency = concurrency or (
+            config.NUM_WORKERS if self.engine == "threads" else config.MAX_IN_FLIGHT
+        )
+        self.result_store = ResultStore(
+            retention=retention or config.RESULTS_RETENTION,
+            keep_last=config.RESULTS_KEEP_LAST if keep_last is None else keep_last,
+            spill_path=spill_path or config.RESULTS_SPILL_PATH or None
+        )
+        if on_result is not None:
+            self.result_store.add_listener(on_result)
+        self.statistics = ProcessorStatistics()
+        self.handles: Dict[str, BatchHandle] = {}
+        self.submitted: Dict[str, Task] = {}  # tareas en vuelo: task_id -> tarea original
+        self.owners: Dict[str, int] = {}  # task_id -> hijo que la tomó de la cola
+        self.lock = threading.Lock()
+        self.process_stats: Dict[int, Dict[str, Any]] = {}
+        self.processes: List[multiprocessing.Process] = []
+        self.is_running = False
+
+    def start(self):
+        """Lanza los procesos hijos"""
+        if self.is_running:
+            logger.warning("Process pool batch processor already running")
+            return
+
+        logger.info(f"Starting process pool with {self.num_processes} processes "
+                    f"({self.engine}, concurrency {self.concurrency} each)")
+
+        # spawn: los hijos no heredan threads ni locks del padre
+        context = multiprocessing.get_context("spawn")
+        self.task_queue = context.Queue(maxsize=self.num_processes * 4)
+        self.result_queue = context.Queue()
+        config_values = dataclasses.asdict(config)
+
+        for index in range(self.num_processes):
+            process = context.Process(
+                target=_child_main,
+                args=(index, config_values, self.engine, self.concurrency,
+                      self.task_queue, self.result_queue),
+                name=f"batch-processor-{index}",
+                daemon=True
+            )
+            process.start()
+            self.processes.append(process)
+
+        self.running_processes = self.num_processes
+        self.is_running = True
+
+        self.result_collector = threading.Thread(target=self._collect_results, daemon=True)
+        self.result_collector.start()
+
+    def stop(self):
+        """Detiene los procesos hijos y espera a sus últimos resultados"""
+        if not self.is_running:
+            logger.warning("Process pool batch processor is not running")
+            return
+
+        logger.info("Stopping process pool batch processor")
+
+        for _ in self.processes:
+            self.task_queue.put(None)
+        for process in self.processes:
+            process.join(timeout=30)
+            if process.is_alive():
+                process.terminate()
+
+        self.result_collector.join(timeout=10)
+        # Lo que ningún hijo llegó a terminar (o quedó en la cola) falla: sus handles terminan
+        with self.lock:
+            unfinished = list(self.submitted)
+        self._fail(unfinished, "Processor stopped before the task finished")
+        self.processes = []
+        self.is_running = False
+        self.result_store.close()
+        logger.flush()
+        logger.info("Process pool batch processor stopped")
+
+    def add_task(self, task: Task):
+        """Añade una tarea"""
+        self.add_batch([task])
+
+    def add_batch(self, tasks: List[Task]):
+        """Reparte un batch entre los procesos en bloques de PROCESS_CHUNK_SIZE"""
+        if not self.is_running:
+            raise RuntimeError("Batch processor is not running")
+
+        with self.lock:
+            for task in tasks:
+                self.submitted[task.task_id] = task
+
+        chunk_size = config.PROCESS_CHUNK_SIZE
+        for start in range(0, len(tasks), chunk_size):
+            self.task_queue.put(tasks[start:start + chunk_size])
+
+        logger.info(f"Added batch of {len(tasks)} tasks")
+
+    def submit_batch(self, tasks: List[Task]) -> BatchHandle:
+        """Añade un batch y devuelve un handle para seguir su finalización"""
+        handle = BatchHandle(tasks)
+
+        with self.lock:
+            for task in handle.tasks:
+                self.handles[task.task_id] = handle
+                if task.batch_id is None:
+                    task.batch_id = handle.batch_id
+
+        self.add_batch(handle.tasks)
+        return handle
+
+    def process_batch_sync(self, tasks: List[Task], timeout: float = None) -> List[Task]:
+        """Procesa un batch de manera síncrona (espera a que termine)"""
+        if not self.is_running:
+            self.start()
+
+        return self.submit_batch(tasks).results(timeout)
+
+    def _collect_results(self):
+        """Thread que recibe resultados y estadísticas de los hijos"""
+        finished: Set[int] = set()  # hijos que enviaron "stopped" o murieron
+        while self.running_processes:
+            try:
+                kind, index, payload = self.result_queue.get(timeout=1)
+            except queue.Empty:
+                self._reap_dead_processes(finished)
+                if not any(process.is_alive() for process in self.processes):
+                    break
+                continue
+
+            if kind == "results":
+                for result in payload:
+                    self._record(result)
+            elif kind == "taken":
+                with self.lock:
+                    for task_id in payload:
+                        if task_id in self.submitted:
+                            self.owners[task_id] = index
+            elif kind == "stats":
+                self.process_stats[index] = payload
+            elif kind == "stopped":
+                self.process_stats[index] = payload
+                finished.add(index)
+                self.running_processes -= 1
+
+    def _reap_dead_processes(self, finished: Set[int]):
+        """Falla las tareas de los hijos que terminaron sin enviar "stopped" (OOM, señal...)"""
+        for index, process in enumerate(self.processes):
+            if index in finished or process.is_alive():
+                continue
+            finished.add(index)
+            self.running_processes -= 1
+            with self.lock:
+                lost = [task_id for task_id, owner in self.owners.items() if owner == index]
+            logger.error(f"Process {index} exited with code {process.exitcode}; "
+                         f"failing its {len(lost)} unfinished tasks")
+            self._fail(lost, f"Process {index} exited with code {process.exitcode}")
+
+    def _record(self, result: Task):
+        """Copia el resultado a la tarea original y la notifica"""
+        with self.lock:
+            task = self.submitted.pop(result.task_id, result)
+            handle = self.handles.pop(result.task_id, None)
+            self.owners.pop(result.task_id, None)
+
+        for name in RESULT_FIELDS:
+            setattr(task, name, getattr(result, name))
+
+        self._finish(task, handle)
+
+    def _fail(self, task_ids: List[str], error: str):
+        """Marca como fallidas las tareas que no van a recibir resultado"""
+        now = datetime.now()
+        for task_id in task_ids:
+            with self.lock:
+                task = self.submitted.pop(task_id, None)
+                handle = self.handles.pop(task_id, None)
+                self.owners.pop(task_id, None)
+            if task is None:
+                continue
+            task.status = TaskStatus.FAILED
+            task.completed_at = now
+            task.error_message = error
+            self._finish(task, handle)
+
+    def _finish(self, task: Task, handle: Optional[BatchHandle]):
+        self.statistics.record_result(task)
+        self.result_store.add(task)
+        if handle is not None:
+            handle._task_done(task)
+
+    def add_result_listener(self, listener: ResultListener):
+        """Registra un callback que recibe cada tarea terminada"""
+        self.result_store.add_listener(listener)
+
+    def remove_result_listener(self, listener: ResultListener):
+        """Elimina un callback registrado con add_result_listener"""
+        self.result_store.remove_listener(listener)
+
+    def get_results(self) -> List[Task]:
+        """Obtiene los resultados retenidos en memoria"""
+        return self.result_store.snapshot()
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Estadísticas agregadas de todos los procesos"""
+        stats = self.statistics.snapshot()
+        processes = dict(self.process_stats)
+        stats.update({
+            "queue_size": sum(p.get("queue_size", 0) for p in processes.values()),
+            "in_flight": sum(p.get("in_flight", 0) for p in processes.values()),
+            "retrying": sum(p.get("retrying", 0) for p in processes.values()),
+            "pending": len(self.submitted),
+            "processes": {str(index): p for index, p in sorted(processes.items())}
+        })
+        return stats
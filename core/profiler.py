@@ -0,0 +1,73 @@
+import sys
+import threading
+from collections import Counter
+from pathlib import Path
+from typing import Callable, Iterable, List, Optional, Set, Tuple
+
+class SamplingProfiler(threading.Thread):
+    """Profiler por muestreo de los threads del procesador.
+
+    Cada ``interval`` segundos toma la pila de los threads vigilados con
+    ``sys._current_frames()`` y cuenta cuántas veces aparece cada una; los
+    threads muestreados no ejecutan nada extra. ``export`` escribe las pilas
+    en formato "collapsed" (flamegraph.pl, speedscope). ``on_sample`` es un
+    gancho opcional que recibe cada muestra ``(ident del thread, pila)``.
+    """
+
+    def __init__(self, interval: float = 0.005, threads: Optional[Iterable[threading.Thread]] = None,
+                 on_sample: Optional[Callable[[int, Tuple[str, ...]], None]] = None):
+        super().__init__(name="sampling-profiler")
+        self.interval = interval
+        self.thread_ids: Optional[Set[int]] = None
+        if threads is not None:
+            self.watch(threads)
+        self.on_sample = on_sample
+        self.samples: Counter = Counter()
+        self.total_samples = 0
+        self._stopped = threading.Event()
+        self.daemon = True
+
+    def watch(self, threads: Iterable[threading.Thread]):
+        """Limita el muestreo a estos threads (por defecto, todos menos el propio)"""
+        self.thread_ids = {thread.ident for thread in threads if thread.ident is not None}
+
+    def stop(self, timeout: float = 5):
+        """Detiene el muestreo"""
+        self._stopped.set()
+        if self.is_alive():
+            self.join(timeout)
+
+    def run(self):
+        own_id = threading.get_ident()
+        while not self._stopped.wait(self.interval):
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id or (self.thread_ids is not None and thread_id not in self.thread_ids):
+                    continue
+                stack = _stack(frame)
+                self.samples[stack] += 1
+                self.total_samples += 1
+                if self.on_sample is not None:
+                    self.on_sample(thread_id, stack)
+
+    def top(self, limit: int = 10) -> List[Tuple[str, float]]:
+        """Funciones donde más muestras acaban (función, % de muestras)"""
+        leaves: Counter = Counter()
+        for stack, count in list(self.samples.items()):
+            leaves[stack[-1]] += count
+        total = sum(leaves.values())
+        return [(function, count / total * 100) for function, count in leaves.most_common(limit)]
+
+    def export(self, path: str) -> int:
+        """Escribe las pilas en formato collapsed; devuelve el número de muestras"""
+        lines = [f"{';'.join(stack)} {count}\n" for stack, count in list(self.samples.items())]
+        Path(path).write_text("".join(lines))
+        return self.total_samples
+
+def _stack(frame) -> Tuple[str, ...]:
+    """Pila de la raíz a la hoja como "módulo:función" """
+    stack = []
+    while frame is not None:
+        code = frame.f_code
+        stack.append(f"{Path(code.co_filename).stem}:{code.co_name}")
+        frame = frame.f_back
+    return tuple(reversed(stack))
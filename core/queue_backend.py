@@ -0,0 +1,443 @@
+import json
+import queue
+import sqlite3
+import threading
+import time
+from collections import defaultdict, deque
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Deque, Dict, List, Optional, Set, Tuple
+from models.task import Task, TaskStatus, HTTPMethod
+from models.request_template import get_template
+from core.statistics import LatencyHistogram
+from config.settings import config
+from log_system.logger import logger
+
+class QueueBackend(queue.Queue):
+    """Cola de tareas del procesador.
+
+    Se comporta como ``queue.Queue`` (workers y scheduler de reintentos la
+    usan igual) y añade los ganchos que necesita un backend persistente:
+    ``put_many`` para encolar un batch, ``update_status`` para registrar
+    transiciones de estado, ``ack`` para el estado final y ``recover`` para
+    reentregar lo que quedó pendiente tras una caída. En memoria todos son
+    no-ops.
+    """
+
+    def put_many(self, tasks: List[Task]):
+        """Encola varias tareas"""
+        for task in tasks:
+            self.put(task)
+
+    def update_status(self, task: Task):
+        """Registra el estado actual de una tarea"""
+
+    def ack(self, task: Task):
+        """Registra el estado final de una tarea terminada"""
+
+    def recover(self) -> int:
+        """Reentrega las tareas no terminadas de una ejecución anterior"""
+        return 0
+
+    def queue_delay_stats(self) -> Dict[str, Dict[str, float]]:
+        """Tiempo de espera en cola por clase de prioridad (ms)"""
+        return {}
+
+    def close(self):
+        """Libera los recursos del backend"""
+
+class MemoryQueueBackend(QueueBackend):
+    """Cola en memoria (comportamiento clásico: se pierde al reiniciar)"""
+
+def flow_key(task: Task) -> str:
+    """Flujo al que pertenece una tarea para el reparto justo: tenant, batch o default"""
+    return task.tenant or task.batch_id or "default"
+
+class _DeficitRoundRobin:
+    """Colas por flujo de una clase de prioridad, servidas con deficit round robin.
+
+    Cada vez que le toca el turno, un flujo suma su peso (``quantum``) al
+    déficit y sirve una tarea por unidad acumulada; así un batch enorme no
+    acapara la cola y los flujos con más peso reciben más turnos.
+    """
+
+    def __init__(self):
+        self.flows: Dict[str, Deque[Tuple[float, Task]]] = {}
+        self.active: Deque[str] = deque()
+        self.deficit: Dict[str, float] = {}
+        self.size = 0
+        self._charged = False  # el flujo en cabeza ya recibió su quantum en esta ronda
+
+    def push(self, key: str, item: Tuple[float, Task]):
+        flow = self.flows.get(key)
+        if flow is None:
+            flow = self.flows[key] = deque()
+            self.deficit[key] = 0.0
+            self.active.append(key)
+        flow.append(item)
+        self.size += 1
+
+    def pop(self, quantum: Callable[[str], float]) -> Tuple[float, Task]:
+        while True:
+            key = self.active[0]
+            if not self._charged:
+                self.deficit[key] += quantum(key)
+                self._charged = True
+
+            if self.deficit[key] < 1:
+                self.active.rotate(-1)
+                self._charged = False
+                continue
+
+            flow = self.flows[key]
+            item = flow.popleft()
+            self.deficit[key] -= 1
+            self.size -= 1
+            if not flow:
+                # Un flujo vacío sale de la ronda y pierde el déficit acumulado
+                del self.flows[key], self.deficit[key]
+                self.active.popleft()
+                self._charged = False
+            return item
+
+class FairSchedulingMixin:
+    """Planificación por prioridad y reparto justo para un ``QueueBackend``.
+
+    Sustituye el almacenamiento FIFO de ``queue.Queue`` (``_put``/``_get``)
+    conservando su bloqueo y su ``maxsize``. Siempre se sirve primero la
+    clase de prioridad más alta con tareas pendientes; dentro de cada clase,
+    los flujos (tenant o batch) se reparten con deficit round robin según
+    ``QUEUE_TENANT_WEIGHTS``. Las señales de parada (None) se entregan antes
+    que cualquier tarea. Registra cuánto espera cada tarea por prioridad.
+    """
+
+    # Quantum mínimo: con pesos cercanos a 0 un pop daría miles de vueltas con el mutex tomado
+    MIN_QUANTUM = 0.01
+
+    def _init(self, maxsize: int):
+        invalid = {tenant: weight for tenant, weight in config.QUEUE_TENANT_WEIGHTS.items() if not weight > 0}
+        if invalid:
+            raise ValueError(f"Tenant weights must be positive: {invalid}")
+        super()._init(maxsize)
+        self._sentinels: Deque[None] = deque()
+        self._classes: Dict[int, _DeficitRoundRobin] = {}
+        self._size = 0
+        self.queue_delay: Dict[int, LatencyHistogram] = defaultdict(LatencyHistogram)
+
+    def _qsize(self) -> int:
+        return self._size + len(self._sentinels)
+
+    def _put(self, task: Optional[Task]):
+        if task is None:
+            self._sentinels.append(task)
+            return
+        scheduler = self._classes.get(task.priority)
+        if scheduler is None:
+            scheduler = self._classes[task.priority] = _DeficitRoundRobin()
+        scheduler.push(flow_key(task), (time.monotonic(), task))
+        self._size += 1
+
+    def _get(self) -> Optional[Task]:
+        if self._sentinels:
+            return self._sentinels.popleft()
+
+        priority = max(self._classes)
+        scheduler = self._classes[priority]
+        enqueued_at, task = scheduler.pop(self._quantum)
+        if not scheduler.size:
+            del self._classes[priority]
+        self._size -= 1
+
+        # _get corre con el mutex de la cola: un único escritor por histograma
+        self.queue_delay[priority].record((time.monotonic() - enqueued_at) * 1000)
+        return task
+
+    @classmethod
+    def _quantum(cls, key: str) -> float:
+        # Acotado también aquí: QUEUE_TENANT_WEIGHTS puede cambiar con la cola en marcha
+        return max(config.QUEUE_TENANT_WEIGHTS.get(key, 1.0), cls.MIN_QUANTUM)
+
+    def queue_delay_stats(self) -> Dict[str, Dict[str, float]]:
+        return {str(priority): histogram.summary()
+                for priority, histogram in sorted(list(self.queue_delay.items()), reverse=True)}
+
+    def depth_by_priority(self) -> Dict[int, int]:
+        """Tareas pendientes por clase de prioridad"""
+        with self.mutex:
+            return {priority: scheduler.size for priority, scheduler in self._classes.items()}
+
+class FairMemoryQueueBackend(FairSchedulingMixin, MemoryQueueBackend):
+    """Cola en memoria con prioridades y reparto justo entre flujos"""
+
+def serialize_task(task: Task) -> str:
+    """Serializa los campos necesarios para reconstruir una tarea"""
+    return json.dumps({
+        "task_id": task.task_id,
+        "method": task.method.value,
+        "endpoint": task.endpoint,
+        "data": task.data,
+        "headers": task.headers,
+        "created_at": task.created_at.isoformat(),
+        "priority": task.priority,
+        "tenant": task.tenant,
+        "batch_id": task.batch_id,
+        "template": task.template.name if task.template else None
+    }, default=str)
+
+def deserialize_task(payload: str, attempts: int) -> Task:
+    """Reconstruye una tarea serializada con serialize_task"""
+    record = json.loads(payload)
+    return Task(
+        method=HTTPMethod(record["method"]),
+        endpoint=record["endpoint"],
+        data=record.get("data"),
+        headers=record.get("headers"),
+        task_id=record["task_id"],
+        created_at=datetime.fromisoformat(record["created_at"]),
+        attempts=attempts,
+        priority=record.get("priority", 0),
+        tenant=record.get("tenant"),
+        batch_id=record.get("batch_id"),
+        template=get_template(record.get("template"))
+    )
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    task_id TEXT UNIQUE NOT NULL,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    updated_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_tasks_status ON tasks(status);
+"""
+
+FINISHED_STATUSES = (TaskStatus.COMPLETED.value, TaskStatus.FAILED.value)
+
+class SQLiteQueueBackend(QueueBackend):
+    """Cola con journal en SQLite (WAL) que sobrevive a reinicios.
+
+    El despacho a los workers sigue siendo en memoria; cada tarea nueva se
+    inserta en la base de datos antes de ser visible para los workers y cada
+    transición de estado se registra después. Las escrituras las hace un
+    único thread con *group commit*: agrupa todas las operaciones pendientes
+    (hasta ``group_commit_max`` o durante ``group_commit_interval``) en una
+    transacción, así que el coste de durabilidad se reparte entre miles de
+    tareas por segundo. Entrega al-menos-una-vez: una tarea en vuelo durante
+    la caída se reentrega con ``recover``.
+    """
+
+    def __init__(self, path: str = None, maxsize: int = None,
+                 group_commit_interval: float = None, group_commit_max: int = None,
+                 synchronous: str = None):
+        super().__init__(maxsize=maxsize if maxsize is not None else config.QUEUE_MAX_SIZE)
+        self.path = path or config.QUEUE_DB_PATH
+        self.group_commit_interval = (group_commit_interval if group_commit_interval is not None
+                                      else config.QUEUE_GROUP_COMMIT_INTERVAL)
+        self.group_commit_max = group_commit_max or config.QUEUE_GROUP_COMMIT_MAX
+        self.synchronous = synchronous or config.QUEUE_DB_SYNCHRONOUS
+
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._known: Set[str] = set()
+        self._known_lock = threading.Lock()
+        self._ops: "queue.Queue[Optional[Tuple]]" = queue.Queue()
+
+        connection = self._connect()
+        connection.executescript(SCHEMA)
+        connection.close()
+
+        self._writer = threading.Thread(target=self._write_loop, name="queue-journal", daemon=True)
+        self._writer.start()
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.path, timeout=30)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute(f"PRAGMA synchronous={self.synchronous}")
+        return connection
+
+    def put(self, task: Optional[Task], block: bool = True, timeout: float = None):
+        """Encola una tarea; las nuevas esperan a estar en disco"""
+        if task is not None:
+            self._journal([task])
+        super().put(task, block, timeout)
+
+    def put_many(self, tasks: List[Task]):
+        """Encola un batch con una única escritura en disco"""
+        self._journal(tasks)
+        for task in tasks:
+            super().put(task)
+
+    def get(self, block: bool = True, timeout: float = None):
+        task = super().get(block, timeout)
+        if task is not None:
+            self._record(task, TaskStatus.PROCESSING)
+        return task
+
+    def update_status(self, task: Task):
+        self._record(task, task.status)
+
+    def ack(self, task: Task):
+        self._record(task, task.status)
+        with self._known_lock:
+            self._known.discard(task.task_id)
+
+    def recover(self) -> int:
+        """Reentrega en segundo plano las tareas que no llegaron a terminar"""
+        connection = self._connect()
+        try:
+            rows = connection.execute(
+                "SELECT payload, attempts FROM tasks WHERE status NOT IN (?, ?) ORDER BY seq",
+                FINISHED_STATUSES
+            ).fetchall()
+        finally:
+            connection.close()
+
+        tasks = [deserialize_task(payload, attempts) for payload, attempts in rows]
+        if not tasks:
+            return 0
+
+        with self._known_lock:
+            self._known.update(task.task_id for task in tasks)
+
+        logger.info(f"Recovering {len(tasks)} unfinished tasks from {self.path}")
+
+        def feed():
+            for task in tasks:
+                self._record(task, TaskStatus.PENDING)
+                super(SQLiteQueueBackend, self).put(task)
+
+        threading.Thread(target=feed, name="queue-recovery", daemon=True).start()
+        return len(tasks)
+
+    def count_by_status(self) -> dict:
+        """Número de tareas registradas por estado"""
+        self.flush()
+        connection = self._connect()
+        try:
+            return dict(connection.execute("SELECT status, COUNT(*) FROM tasks GROUP BY status"))
+        finally:
+            connection.close()
+
+    def purge_finished(self) -> int:
+        """Borra del journal las tareas terminadas"""
+        done = threading.Event()
+        result = []
+        self._ops.put(("purge", result, done))
+        done.wait()
+        return result[0]
+
+    def flush(self):
+        """Espera a que todas las operaciones encoladas estén en disco"""
+        done = threading.Event()
+        self._ops.put(("flush", done))
+        done.wait()
+
+    def close(self):
+        if self._writer.is_alive():
+            self._ops.put(None)
+            self._writer.join(timeout=10)
+
+    def _journal(self, tasks: List[Task]):
+        """Inserta tareas nuevas y espera al commit; las conocidas solo cambian de estado"""
+        new_tasks = []
+        with self._known_lock:
+            for task in tasks:
+                if task.task_id in self._known:
+                    self._ops.put(("status", task.task_id, TaskStatus.PENDING.value, task.attempts))
+                else:
+                    self._known.add(task.task_id)
+                    new_tasks.append(task)
+
+        if new_tasks:
+            done = threading.Event()
+            self._ops.put(("insert", new_tasks, done))
+            done.wait()
+
+    def _record(self, task: Task, status: TaskStatus):
+        """Encola (sin esperar) el registro de una transición de estado"""
+        self._ops.put(("status", task.task_id, status.value, task.attempts))
+
+    def _write_loop(self):
+        """Thread escritor: agrupa operaciones en transacciones (group commit)"""
+        connection = self._connect()
+        try:
+            while True:
+                op = self._ops.get()
+                if op is None:
+                    return
+
+                batch = [op]
+                while len(batch) < self.group_commit_max:
+                    try:
+                        op = self._ops.get(timeout=self.group_commit_interval)
+                    except queue.Empty:
+                        break
+                    if op is None:
+                        self._ops.put(None)
+                        break
+                    batch.append(op)
+
+                self._apply(connection, batch)
+        finally:
+            connection.close()
+
+    def _apply(self, connection: sqlite3.Connection, batch: List[Tuple]):
+        """Aplica un grupo de operaciones en una única transacción"""
+        now = datetime.now().isoformat()
+        waiters = []
+
+        try:
+            with connection:
+                for op in batch:
+                    kind = op[0]
+                    if kind == "insert":
+                        connection.executemany(
+                            "INSERT INTO tasks (task_id, payload, status, attempts, updated_at) "
+                            "VALUES (?, ?, ?, ?, ?) "
+                            "ON CONFLICT(task_id) DO UPDATE SET status = excluded.status, "
+                            "updated_at = excluded.updated_at",
+                            [(task.task_id, serialize_task(task), TaskStatus.PENDING.value,
+                              task.attempts, now) for task in op[1]]
+                        )
+                        waiters.append(op[2])
+                    elif kind == "status":
+                        _, task_id, status, attempts = op
+                        connection.execute(
+                            "UPDATE tasks SET status = ?, attempts = ?, updated_at = ? WHERE task_id = ?",
+                            (status, attempts, now, task_id)
+                        )
+                    elif kind == "purge":
+                        cursor = connection.execute(
+                            "DELETE FROM tasks WHERE status IN (?, ?)", FINISHED_STATUSES
+                        )
+                        op[1].append(cursor.rowcount)
+                        waiters.append(op[2])
+                    elif kind == "flush":
+                        waiters.append(op[1])
+        except sqlite3.Error as e:
+            logger.error(f"Queue journal write failed: {str(e)}", exc_info=True)
+        finally:
+            for waiter in waiters:
+                waiter.set()
+
+class FairSQLiteQueueBackend(FairSchedulingMixin, SQLiteQueueBackend):
+    """Cola persistente en SQLite con prioridades y reparto justo entre flujos"""
+
+def create_queue_backend(backend=None, scheduling: str = None) -> QueueBackend:
+    """Crea el backend indicado (instancia, "memory" o "sqlite") con planificación "fifo" o "fair" """
+    if isinstance(backend, QueueBackend):
+        return backend
+
+    name = backend or config.QUEUE_BACKEND
+    scheduling = scheduling or config.QUEUE_SCHEDULING
+    if scheduling not in ("fifo", "fair"):
+        raise ValueError(f"Unsupported queue scheduling: {scheduling}")
+    fair = scheduling == "fair"
+
+    if name == "memory":
+        backend_class = FairMemoryQueueBackend if fair else MemoryQueueBackend
+        return backend_class(maxsize=config.QUEUE_MAX_SIZE)
+    if name == "sqlite":
+        return FairSQLiteQueueBackend() if fair else SQLiteQueueBackend()
+    raise ValueError(f"Unsupported queue backend: {name}")
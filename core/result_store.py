@@ -0,0 +1,95 @@
+import json
+import threading
+from collections import deque
+from enum import Enum
+from typing import Callable, Iterable, List, Optional
+from models.task import Task, TaskStatus
+from log_system.logger import logger
+
+class ResultRetention(Enum):
+    ALL = "all"              # guarda todos los resultados (comportamiento clásico)
+    LAST_N = "last_n"        # guarda solo los últimos N
+    FAILURES = "failures"    # guarda solo las tareas fallidas
+    NONE = "none"            # no guarda nada: solo streaming/listeners/spill
+
+ResultListener = Callable[[Task], None]
+
+class ResultStore:
+    """Almacén de resultados con memoria acotada.
+
+    La política de retención decide qué tareas terminadas se guardan en
+    memoria; opcionalmente todas se vuelcan a un fichero JSON Lines
+    (``spill_path``) y se notifican a los listeners registrados.
+    """
+
+    def __init__(self, retention: ResultRetention = ResultRetention.ALL,
+                 keep_last: int = 10000, spill_path: Optional[str] = None,
+                 include_response: bool = False):
+        self.retention = ResultRetention(retention)
+        self.spill_path = spill_path
+        self.include_response = include_response
+        self.listeners: List[ResultListener] = []
+
+        if self.retention == ResultRetention.LAST_N:
+            self._results = deque(maxlen=keep_last)
+        else:
+            self._results = []
+
+        self._lock = threading.Lock()
+        self._spill_file = open(spill_path, "a") if spill_path else None
+
+    def add_listener(self, listener: ResultListener):
+        """Registra un callback que recibe cada tarea terminada"""
+        self.listeners.append(listener)
+
+    def remove_listener(self, listener: ResultListener):
+        """Elimina un callback registrado"""
+        if listener in self.listeners:
+            self.listeners.remove(listener)
+
+    def add(self, task: Task):
+        """Registra una tarea terminada según la política de retención"""
+        with self._lock:
+            if self.retention in (ResultRetention.ALL, ResultRetention.LAST_N):
+                self._results.append(task)
+            elif self.retention == ResultRetention.FAILURES and task.status == TaskStatus.FAILED:
+                self._results.append(task)
+
+            if self._spill_file is not None:
+                self._spill(task)
+
+        for listener in self.listeners:
+            try:
+                listener(task)
+            except Exception as e:
+                logger.error(f"Result listener error for task {task.task_id}: {str(e)}", exc_info=True)
+
+    def snapshot(self) -> List[Task]:
+        """Copia de los resultados retenidos en memoria"""
+        with self._lock:
+            return list(self._results)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._results)
+
+    def close(self):
+        """Cierra el fichero de volcado (si lo hay)"""
+        with self._lock:
+            if self._spill_file is not None:
+                self._spill_file.close()
+                self._spill_file = None
+
+    def _spill(self, task: Task):
+        """Vuelca una tarea al fichero JSON Lines"""
+        record = task.to_dict()
+        if self.include_response:
+            record["response_data"] = task.response_data
+        self._spill_file.write(json.dumps(record, default=str) + "\n")
+
+def read_spilled_results(path: str) -> Iterable[dict]:
+    """Lee en streaming los resultados volcados a disco"""
+    with open(path) as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
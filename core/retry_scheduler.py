@@ -0,0 +1,95 @@
+import heapq
+import itertools
+import random
+import threading
+import time
+from datetime import datetime
+from typing import List, Tuple
+from models.task import Task, TaskStatus
+from core.queue_backend import QueueBackend
+from core.tracing import mark
+from config.settings import config
+
+def compute_backoff(attempt: int) -> float:
+    """Backoff exponencial con jitter completo para el intento dado (1, 2, ...)"""
+    ceiling = min(config.RETRY_MAX_DELAY, config.RETRY_DELAY * (2 ** (attempt - 1)))
+    return random.uniform(0, ceiling)
+
+class RetryScheduler(threading.Thread):
+    """Cola de retardo que devuelve las tareas a ``task_queue`` cuando vencen.
+
+    Los workers no duermen entre reintentos: entregan la tarea fallida al
+    scheduler y siguen con trabajo nuevo mientras ésta espera su turno.
+    """
+
+    def __init__(self, task_queue: QueueBackend, stop_event: threading.Event):
+        super().__init__()
+        self.task_queue = task_queue
+        self.stop_event = stop_event
+        self._heap: List[Tuple[float, int, Task]] = []
+        self._counter = itertools.count()
+        self._condition = threading.Condition()
+        self.scheduled = 0  # reintentos programados desde el arranque
+        self.daemon = True
+
+    def schedule(self, task: Task, delay: float = None, min_delay: float = None) -> float:
+        """Programa el reintento de una tarea; devuelve el retardo aplicado.
+
+        ``min_delay`` es el mínimo pedido por el servidor (Retry-After).
+        """
+        if delay is None:
+            delay = compute_backoff(task.attempts)
+        if min_delay is not None:
+            delay = max(delay, min_delay)
+
+        task.status = TaskStatus.RETRYING
+        self.task_queue.update_status(task)
+        due_time = time.monotonic() + delay
+
+        with self._condition:
+            heapq.heappush(self._heap, (due_time, next(self._counter), task))
+            self.scheduled += 1
+            self._condition.notify()
+
+        return delay
+
+    def pending_count(self) -> int:
+        """Número de tareas esperando su reintento"""
+        with self._condition:
+            return len(self._heap)
+
+    def stop(self):
+        """Despierta al scheduler para que compruebe stop_event"""
+        with self._condition:
+            self._condition.notify()
+
+    def cancel_pending(self) -> List[Task]:
+        """Vacía la cola de retardo al parar: sus tareas terminan como FAILED"""
+        with self._condition:
+            pending = [task for _, _, task in sorted(self._heap)]
+            self._heap.clear()
+
+        now = datetime.now()
+        for task in pending:
+            task.status = TaskStatus.FAILED
+            task.completed_at = now
+            task.error_message = f"Processor stopped before retrying: {task.error_message}"
+        return pending
+
+    def run(self):
+        """Reencola las tareas cuyo instante de reintento ha llegado"""
+        while not self.stop_event.is_set():
+            with self._condition:
+                if not self._heap:
+                    self._condition.wait(timeout=1)
+                    continue
+
+                wait_time = self._heap[0][0] - time.monotonic()
+                if wait_time > 0:
+                    self._condition.wait(timeout=min(wait_time, 1))
+                    continue
+
+                _, _, task = heapq.heappop(self._heap)
+
+            mark(task, "enqueued")
+            self.task_queue.put(task)
@@ -0,0 +1,248 @@
+import math
+import re
+import time
+from collections import defaultdict
+from typing import Any, Dict, List
+from models.task import Task, TaskStatus
+
+# Segmentos de ruta que se agrupan como identificadores en los patrones
+_ID_SEGMENT = re.compile(
+    r"^(\d+|[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12})$"
+)
+
+# Patrones de endpoint con histograma propio; el resto se acumula en "other"
+MAX_ENDPOINT_PATTERNS = 200
+OTHER_ENDPOINTS = "other"
+
+def endpoint_pattern(endpoint: str) -> str:
+    """Normaliza un endpoint a su patrón: /users/42 -> /users/{id}"""
+    path = endpoint.split("?", 1)[0]
+    return "/".join(
+        "{id}" if _ID_SEGMENT.match(segment) else segment
+        for segment in path.split("/")
+    )
+
+class LatencyHistogram:
+    """Histograma de latencias con buckets geométricos fijos.
+
+    Cada bucket cubre un ~10% más que el anterior entre 0.1 ms y ~2 min, así
+    que registrar es O(1) y los percentiles se calculan recorriendo un número
+    fijo de buckets, sin guardar las muestras. Pensado para un único thread
+    escritor; los lectores trabajan sobre una copia de los contadores.
+    """
+
+    MIN_MS = 0.1
+    GROWTH = 1.1
+    NUM_BUCKETS = 150
+
+    _LOG_GROWTH = math.log(GROWTH)
+
+    def __init__(self):
+        self.counts = [0] * self.NUM_BUCKETS
+        self.total = 0
+        self.sum_ms = 0.0
+        self.max_ms = 0.0
+
+    def record(self, value_ms: float):
+        """Registra una muestra en milisegundos"""
+        if value_ms <= self.MIN_MS:
+            index = 0
+        else:
+            index = min(int(math.log(value_ms / self.MIN_MS) / self._LOG_GROWTH) + 1,
+                        self.NUM_BUCKETS - 1)
+        self.counts[index] += 1
+        self.total += 1
+        self.sum_ms += value_ms
+        if value_ms > self.max_ms:
+            self.max_ms = value_ms
+
+    def bucket_upper_bound(self, index: int) -> float:
+        """Límite superior (ms) del bucket indicado"""
+        return self.MIN_MS * self.GROWTH ** index
+
+    def cumulative_counts(self, bounds_ms: List[float]) -> List[int]:
+        """Muestras <= cada límite (ms), para buckets de Prometheus.
+
+        Un bucket interno cuenta para un límite si su límite superior no lo
+        supera, así que el resultado se desvía como mucho un bucket (~10%).
+        """
+        counts = list(self.counts)
+        results = []
+        cumulative = 0
+        index = 0
+        for bound in bounds_ms:
+            while index < len(counts) and self.bucket_upper_bound(index) <= bound * 1.000001:
+                cumulative += counts[index]
+                index += 1
+            results.append(cumulative)
+        return results
+
+    def percentiles(self, quantiles=(0.5, 0.9, 0.99)) -> List[float]:
+        """Estima los percentiles pedidos (límite superior del bucket)"""
+        counts = list(self.counts)
+        total = sum(counts)
+        if not total:
+            return [0.0 for _ in quantiles]
+
+        results = []
+        for quantile in quantiles:
+            target = quantile * total
+            cumulative = 0
+            for index, count in enumerate(counts):
+                cumulative += count
+                if cumulative >= target:
+                    results.append(min(self.bucket_upper_bound(index), self.max_ms))
+                    break
+        return results
+
+    def summary(self) -> Dict[str, float]:
+        """Resumen: número de muestras, media, p50/p90/p99 y máximo"""
+        p50, p90, p99 = self.percentiles()
+        total = self.total
+        return {
+            "count": total,
+            "mean": round(self.sum_ms / total, 3) if total else 0.0,
+            "p50": round(p50, 3),
+            "p90": round(p90, 3),
+            "p99": round(p99, 3),
+            "max": round(self.max_ms, 3)
+        }
+
+class ThroughputWindow:
+    """Contador por segundo en un anillo, para tasas en ventanas deslizantes"""
+
+    def __init__(self, horizon: int = 61):
+        self.horizon = horizon
+        self.seconds = [-1] * horizon
+        self.counts = [0] * horizon
+
+    def record(self, now: float = None):
+        second = int(now if now is not None else time.monotonic())
+        slot = second % self.horizon
+        if self.seconds[slot] != second:
+            self.seconds[slot] = second
+            self.counts[slot] = 0
+        self.counts[slot] += 1
+
+    def rate(self, window: int, now: float = None) -> float:
+        """Eventos por segundo en los últimos ``window`` segundos completos"""
+        current = int(now if now is not None else time.monotonic())
+        window = min(window, self.horizon - 1)
+        oldest = current - window
+        total = sum(
+            count for second, count in zip(list(self.seconds), list(self.counts))
+            if oldest <= second < current
+        )
+        return total / window
+
+class ProcessorStatistics:
+    """Estadísticas incrementales del procesador.
+
+    El recolector de resultados (un único thread) llama a ``record_result``
+    por cada tarea terminada; ``snapshot`` lee los contadores sin recorrer
+    resultados ni tomar locks, así que puede consultarse cada segundo.
+
+    La latencia "processing" va del primer intento a la finalización, así
+    que incluye las esperas entre reintentos (backoff y Retry-After);
+    "end_to_end" añade además la espera en cola desde la creación. Solo se
+    guardan ``MAX_ENDPOINT_PATTERNS`` patrones de endpoint distintos: los
+    siguientes se acumulan en ``OTHER_ENDPOINTS``.
+    """
+
+    def __init__(self):
+        self.total = 0
+        self.completed = 0
+        self.failed = 0
+        self.attempts: Dict[int, int] = defaultdict(int)
+        self.latency = LatencyHistogram()
+        self.end_to_end = LatencyHistogram()
+        self.latency_by_method: Dict[str, LatencyHistogram] = defaultdict(LatencyHistogram)
+        self.latency_by_endpoint: Dict[str, LatencyHistogram] = defaultdict(LatencyHistogram)
+        self.end_to_end_by_priority: Dict[int, LatencyHistogram] = defaultdict(LatencyHistogram)
+        self.latency_by_template: Dict[str, LatencyHistogram] = defaultdict(LatencyHistogram)
+        self.outcomes_by_template: Dict[str, Dict[str, int]] = defaultdict(lambda: {"completed": 0, "failed": 0})
+        self.throughput = ThroughputWindow()
+        self.started_at = time.monotonic()
+
+    def record_result(self, task: Task):
+        """Actualiza los contadores con una tarea terminada"""
+        self.total += 1
+        if task.status == TaskStatus.COMPLETED:
+            self.completed += 1
+        elif task.status == TaskStatus.FAILED:
+            self.failed += 1
+
+        self.attempts[task.attempts] += 1
+        self.throughput.record()
+
+        template = task.template.name if task.template is not None else None
+        if template is not None and task.status in (TaskStatus.COMPLETED, TaskStatus.FAILED):
+            self.outcomes_by_template[template][task.status.value] += 1
+
+        if task.completed_at is None:
+            return
+
+        end_to_end_ms = (task.completed_at - task.created_at).total_seconds() * 1000
+        self.end_to_end.record(end_to_end_ms)
+        self.end_to_end_by_priority[task.priority].record(end_to_end_ms)
+
+        if task.started_at is not None:
+            latency_ms = (task.completed_at - task.started_at).total_seconds() * 1000
+            self.latency.record(latency_ms)
+            self.latency_by_method[task.method.value].record(latency_ms)
+            self._endpoint_histogram(task.endpoint).record(latency_ms)
+            if template is not None:
+                self.latency_by_template[template].record(latency_ms)
+
+    def _endpoint_histogram(self, endpoint: str) -> LatencyHistogram:
+        """Histograma del patrón del endpoint (o el de "other" si ya hay demasiados)"""
+        pattern = endpoint_pattern(endpoint)
+        histogram = self.latency_by_endpoint.get(pattern)
+        if histogram is None:
+            if len(self.latency_by_endpoint) >= MAX_ENDPOINT_PATTERNS:
+                pattern = OTHER_ENDPOINTS
+            histogram = self.latency_by_endpoint[pattern]
+        return histogram
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Estado actual de las estadísticas"""
+        total = self.total
+        completed = self.completed
+        elapsed = time.monotonic() - self.started_at
+
+        return {
+            "total_processed": total,
+            "completed": completed,
+            "failed": self.failed,
+            "success_rate": (completed / total * 100) if total else 0,
+            "attempts": dict(sorted(list(self.attempts.items()))),
+            "templates": {
+                template: dict(outcomes)
+                for template, outcomes in list(self.outcomes_by_template.items())
+            },
+            "throughput": {
+                "10s": round(self.throughput.rate(10), 2),
+                "60s": round(self.throughput.rate(60), 2),
+                "overall": round(total / elapsed, 2) if elapsed > 0 else 0.0
+            },
+            "latency_ms": {
+                "processing": self.latency.summary(),
+                "end_to_end": self.end_to_end.summary(),
+                "by_method": {
+                    method: histogram.summary()
+                    for method, histogram in list(self.latency_by_method.items())
+                },
+                "by_endpoint": {
+                    pattern: histogram.summary()
+                    for pattern, histogram in list(self.latency_by_endpoint.items())
+                },
+                "by_template": {
+                    template: histogram.summary()
+                    for template, histogram in list(self.latency_by_template.items())
+                },
+                "end_to_end_by_priority": {
+                    str(priority): histogram.summary()
+                    for priority, histogram in sorted(list(self.end_to_end_by_priority.items()), reverse=True)
+                }
+            }
+        }
@@ -0,0 +1,160 @@
+import os
+import threading
+import time
+from collections import defaultdict, deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+from models.task import Task
+from core.statistics import LatencyHistogram, endpoint_pattern
+from services.serializer import serializer
+from log_system.logger import sampled
+
+# Marcas que se registran en cada tarea trazada, en el orden habitual
+STAGES = ("enqueued", "dequeued", "request_sent", "response_received", "decoded", "logged", "collected")
+
+# Nombre del tramo que termina en cada marca (el que empieza en la marca anterior)
+SPAN_NAMES = {
+    "enqueued": "retry_wait",            # fin del intento -> vuelta a la cola
+    "dequeued": "queue_wait",            # en cola
+    "request_sent": "dispatch",          # límites de tasa, codificación y caché
+    "response_received": "request",      # petición HTTP
+    "decoded": "decode",                 # JSON de la respuesta
+    "logged": "log",                     # log de transacción
+    "collected": "collect"               # cola de resultados -> recolector
+}
+
+def mark(task: Task, stage: str):
+    """Registra ``stage`` en la tarea si está siendo trazada (no-op si no)"""
+    timings = task.timings
+    if timings is not None:
+        timings.append((stage, time.monotonic_ns(), threading.get_ident()))
+
+def spans(timings: List[Tuple[str, int, int]]) -> List[Tuple[str, int, int, int]]:
+    """Tramos (nombre, inicio_ns, fin_ns, thread) entre marcas consecutivas"""
+    return [
+        (SPAN_NAMES.get(stage, stage), start, end, thread)
+        for (_, start, _), (stage, end, thread) in zip(timings, timings[1:])
+    ]
+
+class StageTracer:
+    """Tiempos por etapa de las tareas (marcas con reloj monotónico en ns).
+
+    ``start`` decide al encolar si la tarea se traza (``sample_rate``, por
+    task_id como el muestreo de logs) y le asigna su lista de marcas; los
+    puntos del camino caliente llaman a ``mark``, que no hace nada en las
+    tareas no trazadas. El recolector de resultados (único thread escritor)
+    llama a ``record`` con cada tarea terminada: acumula un histograma por
+    tramo y guarda las últimas ``buffer_size`` tareas para exportarlas.
+    """
+
+    def __init__(self, enabled: bool = False, sample_rate: float = 1.0, buffer_size: int = 10000):
+        self.enabled = enabled
+        self.sample_rate = sample_rate
+        self.stages: Dict[str, LatencyHistogram] = defaultdict(LatencyHistogram)
+        self.total = LatencyHistogram()
+        self.traced = 0
+        self.recent: Deque[Tuple[str, str, str, int, List[Tuple[str, int, int]]]] = deque(maxlen=buffer_size)
+        # Ancla para pasar del reloj monotónico a tiempo de pared en la exportación
+        self.wall_anchor_ns = time.time_ns()
+        self.monotonic_anchor_ns = time.monotonic_ns()
+
+    def start(self, task: Task):
+        """Empieza a trazar la tarea (si toca) con su marca de encolado"""
+        if not self.enabled or self.sample_rate <= 0:
+            return
+        if task.timings is None:
+            if not sampled(task.task_id, self.sample_rate):
+                return
+            task.timings = []
+        mark(task, "enqueued")
+
+    def record(self, task: Task):
+        """Marca la tarea como recolectada y acumula sus tramos"""
+        timings = task.timings
+        if timings is None:
+            return
+        mark(task, "collected")
+        for name, start, end, _ in spans(timings):
+            self.stages[name].record((end - start) / 1e6)
+        self.total.record((timings[-1][1] - timings[0][1]) / 1e6)
+        self.traced += 1
+        self.recent.append((task.task_id, task.method.value, task.endpoint, task.attempts, timings))
+
+    def summary(self) -> Dict[str, Any]:
+        """Resumen por tramo (ms), en el orden del camino de una tarea"""
+        order = {name: index for index, name in enumerate(SPAN_NAMES.values())}
+        stages = sorted(list(self.stages.items()), key=lambda item: order.get(item[0], len(order)))
+        return {
+            "traced": self.traced,
+            "total": self.total.summary(),
+            "stages": {name: histogram.summary() for name, histogram in stages}
+        }
+
+    def _wall_us(self, monotonic_ns: int) -> float:
+        return (monotonic_ns - self.monotonic_anchor_ns + self.wall_anchor_ns) / 1000
+
+    def chrome_trace(self) -> Dict[str, Any]:
+        """Tareas recientes en formato Chrome Trace (chrome://tracing, Perfetto)"""
+        pid = os.getpid()
+        events: List[Dict[str, Any]] = []
+        for task_id, method, endpoint, attempts, timings in list(self.recent):
+            args = {"task_id": task_id, "endpoint": endpoint_pattern(endpoint), "attempts": attempts}
+            for name, start, end, thread in spans(timings):
+                events.append({
+                    "name": name,
+                    "cat": method,
+                    "ph": "X",
+                    "ts": self._wall_us(start),
+                    "dur": (end - start) / 1000,
+                    "pid": pid,
+                    "tid": thread,
+                    "args": args
+                })
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def otlp_trace(self) -> Dict[str, Any]:
+        """Tareas recientes como spans OTLP/JSON: una traza por tarea, un span hijo por tramo"""
+        otlp_spans: List[Dict[str, Any]] = []
+        for task_id, method, endpoint, attempts, timings in list(self.recent):
+            trace_id = task_id.replace("-", "").ljust(32, "0")[:32]
+            root_id = trace_id[:16]
+            otlp_spans.append({
+                "traceId": trace_id,
+                "spanId": root_id,
+                "name": f"{method} {endpoint_pattern(endpoint)}",
+                "kind": 1,
+                "startTimeUnixNano": str(timings[0][1] - self.monotonic_anchor_ns + self.wall_anchor_ns),
+                "endTimeUnixNano": str(timings[-1][1] - self.monotonic_anchor_ns + self.wall_anchor_ns),
+                "attributes": [
+                    {"key": "task.id", "value": {"stringValue": task_id}},
+                    {"key": "http.request.method", "value": {"stringValue": method}},
+                    {"key": "task.attempts", "value": {"intValue": str(attempts)}}
+                ]
+            })
+            for index, (name, start, end, thread) in enumerate(spans(timings)):
+                otlp_spans.append({
+                    "traceId": trace_id,
+                    "spanId": f"{int(root_id, 16) ^ (index + 1):016x}",
+                    "parentSpanId": root_id,
+                    "name": name,
+                    "kind": 1,
+                    "startTimeUnixNano": str(start - self.monotonic_anchor_ns + self.wall_anchor_ns),
+                    "endTimeUnixNano": str(end - self.monotonic_anchor_ns + self.wall_anchor_ns),
+                    "attributes": [{"key": "thread.id", "value": {"intValue": str(thread)}}]
+                })
+        return {"resourceSpans": [{
+            "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": "batch-processor"}}]},
+            "scopeSpans": [{"scope": {"name": "core.tracing"}, "spans": otlp_spans}]
+        }]}
+
+    def export(self, path: str, format: str = "chrome") -> int:
+        """Escribe las tareas recientes en ``path``; devuelve cuántas se exportaron"""
+        if format == "chrome":
+            payload = self.chrome_trace()
+        elif format == "otlp":
+            payload = self.otlp_trace()
+        else:
+            raise ValueError(f"Unsupported trace format: {format}")
+
+        with open(path, "wb") as f:
+            f.write(serializer.dumps(payload))
+        return len(self.recent)
@@ -1,25 +1,37 @@
 import threading
 import queue
+import time
 from typing import Optional
 from models.task import Task, TaskStatus
-from services.api_client import APIClient
+from services.api_client import APIClient, RetryableRequestError
+from core.retry_scheduler import RetryScheduler
+from core.queue_backend import QueueBackend
+from core.tracing import mark
 from log_system.logger import logger
 from datetime import datetime
 
 class Worker(threading.Thread):
-    def __init__(self, task_queue: queue.Queue, result_queue: queue.Queue,
-                 worker_id: int, stop_event: threading.Event):
+    def __init__(self, task_queue: QueueBackend, result_queue: queue.Queue,
+                 worker_id: int, stop_event: threading.Event,
+                 retry_scheduler: Optional[RetryScheduler] = None):
         super().__init__()
         self.task_queue = task_queue
         self.result_queue = result_queue
         self.worker_id = worker_id
         self.stop_event = stop_event
+        self.retry_scheduler = retry_scheduler
+        self.current_task: Optional[Task] = None
         self.api_client = APIClient()
+        # Tiempo ocupado y tareas procesadas (solo los escribe este thread)
+        self.busy_time = 0.0
+        self.tasks_processed = 0
+        self.started_monotonic: Optional[float] = None
         self.daemon = True
 
     def run(self):
         """Método principal del worker"""
         logger.info(f"Worker {self.worker_id} started")
+        self.started_monotonic = time.monotonic()
 
         while not self.stop_event.is_set():
             try:
@@ -28,9 +40,17 @@ class Worker(threading.Thread):
 
                 if task is None:  # Señal de parada
                     break
+                mark(task, "dequeued")
 
                 # Procesar tarea
-                self.process_task(task)
+                self.current_task = task
+                busy_since = time.monotonic()
+                try:
+                    self.process_task(task)
+                finally:
+                    self.current_task = None
+                    self.busy_time += time.monotonic() - busy_since
+                    self.tasks_processed += 1
 
                 # Marcar tarea como completada
                 self.task_queue.task_done()
@@ -46,7 +66,9 @@ class Worker(threading.Thread):
         """Procesa una tarea individual"""
         try:
             task.status = TaskStatus.PROCESSING
-            logger.info(f"Worker {self.worker_id} processing task {task.task_id}")
+            if task.started_at is None:
+                task.started_at = datetime.now()
+            logger.task_info(task.task_id, "Worker %s processing task %s", self.worker_id, task.task_id)
 
             # Ejecutar la petición
             result = self.api_client.execute_request(task)
@@ -59,7 +81,23 @@ class Worker(threading.Thread):
             # Añadir a cola de resultados
             self.result_queue.put(task)
 
-            logger.info(f"Worker {self.worker_id} completed task {task.task_id}")
+            logger.task_info(task.task_id, "Worker %s completed task %s", self.worker_id, task.task_id)
+
+        except RetryableRequestError as e:
+            task.error_message = str(e)
+
+            if self.retry_scheduler is None:
+                # Sin scheduler no hay reintento diferido: se da por fallida
+                task.status = TaskStatus.FAILED
+                task.completed_at = datetime.now()
+                self.result_queue.put(task)
+                logger.error(f"Worker {self.worker_id} failed task {task.task_id}: {str(e)}")
+                return
+
+            # El worker queda libre mientras la tarea espera su reintento
+            delay = self.retry_scheduler.schedule(task, min_delay=e.retry_after)
+            logger.task_info(task.task_id, "Worker %s scheduled retry of task %s in %.2fs",
+                             self.worker_id, task.task_id, delay)
 
         except Exception as e:
             task.status = TaskStatus.FAILED
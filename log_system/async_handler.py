@@ -0,0 +1,154 @@
+import logging
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+class AsyncLogDispatcher(threading.Thread):
+    """Escribe en segundo plano los registros de logging de la aplicación.
+
+    Los threads que loguean solo añaden el mensaje a un buffer (un
+    ``deque``: sin locks ni avisos por línea); este thread despierta cada
+    ``flush_interval``, crea y formatea los LogRecord y hace una única
+    escritura por handler destino y lote. ``backpressure`` funciona como en
+    TransactionWriter: con el buffer lleno ``"block"`` espera a que se
+    vacíe y ``"drop"`` descarta el registro (se cuenta en ``dropped``).
+    """
+
+    def __init__(self, buffer_size: int = 10000, flush_batch: int = 500,
+                 flush_interval: float = 0.2, backpressure: str = "block"):
+        super().__init__(name="log-dispatcher")
+        if backpressure not in ("block", "drop"):
+            raise ValueError(f"Unsupported backpressure policy: {backpressure}")
+        self.buffer: Deque[Tuple[Any, ...]] = deque()
+        self.buffer_size = buffer_size
+        self.flush_batch = flush_batch
+        self.flush_interval = flush_interval
+        self.backpressure = backpressure
+        self.written = 0
+        self.dropped = 0
+        self._wakeup = threading.Event()
+        self._drained = threading.Event()
+        self._closing = threading.Event()
+        self.daemon = True
+
+    def handler(self, target: logging.StreamHandler) -> "QueuedLogHandler":
+        """Handler que encola hacia ``target`` a través de este dispatcher"""
+        return QueuedLogHandler(self, target)
+
+    def log(self, target: logging.StreamHandler, name: str, level: int, message: str, args: tuple):
+        """Encola un mensaje sin crear el LogRecord (se crea en el thread escritor)"""
+        self._append((target, name, level, message, args, time.time()))
+
+    def enqueue(self, target: logging.StreamHandler, record: logging.LogRecord):
+        """Encola un LogRecord ya creado"""
+        self._append((target, record))
+
+    def _append(self, item: Tuple[Any, ...]):
+        if len(self.buffer) >= self.buffer_size:
+            if self.backpressure == "drop":
+                self.dropped += 1
+                return
+            while len(self.buffer) >= self.buffer_size and self.is_alive():
+                self._wakeup.set()
+                self._drained.wait(self.flush_interval)
+        self.buffer.append(item)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Espera a que todo lo encolado hasta ahora esté escrito"""
+        if not self.is_alive():
+            return True
+        done = threading.Event()
+        self.buffer.append((done,))
+        self._wakeup.set()
+        return done.wait(timeout)
+
+    def close(self, timeout: Optional[float] = 10):
+        """Vacía el buffer y detiene el thread"""
+        if not self.is_alive():
+            return
+        self._closing.set()
+        self._wakeup.set()
+        self.join(timeout)
+
+    def run(self):
+        """Bucle principal: vacía el buffer por lotes cada flush_interval"""
+        while True:
+            closing = self._closing.is_set()
+            self._drain()
+            if closing:
+                break
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+
+    def _drain(self):
+        """Escribe todo lo que hay en el buffer y despierta a quien espera"""
+        while self.buffer:
+            batch: List[Tuple[Any, ...]] = []
+            waiters: List[threading.Event] = []
+            while self.buffer and len(batch) < self.flush_batch:
+                item = self.buffer.popleft()
+                if len(item) == 1:
+                    waiters.append(item[0])
+                else:
+                    batch.append(item)
+
+            if batch:
+                self._write_batch(batch)
+            for waiter in waiters:
+                waiter.set()
+
+        # Libera a los productores bloqueados por backpressure
+        self._drained.set()
+        self._drained.clear()
+
+    def _write_batch(self, batch: List[Tuple[Any, ...]]):
+        """Formatea el lote y hace una escritura por handler destino"""
+        lines: Dict[logging.StreamHandler, List[str]] = {}
+        last_record: Dict[logging.StreamHandler, logging.LogRecord] = {}
+        for item in batch:
+            target = item[0]
+            record = item[1] if len(item) == 2 else _make_record(*item[1:])
+            try:
+                lines.setdefault(target, []).append(target.format(record) + target.terminator)
+                last_record[target] = record
+            except Exception:
+                target.handleError(record)
+
+        for target, chunk in lines.items():
+            target.acquire()
+            try:
+                if target.stream is None:
+                    target.stream = target._open()  # FileHandler con delay=True
+                target.stream.write("".join(chunk))
+                target.flush()
+            except Exception:
+                target.handleError(last_record[target])
+            finally:
+                target.release()
+        self.written += len(batch)
+
+def _make_record(name: str, level: int, message: str, args: tuple, created: float) -> logging.LogRecord:
+    """LogRecord con el instante en que se emitió el mensaje, no el de escritura"""
+    record = logging.LogRecord(name, level, "", 0, message, args or None, None)
+    record.created = created
+    record.msecs = (created - int(created)) * 1000
+    return record
+
+class QueuedLogHandler(logging.Handler):
+    """Handler que solo encola: el formateo y la escritura los hace AsyncLogDispatcher"""
+
+    def __init__(self, dispatcher: AsyncLogDispatcher, target: logging.StreamHandler):
+        super().__init__(level=target.level)
+        self.dispatcher = dispatcher
+        self.target = target
+
+    def handle(self, record: logging.LogRecord) -> bool:
+        # Sin el lock de Handler.handle: el buffer ya es thread-safe
+        if not self.filter(record):
+            return False
+        self.dispatcher.enqueue(self.target, record)
+        return True
+
+    def emit(self, record: logging.LogRecord):
+        self.dispatcher.enqueue(self.target, record)
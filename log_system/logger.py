@@ -1,13 +1,35 @@
+import atexit
+import hashlib
 import logging
-import json
+import threading
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, List
 from config.settings import config
+from log_system.async_handler import AsyncLogDispatcher
+from log_system.transaction_writer import TransactionWriter
+from log_system.transaction_store import TransactionStore
+
+def sampled(key: str, rate: float) -> bool:
+    """Si ``key`` entra en una muestra de fracción ``rate``.
+
+    Usa un hash estable (no ``hash()``, que cambia en cada proceso), así que
+    la decisión es la misma en todos los procesos y ejecuciones.
+    """
+    if rate >= 1.0:
+        return True
+    if rate <= 0:
+        return False
+    digest = hashlib.blake2b(key.encode(), digest_size=4).digest()
+    return int.from_bytes(digest, "big") < rate * 2 ** 32
 
 class TransactionLogger:
     def __init__(self):
+        self.transaction_writer: TransactionWriter = None
+        self.dispatcher: AsyncLogDispatcher = None
+        self._writer_lock = threading.Lock()
         self.setup_loggers()
+        atexit.register(self.close)
 
     def setup_loggers(self):
         # Crear directorio de logs si no existe
@@ -18,12 +40,23 @@ class TransactionLogger:
         self.app_logger = logging.getLogger("app")
         self.app_logger.setLevel(getattr(logging, config.LOG_LEVEL))
 
+        # Escritura asíncrona opcional: los handlers de archivo los usa el dispatcher
+        if config.LOG_ASYNC:
+            self.dispatcher = AsyncLogDispatcher(
+                buffer_size=config.LOG_BUFFER_SIZE,
+                flush_batch=config.LOG_FLUSH_BATCH,
+                flush_interval=config.LOG_FLUSH_INTERVAL,
+                backpressure=config.LOG_BACKPRESSURE
+            )
+            self.dispatcher.start()
+
         # Handler para archivo
         app_handler = logging.FileHandler(f"{config.LOG_DIR}/app.log")
         app_handler.setFormatter(
             logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
         )
-        self.app_logger.addHandler(app_handler)
+        self.app_logger.addHandler(self._wrap(app_handler))
+        self.app_handler = app_handler
 
         # Logger de errores
         self.error_logger = logging.getLogger("errors")
@@ -33,28 +66,101 @@ class TransactionLogger:
         error_handler.setFormatter(
             logging.Formatter('%(asctime)s - %(levelname)s - %(message)s - %(exc_info)s')
         )
-        self.error_logger.addHandler(error_handler)
+        self.error_logger.addHandler(self._wrap(error_handler))
+
+    def _wrap(self, handler: logging.Handler) -> logging.Handler:
+        """Handler a registrar: el propio o uno que encola hacia el dispatcher"""
+        return self.dispatcher.handler(handler) if self.dispatcher is not None else handler
+
+    def _get_transaction_writer(self) -> TransactionWriter:
+        """Crea el escritor de transacciones la primera vez que se usa"""
+        if self.transaction_writer is None:
+            with self._writer_lock:
+                if self.transaction_writer is None:
+                    writer = TransactionWriter(
+                        directory=f"{config.LOG_DIR}/transactions",
+                        buffer_size=config.TRANSACTION_BUFFER_SIZE,
+                        flush_interval=config.TRANSACTION_FLUSH_INTERVAL,
+                        flush_batch=config.TRANSACTION_FLUSH_BATCH,
+                        segment_max_bytes=config.TRANSACTION_SEGMENT_MAX_BYTES,
+                        segment_max_age=config.TRANSACTION_SEGMENT_MAX_AGE,
+                        compression=config.TRANSACTION_COMPRESSION,
+                        backpressure=config.TRANSACTION_BACKPRESSURE
+                    )
+                    writer.start()
+                    self.transaction_writer = writer
+        return self.transaction_writer
 
     def log_transaction(self, task_id: str, transaction_data: Dict[str, Any]):
-        """Guarda log detallado de cada transacción"""
+        """Guarda log detallado de cada transacción (escritura en segundo plano)"""
         if not config.ENABLE_TRANSACTION_LOGS:
             return
 
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"{config.LOG_DIR}/transactions/{task_id}_{timestamp}.json"
+        self._get_transaction_writer().write({
+            "timestamp": datetime.now().isoformat(),
+            "task_id": task_id,
+            **transaction_data
+        })
+
+    def flush_transactions(self, timeout: float = None) -> bool:
+        """Espera a que las transacciones pendientes estén en disco"""
+        if self.transaction_writer is None:
+            return True
+        return self.transaction_writer.flush(timeout)
+
+    def flush(self, timeout: float = None) -> bool:
+        """Espera a que los logs de aplicación y las transacciones estén en disco"""
+        logs_done = self.dispatcher.flush(timeout) if self.dispatcher is not None else True
+        return self.flush_transactions(timeout) and logs_done
+
+    def get_transactions(self, task_id: str) -> List[Dict[str, Any]]:
+        """Busca las transacciones registradas de una tarea"""
+        return self.query_transactions(task_id=task_id)
 
-        with open(filename, 'w') as f:
-            json.dump({
-                "timestamp": datetime.now().isoformat(),
-                "task_id": task_id,
-                **transaction_data
-            }, f, indent=2, default=str)
+    def query_transactions(self, **filters) -> List[Dict[str, Any]]:
+        """Consulta el índice de transacciones (ver TransactionStore.find)"""
+        self.flush_transactions()
+        store = TransactionStore(f"{config.LOG_DIR}/transactions")
+        try:
+            return store.find(**filters)
+        finally:
+            store.close()
+
+    def close(self):
+        """Vacía y cierra el escritor de transacciones y el de logs"""
+        if self.transaction_writer is not None:
+            self.transaction_writer.close()
+        if self.dispatcher is not None:
+            self.dispatcher.close()
+
+    # Los mensajes admiten argumentos estilo %: solo se formatean si se escriben
+    def _log(self, level: int, message: str, args: tuple):
+        if not self.app_logger.isEnabledFor(level):
+            return
+        if self.dispatcher is not None:
+            # Sin crear el LogRecord en este thread: lo hace el dispatcher
+            self.dispatcher.log(self.app_handler, self.app_logger.name, level, message, args)
+        else:
+            self.app_logger.log(level, message, *args)
+
+    def info(self, message: str, *args):
+        self._log(logging.INFO, message, args)
+
+    def task_info(self, task_id: str, message: str, *args):
+        """Línea INFO de una tarea concreta, sujeta a LOG_TASK_SAMPLE_RATE.
+
+        El muestreo es por task_id: de una tarea muestreada se escriben todas
+        sus líneas y del resto ninguna.
+        """
+        if not sampled(task_id, config.LOG_TASK_SAMPLE_RATE):
+            return
+        self._log(logging.INFO, message, args)
 
-    def info(self, message: str):
-        self.app_logger.info(message)
+    def warning(self, message: str, *args):
+        self._log(logging.WARNING, message, args)
 
-    def error(self, message: str, exc_info=None):
-        self.error_logger.error(message, exc_info=exc_info)
-        self.app_logger.error(message)
+    def error(self, message: str, *args, exc_info=None):
+        self.error_logger.error(message, *args, exc_info=exc_info)
+        self.app_logger.error(message, *args)
 
 logger = TransactionLogger()
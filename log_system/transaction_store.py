@@ -0,0 +1,204 @@
+#!/usr/bin/env python
+"""
+Índice SQLite de los segmentos de transacciones.
+
+Cada transacción escrita por TransactionWriter se registra en
+``<LOG_DIR>/transactions/index.db`` con su task_id, estado, método,
+endpoint y timestamp, junto al segmento y offset donde está el registro
+completo. Las consultas usan el índice y solo leen del segmento las
+líneas que coinciden.
+
+Uso desde línea de comandos:
+    python -m log_system.transaction_store get <task_id>
+    python -m log_system.transaction_store find --status failed \\
+        --since 2025-09-01T15:00 --until 2025-09-01T16:00 --endpoint '/users/*'
+"""
+
+import argparse
+import gzip
+import io
+import json
+import sqlite3
+import sys
+from collections import defaultdict
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+try:
+    import zstandard
+except ImportError:  # compresión zstd opcional
+    zstandard = None
+
+INDEX_FILENAME = "index.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS transactions (
+    id INTEGER PRIMARY KEY,
+    task_id TEXT NOT NULL,
+    status TEXT,
+    method TEXT,
+    endpoint TEXT,
+    timestamp TEXT,
+    segment TEXT NOT NULL,
+    offset INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_transactions_task_id ON transactions(task_id);
+CREATE INDEX IF NOT EXISTS idx_transactions_status_ts ON transactions(status, timestamp);
+CREATE INDEX IF NOT EXISTS idx_transactions_endpoint ON transactions(endpoint);
+CREATE INDEX IF NOT EXISTS idx_transactions_timestamp ON transactions(timestamp);
+"""
+
+# (task_id, status, method, endpoint, timestamp, segment, offset)
+IndexEntry = Tuple[str, Optional[str], Optional[str], Optional[str], Optional[str], str, int]
+
+TimeBound = Union[str, datetime, None]
+
+def open_segment(path: Path, mode: str):
+    """Abre un segmento (plano o comprimido) en modo binario"""
+    name = path.name
+    if name.endswith(".gz"):
+        return gzip.open(path, mode)
+    if name.endswith(".zst"):
+        if zstandard is None:
+            raise RuntimeError("zstd compression requires the 'zstandard' package")
+        if "r" in mode:
+            return io.BufferedReader(zstandard.open(path, mode))
+        return zstandard.open(path, mode)
+    return open(path, mode)
+
+class TransactionStore:
+    """Acceso al índice de transacciones (una conexión por thread)"""
+
+    def __init__(self, directory: str):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.connection = sqlite3.connect(str(self.directory / INDEX_FILENAME), timeout=30)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript(SCHEMA)
+
+    def add(self, entries: Iterable[IndexEntry]):
+        """Registra un lote de entradas en una sola transacción"""
+        with self.connection:
+            self.connection.executemany(
+                "INSERT INTO transactions "
+                "(task_id, status, method, endpoint, timestamp, segment, offset) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                entries
+            )
+
+    def find(self, task_id: str = None, status: str = None, endpoint: str = None,
+             since: TimeBound = None, until: TimeBound = None,
+             limit: int = None) -> List[Dict[str, Any]]:
+        """Devuelve los registros completos que cumplen los filtros.
+
+        ``endpoint`` admite comodines estilo glob (``/users/*``); ``since`` y
+        ``until`` acotan el timestamp (inclusivo / exclusivo).
+        """
+        rows = self._query("segment, offset", task_id, status, endpoint, since, until, limit)
+        return self._load(rows)
+
+    def count(self, task_id: str = None, status: str = None, endpoint: str = None,
+              since: TimeBound = None, until: TimeBound = None) -> int:
+        """Cuenta las transacciones que cumplen los filtros sin leer segmentos"""
+        return self._query("COUNT(*)", task_id, status, endpoint, since, until)[0][0]
+
+    def close(self):
+        self.connection.close()
+
+    def _query(self, columns: str, task_id, status, endpoint, since, until, limit=None):
+        """Construye y ejecuta la consulta sobre el índice"""
+        clauses = []
+        params: List[Any] = []
+
+        if task_id is not None:
+            clauses.append("task_id = ?")
+            params.append(task_id)
+        if status is not None:
+            clauses.append("status = ?")
+            params.append(status)
+        if endpoint is not None:
+            clauses.append("endpoint GLOB ?" if any(c in endpoint for c in "*?[") else "endpoint = ?")
+            params.append(endpoint)
+        if since is not None:
+            clauses.append("timestamp >= ?")
+            params.append(_as_timestamp(since))
+        if until is not None:
+            clauses.append("timestamp < ?")
+            params.append(_as_timestamp(until))
+
+        sql = f"SELECT {columns} FROM transactions"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        if columns != "COUNT(*)":
+            sql += " ORDER BY id"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+
+        return self.connection.execute(sql, params).fetchall()
+
+    def _load(self, rows: List[Tuple[str, int]]) -> List[Dict[str, Any]]:
+        """Lee los registros de los segmentos, abriendo cada segmento una vez"""
+        by_segment = defaultdict(list)
+        for position, (segment, offset) in enumerate(rows):
+            by_segment[segment].append((offset, position))
+
+        records: List[Dict[str, Any]] = [None] * len(rows)
+        for segment, offsets in by_segment.items():
+            with open_segment(self.directory / segment, "rb") as f:
+                for offset, position in sorted(offsets):
+                    f.seek(offset)
+                    records[position] = json.loads(f.readline())
+        return records
+
+def _as_timestamp(value: TimeBound) -> str:
+    """Normaliza un límite temporal al formato ISO usado en los registros"""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return datetime.fromisoformat(value).isoformat()
+
+def main(argv: List[str] = None):
+    parser = argparse.ArgumentParser(description="Consulta del log de transacciones")
+    parser.add_argument("--dir", default=None, help="Directorio de transacciones (por defecto <LOG_DIR>/transactions)")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    get_parser = subparsers.add_parser("get", help="Transacciones de una tarea")
+    get_parser.add_argument("task_id")
+
+    for name in ("find", "count"):
+        sub = subparsers.add_parser(name, help=f"{name} por filtros")
+        sub.add_argument("--status")
+        sub.add_argument("--endpoint", help="Endpoint exacto o patrón glob, p.ej. '/users/*'")
+        sub.add_argument("--since", help="Timestamp ISO inicial (inclusivo)")
+        sub.add_argument("--until", help="Timestamp ISO final (exclusivo)")
+        if name == "find":
+            sub.add_argument("--limit", type=int)
+
+    args = parser.parse_args(argv)
+
+    directory = args.dir
+    if directory is None:
+        from config.settings import config
+        directory = f"{config.LOG_DIR}/transactions"
+
+    store = TransactionStore(directory)
+    try:
+        if args.command == "get":
+            records = store.find(task_id=args.task_id)
+        elif args.command == "count":
+            print(store.count(status=args.status, endpoint=args.endpoint,
+                              since=args.since, until=args.until))
+            return
+        else:
+            records = store.find(status=args.status, endpoint=args.endpoint,
+                                 since=args.since, until=args.until, limit=args.limit)
+
+        for record in records:
+            sys.stdout.write(json.dumps(record, default=str) + "\n")
+    finally:
+        store.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+import os
+import queue
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from log_system.transaction_store import TransactionStore, open_segment, zstandard
+from services.serializer import serializer
+
+SEGMENT_SUFFIXES = {"": ".jsonl", "gzip": ".jsonl.gz", "zstd": ".jsonl.zst"}
+
+class TransactionWriter(threading.Thread):
+    """Escritor en segundo plano de logs de transacciones.
+
+    Los registros se acumulan en un buffer acotado y un thread los escribe
+    por lotes en segmentos JSON Lines de solo-append, rotados por tamaño
+    (bytes sin comprimir) o antigüedad. Cada lote se registra además en el
+    índice SQLite (ver log_system.transaction_store) en la misma pasada, para
+    localizar transacciones sin recorrer los segmentos.
+
+    ``backpressure`` decide qué pasa con el buffer lleno: ``"block"`` espera
+    a que haya hueco y ``"drop"`` descarta el registro (se cuenta en
+    ``dropped``).
+    """
+
+    def __init__(self, directory: str, buffer_size: int = 10000,
+                 flush_interval: float = 1.0, flush_batch: int = 500,
+                 segment_max_bytes: int = 64 * 1024 * 1024,
+                 segment_max_age: float = 3600, compression: str = "",
+                 backpressure: str = "block"):
+        super().__init__(name="transaction-writer")
+        if compression not in SEGMENT_SUFFIXES:
+            raise ValueError(f"Unsupported transaction log compression: {compression}")
+        if compression == "zstd" and zstandard is None:
+            raise RuntimeError("zstd compression requires the 'zstandard' package")
+        if backpressure not in ("block", "drop"):
+            raise ValueError(f"Unsupported backpressure policy: {backpressure}")
+
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.buffer: queue.Queue = queue.Queue(maxsize=buffer_size)
+        self.flush_interval = flush_interval
+        self.flush_batch = flush_batch
+        self.segment_max_bytes = segment_max_bytes
+        self.segment_max_age = segment_max_age
+        self.compression = compression
+        self.backpressure = backpressure
+
+        self.written = 0
+        self.dropped = 0
+        self._segment_seq = 0
+        self._segment = None
+        self._store: Optional[TransactionStore] = None
+        self._segment_path: Optional[Path] = None
+        self._segment_bytes = 0
+        self._segment_opened_at = 0.0
+        self._closing = threading.Event()
+        self.daemon = True
+
+    def write(self, record: Dict[str, Any]) -> bool:
+        """Encola un registro; devuelve False si se descartó por backpressure"""
+        if self.backpressure == "drop":
+            try:
+                self.buffer.put_nowait(record)
+            except queue.Full:
+                self.dropped += 1
+                return False
+        else:
+            self.buffer.put(record)
+        return True
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Espera a que todo lo encolado hasta ahora esté escrito en disco"""
+        if not self.is_alive():
+            return True
+        done = threading.Event()
+        self.buffer.put(done)
+        return done.wait(timeout)
+
+    def close(self, timeout: Optional[float] = 10):
+        """Vacía el buffer, cierra el segmento actual y detiene el thread"""
+        if not self.is_alive():
+            return
+        self._closing.set()
+        self.flush(timeout)
+        self.join(timeout)
+
+    def run(self):
+        """Bucle principal: agrupa registros y los escribe por lotes"""
+        # La conexión SQLite debe crearse en el thread que la usa
+        self._store = TransactionStore(str(self.directory))
+
+        while not (self._closing.is_set() and self.buffer.empty()):
+            try:
+                item = self.buffer.get(timeout=self.flush_interval)
+            except queue.Empty:
+                self._maybe_rotate()
+                continue
+
+            batch: List[Dict[str, Any]] = []
+            waiters: List[threading.Event] = []
+            while True:
+                if isinstance(item, threading.Event):
+                    waiters.append(item)
+                else:
+                    batch.append(item)
+                if len(batch) >= self.flush_batch:
+                    break
+                try:
+                    item = self.buffer.get_nowait()
+                except queue.Empty:
+                    break
+
+            if batch:
+                self._write_batch(batch)
+            for waiter in waiters:
+                waiter.set()
+
+        self._close_segment()
+        self._store.close()
+
+    def _write_batch(self, batch: List[Dict[str, Any]]):
+        """Escribe un lote en el segmento actual y actualiza el índice"""
+        self._maybe_rotate()
+        if self._segment is None:
+            self._open_segment()
+
+        segment = self._segment_path.name
+        lines = []
+        entries = []
+        for record in batch:
+            line = serializer.dumps(record) + b"\n"
+            request = record.get("request") or {}
+            entries.append((
+                record.get("task_id", ""),
+                record.get("status"),
+                request.get("method"),
+                record.get("endpoint"),
+                record.get("timestamp"),
+                segment,
+                self._segment_bytes
+            ))
+            lines.append(line)
+            self._segment_bytes += len(line)
+
+        # El segmento se escribe antes que el índice: nunca hay entradas huérfanas
+        self._segment.write(b"".join(lines))
+        self._segment.flush()
+        self._store.add(entries)
+        self.written += len(batch)
+
+    def _maybe_rotate(self):
+        """Cierra el segmento si supera el tamaño o la antigüedad máximos"""
+        if self._segment is None:
+            return
+        too_big = self._segment_bytes >= self.segment_max_bytes
+        too_old = time.monotonic() - self._segment_opened_at >= self.segment_max_age
+        if too_big or too_old:
+            self._close_segment()
+
+    def _open_segment(self):
+        """Abre un segmento nuevo"""
+        self._segment_seq += 1
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        name = (f"segment_{timestamp}_{os.getpid()}_{self._segment_seq:06d}"
+                f"{SEGMENT_SUFFIXES[self.compression]}")
+        self._segment_path = self.directory / name
+        self._segment = open_segment(self._segment_path, "wb")
+        self._segment_bytes = 0
+        self._segment_opened_at = time.monotonic()
+
+    def _close_segment(self):
+        """Cierra el segmento actual (si hay uno abierto)"""
+        if self._segment is None:
+            return
+        self._segment.close()
+        self._segment = None
+
+def find_transactions(directory: str, task_id: str) -> List[Dict[str, Any]]:
+    """Busca las transacciones de una tarea usando el índice"""
+    store = TransactionStore(directory)
+    try:
+        return store.find(task_id=task_id)
+    finally:
+        store.close()
+
+def iter_transactions(directory: str):
+    """Recorre todas las transacciones de todos los segmentos en orden"""
+    for segment_path in sorted(Path(directory).glob("segment_*.jsonl*")):
+        with open_segment(segment_path, "rb") as segment:
+            for line in segment:
+                if line.strip():
+                    yield serializer.loads(line)
@@ -1,35 +1,49 @@
 from core.batch_processor import BatchProcessor
-from models.task import Task, HTTPMethod
+from core.process_pool_processor import ProcessPoolBatchProcessor
+from core.ingestion import TaskIngestor
+from models.task import HTTPMethod
+from models.request_template import RequestTemplate
 from log_system.logger import logger
+import argparse
 import json
 
+def ingest_file(source: str, format: str = None, checkpoint: str = None, num_workers: int = 5,
+                num_processes: int = None):
+    """Procesa las tareas de un fichero (o stdin con "-") en streaming"""
+    # Sin retener resultados en memoria: el fichero puede ser enorme
+    if num_processes:
+        processor = ProcessPoolBatchProcessor(num_processes=num_processes, concurrency=num_workers,
+                                              retention="failures")
+    else:
+        processor = BatchProcessor(num_workers=num_workers, retention="failures")
+    processor.start()
+
+    try:
+        summary = TaskIngestor(processor, source, format=format, checkpoint_path=checkpoint).run()
+        summary["statistics"] = processor.get_statistics()
+        logger.info(f"Ingestion summary: {json.dumps(summary, indent=2)}")
+
+        with open("logs/batch_summary.json", "w") as f:
+            json.dump(summary, f, indent=2, default=str)
+
+    finally:
+        processor.stop()
+
 def main():
     # Inicializar procesador
     processor = BatchProcessor(num_workers=5)
     processor.start()
 
     try:
-        # Ejemplo: Crear batch de tareas
-        tasks = []
-
-        # Tareas GET
-        for i in range(10):
-            task = Task(
-                method=HTTPMethod.GET,
-                endpoint=f"/users/{i}",
-                headers={"Authorization": "Bearer token123"}
-            )
-            tasks.append(task)
-
-        # Tareas PATCH
-        for i in range(5):
-            task = Task(
-                method=HTTPMethod.PATCH,
-                endpoint=f"/users/{i}",
-                data={"status": "active", "updated": True},
-                headers={"Authorization": "Bearer token123"}
-            )
-            tasks.append(task)
+        # Ejemplo: batch de tareas a partir de plantillas (cabeceras compartidas)
+        headers = {"Authorization": "Bearer token123"}
+        get_user = RequestTemplate(HTTPMethod.GET, "/users/{id}", headers=headers)
+        update_user = RequestTemplate(HTTPMethod.PATCH, "/users/{id}", headers=headers,
+                                      body_schema={"status": str, "updated": bool})
+
+        # Tareas GET y PATCH: una plantilla más la columna de ids
+        tasks = get_user.tasks(range(10))
+        tasks += update_user.tasks(range(5), data={"status": "active", "updated": True})
 
         # Procesar batch
         logger.info(f"Processing batch of {len(tasks)} tasks")
@@ -52,4 +66,15 @@ def main():
         processor.stop()
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Procesador de tareas HTTP por lotes")
+    parser.add_argument("--input", help="Fichero de tareas JSON Lines o CSV ('-' para stdin)")
+    parser.add_argument("--format", choices=["jsonl", "csv"], help="Formato de la entrada (por defecto según extensión)")
+    parser.add_argument("--checkpoint", help="Fichero de checkpoint para reanudar la ingesta")
+    parser.add_argument("--workers", type=int, default=5)
+    parser.add_argument("--processes", type=int, help="Reparte la ingesta entre N procesos (workers por proceso)")
+    args = parser.parse_args()
+
+    if args.input:
+        ingest_file(args.input, args.format, args.checkpoint, args.workers, args.processes)
+    else:
+        main()
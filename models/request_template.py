@@ -0,0 +1,102 @@
+import weakref
+from string import Formatter
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from models.task import Task, HTTPMethod
+
+# Plantillas vivas registradas por nombre (para reconstruir tareas serializadas)
+_registry: "weakref.WeakValueDictionary[str, RequestTemplate]" = weakref.WeakValueDictionary()
+
+def get_template(name: Optional[str]) -> Optional["RequestTemplate"]:
+    """Plantilla registrada con ese nombre, o None"""
+    return _registry.get(name) if name else None
+
+class RequestTemplate:
+    """Petición común a muchas tareas: método, ruta con parámetros, cabeceras y esquema del cuerpo.
+
+    Un batch se expresa como una plantilla más una columna de parámetros
+    (``template.tasks(range(1000))``). Las tareas comparten el mismo dict de
+    cabeceras y referencian la plantilla en ``Task.template``; APIClient
+    prepara una sola vez por plantilla la función de envío y sus argumentos,
+    y las estadísticas se desglosan por plantilla (``name``).
+
+    ``body_schema`` mapea campo -> tipo (o tupla de tipos); los campos son
+    obligatorios y se validan al crear cada tarea. Con
+    ``decode_response=False`` el cliente no decodifica el cuerpo de las
+    respuestas (solo interesa el código de estado).
+
+    El nombre identifica la plantilla al deserializar tareas, así que dos
+    plantillas vivas con el mismo nombre y distinta definición lanzan
+    ValueError (redefinirla igual es válido).
+    """
+
+    def __init__(self, method: HTTPMethod, path: str, headers: Optional[Dict[str, str]] = None,
+                 body_schema: Optional[Dict[str, Any]] = None, name: Optional[str] = None,
+                 decode_response: bool = True):
+        self.method = method
+        self.path = path
+        self.headers = headers
+        self.body_schema = body_schema
+        self.decode_response = decode_response
+        self.name = name or f"{method.value} {path}"
+        self.fields: Tuple[str, ...] = tuple(
+            field for _, field, _, _ in Formatter().parse(path) if field
+        )
+        registered = _registry.get(self.name)
+        if registered is not None and registered._definition() != self._definition():
+            raise ValueError(f"Request template name already registered: {self.name}")
+        _registry[self.name] = self
+
+    def _definition(self) -> Tuple[Any, ...]:
+        return (self.method, self.path, self.headers, self.body_schema, self.decode_response)
+
+    def __repr__(self) -> str:
+        return f"RequestTemplate({self.name!r})"
+
+    def render(self, params: Any = None) -> str:
+        """Endpoint para unos parámetros (un escalar basta si la ruta tiene uno solo)"""
+        if not self.fields:
+            return self.path
+        if not isinstance(params, dict):
+            if len(self.fields) != 1:
+                raise ValueError(f"Template {self.name} expects parameters {self.fields}")
+            params = {self.fields[0]: params}
+        try:
+            return self.path.format(**params)
+        except KeyError as e:
+            raise ValueError(f"Template {self.name}: missing parameter {e}") from None
+
+    def validate(self, data: Optional[Dict[Any, Any]]):
+        """Comprueba el cuerpo contra body_schema; lanza ValueError si no encaja"""
+        if not self.body_schema:
+            return
+        if not isinstance(data, dict):
+            raise ValueError(f"Template {self.name} requires a JSON object body")
+        for field, expected in self.body_schema.items():
+            if field not in data:
+                raise ValueError(f"Template {self.name}: missing body field '{field}'")
+            if not isinstance(data[field], expected):
+                raise ValueError(f"Template {self.name}: invalid type for body field '{field}'")
+
+    def task(self, params: Any = None, data: Optional[Dict[Any, Any]] = None, **kwargs) -> Task:
+        """Crea una tarea de la plantilla (kwargs: priority, tenant, ...)"""
+        self.validate(data)
+        return Task(method=self.method, endpoint=self.render(params), data=data,
+                    headers=self.headers, template=self, **kwargs)
+
+    def tasks(self, params: Iterable[Any], data: Optional[Dict[Any, Any]] = None, **kwargs) -> List[Task]:
+        """Una tarea por valor de la columna de parámetros (mismo cuerpo para todas)"""
+        self.validate(data)
+        return [Task(method=self.method, endpoint=self.render(value), data=data,
+                     headers=self.headers, template=self, **kwargs)
+                for value in params]
+
+    def batch(self, params: Iterable[Any], data: Optional[Dict[Any, Any]] = None, **kwargs):
+        """Como ``tasks`` pero en un TaskBatch columnar (kwargs: priority, tenant, batch_id)"""
+        # Import diferido: task_batch también se usa sin plantillas
+        from models.task_batch import TaskBatch
+
+        self.validate(data)
+        batch = TaskBatch(template=self, **kwargs)
+        for value in params:
+            batch.append(self.method, self.render(value), data)
+        return batch
@@ -1,6 +1,6 @@
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from enum import Enum
 import uuid
 
@@ -18,8 +18,9 @@ class HTTPMethod(Enum):
     PUT = "PUT"
     DELETE = "DELETE"
 
-@dataclass
+@dataclass(slots=True)
 class Task:
+    """Tarea HTTP individual (sin __dict__ por instancia: ver models.task_batch para lotes enormes)"""
     method: HTTPMethod
     endpoint: str
     data: Optional[Dict[Any, Any]] = None
@@ -27,19 +28,30 @@ class Task:
     task_id: str = field(default_factory=lambda: str(uuid.uuid4()))
     status: TaskStatus = TaskStatus.PENDING
     created_at: datetime = field(default_factory=datetime.now)
+    started_at: Optional[datetime] = None
     completed_at: Optional[datetime] = None
     attempts: int = 0
     error_message: Optional[str] = None
     response_data: Optional[Dict[Any, Any]] = None
+    priority: int = 0  # mayor valor = más urgente
+    tenant: Optional[str] = None
+    batch_id: Optional[str] = None
+    template: Optional["RequestTemplate"] = None  # models.request_template (compartida, no se copia)
+    encoded_data: Optional[bytes] = field(default=None, repr=False, compare=False)  # cuerpo ya codificado (reintentos)
+    timings: Optional[List[Tuple[str, int, int]]] = field(default=None, repr=False, compare=False)  # core.tracing: (etapa, ns, thread)
 
     def to_dict(self) -> Dict[str, Any]:
         return {
             "task_id": self.task_id,
             "method": self.method.value,
             "endpoint": self.endpoint,
+            "priority": self.priority,
+            "tenant": self.tenant,
+            "template": self.template.name if self.template else None,
             "status": self.status.value,
             "attempts": self.attempts,
             "created_at": self.created_at.isoformat(),
+            "started_at": self.started_at.isoformat() if self.started_at else None,
             "completed_at": self.completed_at.isoformat() if self.completed_at else None,
             "error_message": self.error_message
         }
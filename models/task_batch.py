@@ -0,0 +1,144 @@
+import re
+import time
+import uuid
+from array import array
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+from models.task import Task, HTTPMethod
+
+# Primer segmento numérico del path: "/users/42/posts" -> ("/users/", 42, "/posts")
+_NUMERIC_SEGMENT = re.compile(r"/(\d+)(?=/|$)")
+
+class TaskBatch:
+    """Batch de tareas en formato columnar (struct-of-arrays).
+
+    En lugar de un objeto Task por tarea guarda columnas ``array``: código
+    del método, índice de una plantilla de endpoint internada, el id
+    numérico del recurso y el instante de creación en nanosegundos
+    monotónicos. Cabeceras, prioridad y tenant son comunes al batch y los
+    cuerpos se guardan solo para las tareas que los tienen. Los ``Task``
+    se materializan bajo demanda con ``task(i)`` / iterando, así que
+    BatchProcessor puede alimentar la cola sin tener el millón de objetos
+    en memoria a la vez.
+    """
+
+    _METHODS = list(HTTPMethod)
+    _METHOD_CODES = {method: code for code, method in enumerate(_METHODS)}
+
+    def __init__(self, headers: Optional[Dict[str, str]] = None, priority: int = 0,
+                 tenant: Optional[str] = None, batch_id: Optional[str] = None,
+                 template: Optional["RequestTemplate"] = None):
+        self.batch_id = batch_id or uuid.uuid4().hex
+        # Con plantilla (models.request_template) las cabeceras son las suyas
+        self.template = template
+        self.headers = headers if headers is not None or template is None else template.headers
+        self.priority = priority
+        self.tenant = tenant
+        self._methods = array("B")
+        self._templates = array("I")
+        self._params = array("q")  # -1: el endpoint no tiene id numérico
+        self._created_ns = array("q")
+        self._bodies: Dict[int, Dict[Any, Any]] = {}
+        self._template_table: List[Tuple[str, str]] = []
+        self._template_index: Dict[Tuple[str, str], int] = {}
+        # Referencia para convertir el reloj monotónico en created_at
+        self._wall_anchor = datetime.now()
+        self._monotonic_anchor = time.monotonic_ns()
+
+    @classmethod
+    def from_tasks(cls, tasks: Iterable[Task], **kwargs) -> "TaskBatch":
+        """Convierte tareas sueltas (se conservan método, endpoint y cuerpo)"""
+        batch = cls(**kwargs)
+        for task in tasks:
+            batch.append(task.method, task.endpoint, task.data)
+        return batch
+
+    def __len__(self) -> int:
+        return len(self._methods)
+
+    def append(self, method: HTTPMethod, endpoint: str, data: Optional[Dict[Any, Any]] = None) -> int:
+        """Añade una tarea y devuelve su índice en el batch"""
+        # Todos los valores se calculan antes de tocar ninguna columna
+        method_code = self._METHOD_CODES[method]
+        match = _NUMERIC_SEGMENT.search(endpoint)
+        digits = match.group(1) if match else None
+        # Ids que no caben en la columna int64 se guardan como endpoint literal
+        if digits is not None and str(int(digits)) == digits and int(digits) < 2 ** 63:
+            template = (endpoint[:match.start(1)], endpoint[match.end(1):])
+            param = int(digits)
+        else:
+            template = (endpoint, "")
+            param = -1
+
+        template_id = self._template_index.get(template)
+        if template_id is None:
+            template_id = len(self._template_table)
+            self._template_table.append(template)
+            self._template_index[template] = template_id
+
+        index = len(self._methods)
+        self._methods.append(method_code)
+        self._templates.append(template_id)
+        self._params.append(param)
+        self._created_ns.append(time.monotonic_ns())
+        if data is not None:
+            self._bodies[index] = data
+        return index
+
+    def task_id(self, index: int) -> str:
+        """Id estable de la tarea ``index`` (no se guarda: se deriva del batch)"""
+        return f"{self.batch_id}:{index}"
+
+    def endpoint(self, index: int) -> str:
+        """Endpoint de la tarea reconstruido desde su plantilla"""
+        prefix, suffix = self._template_table[self._templates[index]]
+        param = self._params[index]
+        return prefix if param < 0 else f"{prefix}{param}{suffix}"
+
+    def created_at(self, index: int) -> datetime:
+        """Instante de creación (reloj de pared) a partir del timestamp monotónico"""
+        offset_ns = self._created_ns[index] - self._monotonic_anchor
+        return self._wall_anchor + timedelta(microseconds=offset_ns // 1000)
+
+    def task(self, index: int) -> Task:
+        """Materializa la tarea ``index`` como Task"""
+        if not 0 <= index < len(self):
+            raise IndexError(f"Task index {index} out of range")
+        return Task(
+            method=self._METHODS[self._methods[index]],
+            endpoint=self.endpoint(index),
+            data=self._bodies.get(index),
+            headers=self.headers,
+            task_id=self.task_id(index),
+            created_at=self.created_at(index),
+            priority=self.priority,
+            tenant=self.tenant,
+            batch_id=self.batch_id,
+            template=self.template
+        )
+
+    def __iter__(self) -> Iterator[Task]:
+        for index in range(len(self)):
+            yield self.task(index)
+
+    def to_dict(self, index: int) -> Dict[str, Any]:
+        """Representación de la tarea ``index`` sin crear el Task"""
+        return {
+            "task_id": self.task_id(index),
+            "method": self._METHODS[self._methods[index]].value,
+            "endpoint": self.endpoint(index),
+            "priority": self.priority,
+            "tenant": self.tenant,
+            "template": self.template.name if self.template else None,
+            "status": "pending",
+            "attempts": 0,
+            "created_at": self.created_at(index).isoformat(),
+            "started_at": None,
+            "completed_at": None,
+            "error_message": None
+        }
+
+    def nbytes(self) -> int:
+        """Memoria aproximada de las columnas (sin cuerpos ni plantillas)"""
+        return sum(column.itemsize * len(column)
+                   for column in (self._methods, self._templates, self._params, self._created_ns))
@@ -1,91 +1,253 @@
+from functools import partial
+from typing import Callable, Dict, Any, Optional, Tuple
 import requests
-from typing import Dict, Any, Optional
 from models.task import Task, HTTPMethod
+from models.request_template import RequestTemplate
 from config.settings import config
+from services.serializer import serializer
+from services.connection_pool import connection_pool, TRANSPORT_ERRORS
+from services.rate_limiter import request_limiter, parse_retry_after
+from services.response_cache import response_cache, cache_key
+from core.tracing import mark
 from log_system.logger import logger
-import time
+
+# Métodos cuyo cuerpo se envía como JSON
+BODY_METHODS = (HTTPMethod.POST, HTTPMethod.PATCH, HTTPMethod.PUT)
+
+class RetryableRequestError(Exception):
+    """La petición falló pero le quedan intentos: debe reprogramarse"""
+
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        # Segundos que pidió esperar el servidor (cabecera Retry-After)
+        self.retry_after = retry_after
+
+def is_retryable(task: Task, error: Exception) -> bool:
+    """Indica si un fallo justifica otro intento de la tarea"""
+    if task.attempts >= config.MAX_RETRIES:
+        return False
+
+    response = getattr(error, "response", None)
+    if response is not None:
+        return response.status_code in config.RETRY_ON_STATUS
+
+    # Errores de conexión, timeouts, etc.
+    return True
+
+def encoded_body(task: Task) -> Optional[bytes]:
+    """Cuerpo JSON de la tarea, codificado una sola vez aunque haya reintentos"""
+    if task.data is None:
+        return None
+    if task.encoded_data is None:
+        task.encoded_data = serializer.dumps(task.data)
+    return task.encoded_data
+
+def decode_json(content: bytes) -> Any:
+    """Decodifica un cuerpo JSON; si es inválido lanza el JSONDecodeError de requests,
+    que como con ``response.json()`` se trata como un fallo (reintentable) de la petición"""
+    try:
+        return serializer.loads(content)
+    except ValueError as e:
+        raise requests.exceptions.JSONDecodeError(
+            getattr(e, "msg", str(e)), content.decode("utf-8", "replace"), getattr(e, "pos", 0)
+        ) from e
+
+def json_headers(headers: Optional[Dict[str, str]]) -> Dict[str, str]:
+    """Cabeceras con Content-Type JSON por defecto, respetando el del llamador (sin distinguir mayúsculas)"""
+    headers = dict(headers or {})
+    if not any(name.lower() == "content-type" for name in headers):
+        headers["Content-Type"] = "application/json"
+    return headers
+
+class PreparedTemplate:
+    """Estado de una RequestTemplate calculado una vez por cliente"""
+
+    def __init__(self, session, template: RequestTemplate, raw_body_argument: str):
+        self.template = template
+        self.has_body = template.method in BODY_METHODS
+        headers = json_headers(template.headers) if self.has_body else dict(template.headers or {})
+        # Función de envío con timeout y cabeceras ya fijados
+        self.send: Callable = partial(
+            getattr(session, template.method.value.lower()),
+            timeout=config.API_TIMEOUT,
+            headers=headers
+        )
+        self.raw_body_argument = raw_body_argument
+
+    def request(self, url: str, task: Task):
+        if self.template.method == HTTPMethod.GET:
+            return self.send(url, params=task.data)
+        if not self.has_body:
+            return self.send(url)
+        return self.send(url, **{self.raw_body_argument: encoded_body(task)})
 
 class APIClient:
     def __init__(self):
-        self.session = requests.Session()
+        # Sesión compartida: un pool de conexiones por host para todos los workers
+        self.session = connection_pool.session()
         self.base_url = config.API_BASE_URL
+        self.templates: Dict[str, PreparedTemplate] = {}
+        # Cuerpos ya codificados: requests los recibe en data=, httpx en content=
+        self.raw_body_argument = "data" if isinstance(self.session, requests.Session) else "content"
+        # Respuestas por código HTTP y errores sin respuesta por tipo (un cliente por worker)
+        self.status_counts: Dict[int, int] = {}
+        self.transport_errors: Dict[str, int] = {}
+
+    def _prepared(self, task: Task) -> Optional[PreparedTemplate]:
+        """Estado preparado de la plantilla de la tarea (None si no usa plantilla o la sobrescribe)"""
+        template = task.template
+        if template is None or task.method != template.method or task.headers is not template.headers:
+            return None
+
+        prepared = self.templates.get(template.name)
+        # Por nombre: en los procesos hijo cada tarea llega con su copia de la plantilla
+        if prepared is None or (prepared.template.method, prepared.template.headers) != (template.method, template.headers):
+            prepared = self.templates[template.name] = PreparedTemplate(
+                self.session, template, self.raw_body_argument
+            )
+        return prepared
 
     def execute_request(self, task: Task) -> Dict[str, Any]:
-        """Ejecuta una solicitud HTTP con reintentos"""
+        """Ejecuta un intento de la solicitud HTTP.
+
+        Si falla y quedan intentos lanza RetryableRequestError; el reintento
+        lo programa quien llama (ver core.retry_scheduler) en vez de dormir aquí.
+        """
         url = f"{self.base_url}{task.endpoint}"
+        task.attempts += 1
+
+        try:
+            # Log del intento
+            logger.task_info(task.task_id, "Task %s: Attempt %d - %s %s",
+                             task.task_id, task.attempts, task.method.value, url)
+
+            if task.method == HTTPMethod.GET and config.RESPONSE_CACHE_ENABLED:
+                # GET idempotente: caché + coalescencia de peticiones idénticas en vuelo
+                key = cache_key(url, task.data, task.headers)
+                result, cache_source = response_cache.fetch(
+                    key, lambda etag: self._send(task, url, etag)
+                )
+            else:
+                result, _ = self._send(task, url)
+                cache_source = None
+                if config.RESPONSE_CACHE_ENABLED:
+                    response_cache.invalidate(url)
+
+            # Log de éxito
+            logger.log_transaction(task.task_id, {
+                "endpoint": task.endpoint,
+                "request": {
+                    "method": task.method.value,
+                    "url": url,
+                    "data": task.data,
+                    "headers": task.headers
+                },
+                "response": result,
+                "attempt": task.attempts,
+                "cache": cache_source,
+                "status": "success"
+            })
+            mark(task, "logged")
 
-        for attempt in range(config.MAX_RETRIES):
-            try:
-                task.attempts = attempt + 1
+            task.encoded_data = None
+            return result
 
-                # Log del intento
-                logger.info(f"Task {task.task_id}: Attempt {task.attempts} - {task.method.value} {url}")
+        except TRANSPORT_ERRORS as e:
+            logger.error(f"Task {task.task_id}: Attempt {task.attempts} failed - {str(e)}")
+            if getattr(e, "response", None) is None:
+                error = type(e).__name__
+                self.transport_errors[error] = self.transport_errors.get(error, 0) + 1
 
+            if is_retryable(task, e):
+                response = getattr(e, "response", None)
+                retry_after = (parse_retry_after(response.headers.get("Retry-After"))
+                               if response is not None else None)
+                raise RetryableRequestError(str(e), retry_after=retry_after) from e
+
+            logger.log_transaction(task.task_id, {
+                "endpoint": task.endpoint,
+                "request": {
+                    "method": task.method.value,
+                    "url": url,
+                    "data": task.data
+                },
+                "error": str(e),
+                "attempts": task.attempts,
+                "status": "failed"
+            })
+            mark(task, "logged")
+            task.encoded_data = None
+            raise
+
+    def _send(self, task: Task, url: str,
+              etag: Optional[str] = None) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        """Envía la petición; devuelve (resultado, ETag) o (None, ETag) si es un 304"""
+        headers = task.headers
+        if etag is not None:
+            headers = {**(task.headers or {}), "If-None-Match": etag}
+
+        # Esperar turno según límites de tasa/concurrencia del host
+        permit = request_limiter.acquire(url)
+        status_code = None
+        retry_after = None
+        prepared = self._prepared(task) if etag is None else None
+        mark(task, "request_sent")
+        try:
+            if prepared is not None:
+                response = prepared.request(url, task)
+            else:
                 # Ejecutar request según el método
                 response = self._make_request(
                     method=task.method,
                     url=url,
                     data=task.data,
-                    headers=task.headers
+                    headers=headers,
+                    body=encoded_body(task) if task.method in BODY_METHODS else None
                 )
+            mark(task, "response_received")
+            status_code = response.status_code
+            self.status_counts[status_code] = self.status_counts.get(status_code, 0) + 1
+            retry_after = parse_retry_after(response.headers.get("Retry-After"))
+        finally:
+            request_limiter.release(permit, status_code, retry_after)
 
-                response.raise_for_status()
-
-                # Log de éxito
-                result = {
-                    "status_code": response.status_code,
-                    "response": response.json() if response.content else None
-                }
-
-                logger.log_transaction(task.task_id, {
-                    "request": {
-                        "method": task.method.value,
-                        "url": url,
-                        "data": task.data,
-                        "headers": task.headers
-                    },
-                    "response": result,
-                    "attempt": task.attempts,
-                    "status": "success"
-                })
-
-                return result
-
-            except requests.exceptions.RequestException as e:
-                logger.error(f"Task {task.task_id}: Attempt {task.attempts} failed - {str(e)}")
-
-                if attempt < config.MAX_RETRIES - 1:
-                    time.sleep(config.RETRY_DELAY * (attempt + 1))  # Backoff exponencial
-                else:
-                    logger.log_transaction(task.task_id, {
-                        "request": {
-                            "method": task.method.value,
-                            "url": url,
-                            "data": task.data
-                        },
-                        "error": str(e),
-                        "attempts": task.attempts,
-                        "status": "failed"
-                    })
-                    raise
+        if response.status_code == 304:
+            return None, etag
+
+        response.raise_for_status()
+
+        # Plantillas en modo "solo estado": no se decodifica la respuesta
+        decode = task.template is None or task.template.decode_response
+        result = {
+            "status_code": response.status_code,
+            "response": decode_json(response.content) if decode and response.content else None
+        }
+        mark(task, "decoded")
+        return result, response.headers.get("ETag")
 
     def _make_request(self, method: HTTPMethod, url: str,
                      data: Optional[Dict] = None,
-                     headers: Optional[Dict] = None) -> requests.Response:
-        """Realiza la petición HTTP"""
+                     headers: Optional[Dict] = None,
+                     body: Optional[bytes] = None):
+        """Realiza la petición HTTP (``body``: ``data`` ya codificado como JSON)"""
         request_kwargs = {
             "timeout": config.API_TIMEOUT,
             "headers": headers or {}
         }
+        # Cuerpo ya codificado (una vez por tarea) o, si no lo hay, json= como siempre
+        body_kwargs = {"json": data}
+        if body is not None:
+            request_kwargs["headers"] = json_headers(request_kwargs["headers"])
+            body_kwargs = {self.raw_body_argument: body}
 
         if method == HTTPMethod.GET:
             return self.session.get(url, params=data, **request_kwargs)
         elif method == HTTPMethod.POST:
-            return self.session.post(url, json=data, **request_kwargs)
+            return self.session.post(url, **body_kwargs, **request_kwargs)
         elif method == HTTPMethod.PATCH:
-            return self.session.patch(url, json=data, **request_kwargs)
+            return self.session.patch(url, **body_kwargs, **request_kwargs)
         elif method == HTTPMethod.PUT:
-            return self.session.put(url, json=data, **request_kwargs)
+            return self.session.put(url, **body_kwargs, **request_kwargs)
         elif method == HTTPMethod.DELETE:
             return self.session.delete(url, **request_kwargs)
         else:
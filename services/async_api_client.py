@@ -0,0 +1,136 @@
+import aiohttp
+import asyncio
+from typing import Dict, Any, Optional
+from models.task import Task, HTTPMethod
+from config.settings import config
+from services.api_client import RetryableRequestError, BODY_METHODS, encoded_body, json_headers, decode_json
+from log_system.logger import logger
+
+class AsyncAPIClient:
+    def __init__(self, max_connections: int = None):
+        self.base_url = config.API_BASE_URL
+        self.max_connections = max_connections or config.MAX_IN_FLIGHT
+        self.session: Optional[aiohttp.ClientSession] = None
+
+    async def open(self):
+        """Crea la sesión HTTP (debe llamarse dentro del event loop)"""
+        connector = aiohttp.TCPConnector(
+            limit=self.max_connections,
+            keepalive_timeout=config.POOL_IDLE_TIMEOUT
+        )
+        self.session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=config.API_TIMEOUT)
+        )
+
+    async def close(self):
+        """Cierra la sesión HTTP"""
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    async def execute_request(self, task: Task) -> Dict[str, Any]:
+        """Ejecuta un intento de la solicitud HTTP.
+
+        Si falla y quedan intentos lanza RetryableRequestError; la espera del
+        reintento la gestiona el procesador sin ocupar un hueco in-flight.
+        """
+        url = f"{self.base_url}{task.endpoint}"
+        task.attempts += 1
+
+        try:
+            # Log del intento
+            logger.task_info(task.task_id, "Task %s: Attempt %d - %s %s",
+                             task.task_id, task.attempts, task.method.value, url)
+
+            async with self._make_request(
+                method=task.method,
+                url=url,
+                data=task.data,
+                headers=task.headers,
+                body=encoded_body(task) if task.method in BODY_METHODS else None
+            ) as response:
+                response.raise_for_status()
+                content = await response.read()
+
+                # Plantillas en modo "solo estado": no se decodifica la respuesta
+                decode = task.template is None or task.template.decode_response
+                result = {
+                    "status_code": response.status,
+                    "response": decode_json(content) if decode and content else None
+                }
+
+            logger.log_transaction(task.task_id, {
+                "endpoint": task.endpoint,
+                "request": {
+                    "method": task.method.value,
+                    "url": url,
+                    "data": task.data,
+                    "headers": task.headers
+                },
+                "response": result,
+                "attempt": task.attempts,
+                "status": "success"
+            })
+
+            task.encoded_data = None
+            return result
+
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+            # ValueError: cuerpo de respuesta que no es JSON válido (decode_json)
+            logger.error(f"Task {task.task_id}: Attempt {task.attempts} failed - {str(e)}")
+
+            if self._is_retryable(task, e):
+                raise RetryableRequestError(str(e)) from e
+
+            logger.log_transaction(task.task_id, {
+                "endpoint": task.endpoint,
+                "request": {
+                    "method": task.method.value,
+                    "url": url,
+                    "data": task.data
+                },
+                "error": str(e),
+                "attempts": task.attempts,
+                "status": "failed"
+            })
+            task.encoded_data = None
+            raise
+
+    def _is_retryable(self, task: Task, error: Exception) -> bool:
+        """Indica si un fallo justifica otro intento de la tarea"""
+        if task.attempts >= config.MAX_RETRIES:
+            return False
+
+        if isinstance(error, aiohttp.ClientResponseError):
+            return error.status in config.RETRY_ON_STATUS
+
+        # Errores de conexión, timeouts, etc.
+        return True
+
+    def _make_request(self, method: HTTPMethod, url: str,
+                      data: Optional[Dict] = None,
+                      headers: Optional[Dict] = None,
+                      body: Optional[bytes] = None):
+        """Prepara la petición HTTP (context manager de aiohttp)"""
+        request_kwargs = {
+            "headers": headers or {}
+        }
+        # Cuerpo ya codificado (una vez por tarea) o, si no lo hay, json= como siempre
+        body_kwargs = {"json": data}
+        if body is not None:
+            request_kwargs["headers"] = json_headers(request_kwargs["headers"])
+            body_kwargs = {"data": body}
+
+        if method == HTTPMethod.GET:
+            return self.session.get(url, params=data, **request_kwargs)
+        elif method == HTTPMethod.POST:
+            return self.session.post(url, **body_kwargs, **request_kwargs)
+        elif method == HTTPMethod.PATCH:
+            return self.session.patch(url, **body_kwargs, **request_kwargs)
+        elif method == HTTPMethod.PUT:
+            return self.session.put(url, **body_kwargs, **request_kwargs)
+        elif method == HTTPMethod.DELETE:
+            return self.session.delete(url, **request_kwargs)
+        else:
+            raise ValueError(f"Unsupported HTTP method: {method}")
@@ -0,0 +1,128 @@
+import json
+import re
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Any, Dict, Hashable, List, Optional, Sequence
+from models.task import Task, HTTPMethod
+
+@dataclass
+class BulkItemResult:
+    """Resultado de una tarea dentro de una respuesta bulk"""
+    status_code: int
+    response: Any = None
+
+    @property
+    def ok(self) -> bool:
+        return 200 <= self.status_code < 300
+
+class EndpointTemplate:
+    """Plantilla de endpoint con parámetros: ``/users/{id}``"""
+
+    def __init__(self, template: str):
+        self.template = template
+        pattern = re.sub(r"\\\{(\w+)\\\}", r"(?P<\1>[^/?]+)", re.escape(template))
+        self._regex = re.compile(f"^{pattern}$")
+
+    def match(self, endpoint: str) -> Optional[Dict[str, str]]:
+        """Parámetros del endpoint o None si no encaja en la plantilla"""
+        match = self._regex.match(endpoint)
+        return match.groupdict() if match else None
+
+class BatchAdapter(ABC):
+    """Interfaz para agrupar tareas compatibles en una única petición bulk.
+
+    - ``group_key``: clave de agrupación de una tarea, o None si el adapter
+      no la admite. Solo se agrupan tareas con la misma clave.
+    - ``build_request``: construye la tarea bulk que se envía al upstream.
+    - ``split_response``: reparte la respuesta bulk en un resultado por
+      tarea original (mismo orden).
+    """
+
+    @abstractmethod
+    def group_key(self, task: Task) -> Optional[Hashable]:
+        ...
+
+    @abstractmethod
+    def build_request(self, tasks: List[Task]) -> Task:
+        ...
+
+    @abstractmethod
+    def split_response(self, tasks: List[Task], response: Any) -> List[BulkItemResult]:
+        ...
+
+class JSONArrayBatchAdapter(BatchAdapter):
+    """Envía las tareas como un array JSON de operaciones.
+
+    Petición: ``POST bulk_endpoint`` con
+    ``[{"method": ..., "path": ..., "body": ...}, ...]``.
+    Respuesta: array en el mismo orden con ``{"status": int, "body": ...}``.
+    """
+
+    def __init__(self, template: str, bulk_endpoint: str,
+                 methods: Sequence[HTTPMethod] = (HTTPMethod.POST, HTTPMethod.PUT,
+                                                  HTTPMethod.PATCH, HTTPMethod.DELETE)):
+        self.template = EndpointTemplate(template)
+        self.bulk_endpoint = bulk_endpoint
+        self.methods = tuple(methods)
+
+    def group_key(self, task: Task) -> Optional[Hashable]:
+        if task.method not in self.methods or self.template.match(task.endpoint) is None:
+            return None
+        return (task.method, self.template.template, json.dumps(task.headers, sort_keys=True))
+
+    def build_request(self, tasks: List[Task]) -> Task:
+        return Task(
+            method=HTTPMethod.POST,
+            endpoint=self.bulk_endpoint,
+            data=[{"method": task.method.value, "path": task.endpoint, "body": task.data}
+                  for task in tasks],
+            headers=tasks[0].headers
+        )
+
+    def split_response(self, tasks: List[Task], response: Any) -> List[BulkItemResult]:
+        if not isinstance(response, list) or len(response) != len(tasks):
+            raise ValueError(f"Bulk response does not match the {len(tasks)} submitted operations")
+        return [BulkItemResult(item["status"], item.get("body")) for item in response]
+
+class MultiGetBatchAdapter(BatchAdapter):
+    """Agrupa GET de recursos individuales en un GET multi-ID.
+
+    ``GET /users/1``, ``GET /users/2`` -> ``GET /users?ids=1,2``; la
+    respuesta es ``{"items": {id: recurso}}`` y un id ausente es un 404.
+    """
+
+    def __init__(self, template: str, bulk_endpoint: str,
+                 param: str = "ids", id_param: str = "id"):
+        self.template = EndpointTemplate(template)
+        self.bulk_endpoint = bulk_endpoint
+        self.param = param
+        self.id_param = id_param
+
+    def _resource_id(self, task: Task) -> Optional[str]:
+        params = self.template.match(task.endpoint)
+        return params.get(self.id_param) if params else None
+
+    def group_key(self, task: Task) -> Optional[Hashable]:
+        if task.method != HTTPMethod.GET or task.data or self._resource_id(task) is None:
+            return None
+        return (self.template.template, json.dumps(task.headers, sort_keys=True))
+
+    def build_request(self, tasks: List[Task]) -> Task:
+        ids = list(dict.fromkeys(self._resource_id(task) for task in tasks))
+        return Task(
+            method=HTTPMethod.GET,
+            endpoint=self.bulk_endpoint,
+            data={self.param: ",".join(ids)},
+            headers=tasks[0].headers
+        )
+
+    def split_response(self, tasks: List[Task], response: Any) -> List[BulkItemResult]:
+        items = (response or {}).get("items", {})
+        results = []
+        for task in tasks:
+            resource_id = self._resource_id(task)
+            if resource_id in items:
+                results.append(BulkItemResult(200, items[resource_id]))
+            else:
+                results.append(BulkItemResult(404, {"error": "Not found"}))
+        return results
@@ -0,0 +1,183 @@
+import socket
+import threading
+import time
+from typing import Any, Dict, Optional
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3 import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.connection import HTTPConnection
+from config.settings import config
+
+try:
+    import httpx  # opcional: solo para HTTP/2
+except ImportError:
+    httpx = None
+
+class _IdleTimeoutMixin:
+    """Cierra las conexiones que llevan más de ``idle_timeout`` sin usarse.
+
+    El servidor suele cortar las conexiones keep-alive inactivas; reutilizar
+    una ya cerrada cuesta un error y un reintento, así que se descartan antes.
+    """
+
+    idle_timeout: Optional[float] = None
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.idle_closed = 0
+
+    def _get_conn(self, timeout=None):
+        conn = super()._get_conn(timeout)
+        last_used = getattr(conn, "_last_used", None)
+        if (self.idle_timeout is not None and last_used is not None
+                and time.monotonic() - last_used > self.idle_timeout):
+            conn.close()
+            self.idle_closed += 1
+        return conn
+
+    def _put_conn(self, conn):
+        if conn is not None:
+            conn._last_used = time.monotonic()
+        super()._put_conn(conn)
+
+class PooledAdapter(HTTPAdapter):
+    """HTTPAdapter con tamaño de pool, idle timeout y TCP keep-alive configurables"""
+
+    def __init__(self, pool_maxsize: int, idle_timeout: float = None,
+                 tcp_keepalive: bool = True, pool_block: bool = True):
+        self.idle_timeout = idle_timeout
+        self.tcp_keepalive = tcp_keepalive
+        super().__init__(pool_maxsize=pool_maxsize, pool_block=pool_block)
+
+    def init_poolmanager(self, connections, maxsize, block=False, **pool_kwargs):
+        if self.tcp_keepalive:
+            pool_kwargs["socket_options"] = HTTPConnection.default_socket_options + [
+                (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+            ]
+        super().init_poolmanager(connections, maxsize, block, **pool_kwargs)
+
+        attrs = {"idle_timeout": self.idle_timeout}
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": type("IdleHTTPConnectionPool", (_IdleTimeoutMixin, HTTPConnectionPool), attrs),
+            "https": type("IdleHTTPSConnectionPool", (_IdleTimeoutMixin, HTTPSConnectionPool), attrs),
+        }
+
+    def pool_stats(self) -> Dict[str, Dict[str, int]]:
+        """Conexiones abiertas/reutilizadas por host de este adapter"""
+        pools = self.poolmanager.pools
+        stats = {}
+        for key in pools.keys():
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            opened = pool.num_connections + getattr(pool, "idle_closed", 0)
+            stats[f"{pool.scheme}://{pool.host}:{pool.port}"] = {
+                "opened": opened,
+                "requests": pool.num_requests,
+                "reused": max(pool.num_requests - opened, 0),
+                "idle_closed": getattr(pool, "idle_closed", 0),
+                # La LifoQueue de urllib3 se rellena con None: solo cuentan conexiones reales
+                "idle": sum(1 for conn in list(pool.pool.queue) if conn is not None) if pool.pool is not None else 0,
+                "maxsize": pool.pool.maxsize if pool.pool is not None else 0
+            }
+        return stats
+
+class ConnectionPool:
+    """Sesión HTTP compartida por todos los workers del proceso.
+
+    Un único pool de conexiones por host evita la fragmentación de una
+    ``requests.Session`` por worker: las conexiones keep-alive se reutilizan
+    entre workers y ``pool_block`` hace que los workers esperen una conexión
+    libre en vez de abrir sockets de usar y tirar.
+    """
+
+    def __init__(self):
+        self._session = None
+        self._adapters: Dict[str, PooledAdapter] = {}
+        self._lock = threading.Lock()
+
+    def session(self):
+        """Devuelve la sesión compartida (se crea al primer uso)"""
+        if self._session is None:
+            with self._lock:
+                if self._session is None:
+                    if config.POOL_HTTP2:
+                        self._session = self._build_http2_client()
+                    else:
+                        self._session = self._build_session()
+        return self._session
+
+    def _new_adapter(self, maxsize: int) -> PooledAdapter:
+        return PooledAdapter(
+            pool_maxsize=maxsize,
+            idle_timeout=config.POOL_IDLE_TIMEOUT,
+            tcp_keepalive=config.POOL_TCP_KEEPALIVE,
+            pool_block=config.POOL_BLOCK
+        )
+
+    def _build_session(self) -> requests.Session:
+        session = requests.Session()
+
+        for scheme in ("http://", "https://"):
+            self._adapters[scheme] = self._new_adapter(config.POOL_MAXSIZE)
+            session.mount(scheme, self._adapters[scheme])
+
+        # Tamaño específico por host ("host[:puerto]" tal como aparece en la URL)
+        for host, maxsize in config.POOL_HOST_MAXSIZE.items():
+            for scheme in ("http://", "https://"):
+                prefix = f"{scheme}{host}/"
+                self._adapters[prefix] = self._new_adapter(maxsize)
+                session.mount(prefix, self._adapters[prefix])
+
+        return session
+
+    def _build_http2_client(self):
+        """Cliente httpx con multiplexado HTTP/2 (requiere httpx[http2])"""
+        if httpx is None:
+            raise RuntimeError("HTTP/2 support requires the 'httpx[http2]' package")
+
+        def transport(maxsize: int):
+            return httpx.HTTPTransport(
+                http2=True,
+                limits=httpx.Limits(
+                    max_connections=maxsize,
+                    max_keepalive_connections=maxsize,
+                    keepalive_expiry=config.POOL_IDLE_TIMEOUT
+                )
+            )
+
+        mounts = {f"all://{host}": transport(maxsize)
+                  for host, maxsize in config.POOL_HOST_MAXSIZE.items()}
+        return httpx.Client(transport=transport(config.POOL_MAXSIZE), mounts=mounts)
+
+    def stats(self) -> Dict[str, Any]:
+        """Métricas de reutilización de conexiones"""
+        if self._session is None:
+            return {"opened": 0, "reused": 0, "requests": 0, "hosts": {}}
+        if not self._adapters:
+            return {"http2": True}
+
+        hosts: Dict[str, Dict[str, int]] = {}
+        for adapter in list(self._adapters.values()):
+            hosts.update(adapter.pool_stats())
+
+        return {
+            "opened": sum(h["opened"] for h in hosts.values()),
+            "reused": sum(h["reused"] for h in hosts.values()),
+            "requests": sum(h["requests"] for h in hosts.values()),
+            "hosts": hosts
+        }
+
+    def close(self):
+        with self._lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+                self._adapters = {}
+
+# Errores de transporte que el cliente trata como fallo de la petición
+TRANSPORT_ERRORS = (requests.exceptions.RequestException,)
+if httpx is not None:
+    TRANSPORT_ERRORS += (httpx.HTTPError,)
+
+connection_pool = ConnectionPool()
@@ -0,0 +1,227 @@
+import threading
+import time
+from collections import deque
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional, Tuple, Union
+from urllib.parse import urlsplit
+from config.settings import config
+
+# Respuestas que indican que el upstream está saturado
+OVERLOAD_STATUSES = (429, 503)
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Convierte una cabecera Retry-After (segundos o fecha HTTP) en segundos"""
+    if not value:
+        return None
+    try:
+        seconds = float(value)
+    except ValueError:
+        try:
+            retry_at = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        seconds = (retry_at - datetime.now(timezone.utc)).total_seconds()
+    return min(max(seconds, 0.0), config.RETRY_AFTER_MAX)
+
+class TokenBucket:
+    """Limita la tasa de peticiones: ``rate`` por segundo con ráfagas de ``burst``"""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.capacity = max(burst, 1)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self.throttled = 0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Bloquea hasta obtener un token"""
+        waited = False
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait_time = (1 - self.tokens) / self.rate
+                if not waited:
+                    self.throttled += 1
+                    waited = True
+            time.sleep(wait_time)
+
+class AdaptiveConcurrencyLimit:
+    """Límite de concurrencia AIMD para un host.
+
+    Sube el límite de forma aditiva (~+1 por ventana completa) mientras la
+    latencia se mantiene cerca de la mínima observada, y lo reduce de forma
+    multiplicativa cuando la fracción de respuestas de sobrecarga (429/503,
+    timeouts) en las últimas peticiones supera ``error_threshold``. Un 429
+    reduce siempre. Las reducciones se espacian al menos una latencia mínima
+    para no reaccionar varias veces al mismo episodio.
+    """
+
+    def __init__(self, initial: int, minimum: int, maximum: int,
+                 backoff_ratio: float, latency_tolerance: float,
+                 error_threshold: float, window: int = 50):
+        self.limit = float(initial)
+        self.minimum = minimum
+        self.maximum = maximum
+        self.backoff_ratio = backoff_ratio
+        self.latency_tolerance = latency_tolerance
+        self.error_threshold = error_threshold
+        self.in_flight = 0
+        self.min_latency: Optional[float] = None
+        self.outcomes = deque(maxlen=window)
+        self.decreases = 0
+        self._last_decrease = 0.0
+        self._condition = threading.Condition()
+
+    def acquire(self, blocked_until=lambda: 0.0):
+        """Espera un hueco dentro del límite (y a que pase cualquier Retry-After)"""
+        with self._condition:
+            while True:
+                pause = blocked_until() - time.monotonic()
+                if pause > 0:
+                    self._condition.wait(pause)
+                elif self.in_flight < int(self.limit):
+                    self.in_flight += 1
+                    return
+                else:
+                    self._condition.wait(0.5)
+
+    def release(self, latency: float, status_code: Optional[int]):
+        """Libera el hueco y ajusta el límite según el resultado"""
+        overloaded = status_code is None or status_code in OVERLOAD_STATUSES
+        now = time.monotonic()
+
+        with self._condition:
+            self.in_flight -= 1
+            self.outcomes.append(overloaded)
+
+            if overloaded:
+                error_rate = sum(self.outcomes) / len(self.outcomes)
+                cooldown = self.min_latency or latency
+                if ((status_code == 429 or error_rate > self.error_threshold)
+                        and now - self._last_decrease > cooldown):
+                    self.limit = max(self.minimum, self.limit * self.backoff_ratio)
+                    self._last_decrease = now
+                    self.decreases += 1
+            else:
+                if self.min_latency is None or latency < self.min_latency:
+                    self.min_latency = latency
+                if latency <= self.min_latency * self.latency_tolerance:
+                    self.limit = min(self.maximum, self.limit + 1 / self.limit)
+
+            self._condition.notify_all()
+
+Permit = Tuple[str, float]
+
+class RequestLimiter:
+    """Control de tasa y concurrencia previo a cada petición.
+
+    - Token buckets por prefijo (``RATE_LIMITS``): la clave puede ser una
+      ruta (``"/users"``) o una URL (``"https://api.example.com/users"``);
+      se aplica la coincidencia más larga.
+    - Concurrencia adaptativa por host (``ADAPTIVE_CONCURRENCY``).
+    - ``Retry-After``: pausa todas las peticiones al host hasta la fecha
+      indicada por el servidor.
+    """
+
+    def __init__(self):
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._adaptive: Dict[str, AdaptiveConcurrencyLimit] = {}
+        self._blocked_until: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, url: str) -> Permit:
+        """Espera permiso para lanzar una petición a ``url``"""
+        parts = urlsplit(url)
+        host = parts.netloc
+
+        bucket = self._bucket_for(url, parts.path)
+        if bucket is not None:
+            bucket.acquire()
+
+        if config.ADAPTIVE_CONCURRENCY:
+            self._adaptive_for(host).acquire(lambda: self._blocked_until.get(host, 0.0))
+        else:
+            pause = self._blocked_until.get(host, 0.0) - time.monotonic()
+            if pause > 0:
+                time.sleep(pause)
+
+        return host, time.monotonic()
+
+    def release(self, permit: Permit, status_code: Optional[int] = None,
+                retry_after: Optional[float] = None):
+        """Registra el resultado de la petición autorizada con ``permit``"""
+        host, started = permit
+
+        if retry_after:
+            with self._lock:
+                until = time.monotonic() + retry_after
+                self._blocked_until[host] = max(self._blocked_until.get(host, 0.0), until)
+
+        if config.ADAPTIVE_CONCURRENCY:
+            self._adaptive_for(host).release(time.monotonic() - started, status_code)
+
+    def _bucket_for(self, url: str, path: str) -> Optional[TokenBucket]:
+        """Token bucket del prefijo más largo que coincide (o None)"""
+        best = None
+        for prefix in config.RATE_LIMITS:
+            target = url if "://" in prefix else path
+            if target.startswith(prefix) and (best is None or len(prefix) > len(best)):
+                best = prefix
+        if best is None:
+            return None
+
+        with self._lock:
+            if best not in self._buckets:
+                rate, burst = self._limit_spec(config.RATE_LIMITS[best])
+                self._buckets[best] = TokenBucket(rate, burst)
+            return self._buckets[best]
+
+    @staticmethod
+    def _limit_spec(spec: Union[float, Tuple[float, int]]) -> Tuple[float, int]:
+        if isinstance(spec, (tuple, list)):
+            return float(spec[0]), int(spec[1])
+        return float(spec), config.RATE_LIMIT_BURST
+
+    def _adaptive_for(self, host: str) -> AdaptiveConcurrencyLimit:
+        limiter = self._adaptive.get(host)
+        if limiter is None:
+            with self._lock:
+                limiter = self._adaptive.setdefault(host, AdaptiveConcurrencyLimit(
+                    initial=config.ADAPTIVE_INITIAL_CONCURRENCY,
+                    minimum=config.ADAPTIVE_MIN_CONCURRENCY,
+                    maximum=config.ADAPTIVE_MAX_CONCURRENCY,
+                    backoff_ratio=config.ADAPTIVE_BACKOFF_RATIO,
+                    latency_tolerance=config.ADAPTIVE_LATENCY_TOLERANCE,
+                    error_threshold=config.ADAPTIVE_ERROR_THRESHOLD
+                ))
+        return limiter
+
+    def stats(self) -> Dict[str, Any]:
+        """Estado de los limitadores"""
+        now = time.monotonic()
+        return {
+            "rate_limits": {
+                prefix: {"rate": bucket.rate, "tokens": round(bucket.tokens, 2),
+                         "throttled": bucket.throttled}
+                for prefix, bucket in list(self._buckets.items())
+            },
+            "adaptive": {
+                host: {"limit": round(limiter.limit, 2), "in_flight": limiter.in_flight,
+                       "decreases": limiter.decreases,
+                       "min_latency_ms": round((limiter.min_latency or 0) * 1000, 1)}
+                for host, limiter in list(self._adaptive.items())
+            },
+            "paused_hosts": {
+                host: round(until - now, 2)
+                for host, until in list(self._blocked_until.items()) if until > now
+            }
+        }
+
+request_limiter = RequestLimiter()
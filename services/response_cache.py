@@ -0,0 +1,142 @@
+import json
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Optional, Set, Tuple
+from config.settings import config
+
+# loader(etag) -> (resultado o None si el servidor respondió 304, etag)
+Loader = Callable[[Optional[str]], Tuple[Optional[Dict[str, Any]], Optional[str]]]
+
+def cache_key(url: str, params: Optional[Dict] = None,
+              headers: Optional[Dict] = None) -> Tuple[str, str, str]:
+    """Clave de caché de un GET: URL + parámetros + cabeceras (p. ej. Authorization)"""
+    return (
+        url,
+        json.dumps(params, sort_keys=True, default=str) if params else "",
+        json.dumps(headers, sort_keys=True, default=str) if headers else ""
+    )
+
+@dataclass
+class CacheEntry:
+    result: Dict[str, Any]
+    etag: Optional[str]
+    expires: float
+
+@dataclass
+class _Flight:
+    """Petición en vuelo compartida por los GET idénticos concurrentes"""
+    done: threading.Event = field(default_factory=threading.Event)
+    result: Optional[Dict[str, Any]] = None
+    failed: bool = False
+
+class ResponseCache:
+    """Caché LRU con TTL para respuestas de GET.
+
+    - Una entrada vigente se sirve sin tocar la red (``hit``).
+    - Una entrada caducada con ETag se revalida con ``If-None-Match``; un
+      304 la renueva (``revalidated``).
+    - Single-flight: mientras un GET está en vuelo, los idénticos esperan su
+      respuesta en vez de lanzar otra petición (``coalesced``). Si la
+      petición compartida falla, cada una lo intenta por su cuenta.
+    """
+
+    def __init__(self, ttl: float = None, max_entries: int = None):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple, CacheEntry]" = OrderedDict()
+        self._by_url: Dict[str, Set[Tuple]] = {}
+        self._inflight: Dict[Tuple, _Flight] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.revalidated = 0
+        self.evictions = 0
+
+    def fetch(self, key: Tuple, loader: Loader) -> Tuple[Dict[str, Any], str]:
+        """Devuelve (resultado, origen) sirviendo de caché o llamando a ``loader``"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return dict(entry.result), "hit"
+
+            flight = self._inflight.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._inflight[key] = _Flight()
+                self.misses += 1
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            flight.done.wait()
+            if not flight.failed:
+                return dict(flight.result), "coalesced"
+            result, _ = loader(None)
+            return result, "miss"
+
+        try:
+            result, etag = loader(entry.etag if entry is not None else None)
+            source = "miss"
+            if result is None:
+                result, etag, source = entry.result, etag or entry.etag, "revalidated"
+            self._store(key, result, etag, revalidated=source == "revalidated")
+            flight.result = result
+            return dict(result), source
+        except BaseException:
+            flight.failed = True
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            flight.done.set()
+
+    def _store(self, key: Tuple, result: Dict[str, Any], etag: Optional[str],
+               revalidated: bool = False):
+        ttl = self.ttl if self.ttl is not None else config.RESPONSE_CACHE_TTL
+        max_entries = self.max_entries or config.RESPONSE_CACHE_MAX_ENTRIES
+
+        with self._lock:
+            if revalidated:
+                self.revalidated += 1
+            self._entries[key] = CacheEntry(result, etag, time.monotonic() + ttl)
+            self._entries.move_to_end(key)
+            self._by_url.setdefault(key[0], set()).add(key)
+            while len(self._entries) > max_entries:
+                evicted, _ = self._entries.popitem(last=False)
+                self._forget(evicted)
+                self.evictions += 1
+
+    def _forget(self, key: Tuple):
+        keys = self._by_url.get(key[0])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._by_url[key[0]]
+
+    def invalidate(self, url: str = None):
+        """Descarta las entradas de ``url`` (o todas)"""
+        with self._lock:
+            if url is None:
+                self._entries.clear()
+                self._by_url.clear()
+                return
+            for key in self._by_url.pop(url, ()):
+                self._entries.pop(key, None)
+
+    def stats(self) -> Dict[str, int]:
+        """Contadores de la caché"""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "revalidated": self.revalidated,
+            "evictions": self.evictions,
+            "entries": len(self._entries)
+        }
+
+response_cache = ResponseCache()
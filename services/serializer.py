@@ -0,0 +1,54 @@
+import json
+from typing import Any, Union
+from config.settings import config
+
+try:
+    import orjson  # opcional: codificación JSON rápida
+except ImportError:
+    orjson = None
+
+class JSONSerializer:
+    """Serializador JSON de la librería estándar (compacto, ``default=str``)"""
+
+    name = "json"
+
+    def dumps(self, obj: Any) -> bytes:
+        return json.dumps(obj, default=str, separators=(",", ":")).encode("utf-8")
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        return json.loads(data)
+
+class OrjsonSerializer(JSONSerializer):
+    """Serializador basado en orjson.
+
+    Lo que orjson no admite (enteros de más de 64 bits, tipos raros sin
+    ``default``) se codifica con la librería estándar, así que el resultado
+    es siempre JSON válido.
+    """
+
+    name = "orjson"
+    _OPTIONS = orjson.OPT_NON_STR_KEYS if orjson is not None else 0
+
+    def dumps(self, obj: Any) -> bytes:
+        try:
+            return orjson.dumps(obj, default=str, option=self._OPTIONS)
+        except TypeError:
+            return super().dumps(obj)
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        return orjson.loads(data)
+
+def create_serializer(name: str = None) -> JSONSerializer:
+    """Serializador según JSON_SERIALIZER ("auto" usa orjson si está instalado)"""
+    name = name or config.JSON_SERIALIZER
+    if name == "auto":
+        name = "orjson" if orjson is not None else "json"
+    if name == "json":
+        return JSONSerializer()
+    if name == "orjson":
+        if orjson is None:
+            raise ValueError("JSON_SERIALIZER 'orjson' requires the orjson package")
+        return OrjsonSerializer()
+    raise ValueError(f"Unsupported JSON serializer: {name}")
+
+serializer = create_serializer()
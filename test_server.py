@@ -1,4 +1,6 @@
 from flask import Flask, jsonify, request
+import hashlib
+import json
 import random
 import time
 from datetime import datetime
@@ -9,6 +11,11 @@ app = Flask(__name__)
 users_db = {str(i): {"id": i, "name": f"User {i}", "status": "inactive"} for i in range(100)}
 request_log = []
 
+def etag_for(record) -> str:
+    """ETag estable (entre reinicios) de un registro, aunque contenga listas o dicts"""
+    encoded = json.dumps(record, sort_keys=True, default=str).encode()
+    return f'"{hashlib.sha1(encoded).hexdigest()}"'
+
 @app.route('/users/<user_id>', methods=['GET'])
 def get_user(user_id):
     """Endpoint GET de prueba"""
@@ -27,7 +34,11 @@ def get_user(user_id):
         return jsonify({"error": "Service temporarily unavailable"}), 503
 
     if user_id in users_db:
-        return jsonify(users_db[user_id]), 200
+        # ETag para revalidación condicional (If-None-Match -> 304)
+        etag = etag_for(users_db[user_id])
+        if request.headers.get("If-None-Match") == etag:
+            return "", 304, {"ETag": etag}
+        return jsonify(users_db[user_id]), 200, {"ETag": etag}
     return jsonify({"error": "User not found"}), 404
 
 @app.route('/users/<user_id>', methods=['PATCH'])
@@ -75,6 +86,64 @@ def create_user():
 
     return jsonify(users_db[user_id]), 201
 
+@app.route('/users', methods=['GET'])
+def get_users():
+    """Endpoint GET multi-ID de prueba: /users?ids=1,2,3"""
+    time.sleep(random.uniform(0.1, 0.3))
+
+    ids = [user_id for user_id in request.args.get("ids", "").split(",") if user_id]
+
+    request_log.append({
+        "timestamp": datetime.now().isoformat(),
+        "method": "GET",
+        "endpoint": "/users",
+        "ids": len(ids)
+    })
+
+    if random.random() < 0.1:
+        return jsonify({"error": "Service temporarily unavailable"}), 503
+
+    return jsonify({"items": {user_id: users_db[user_id] for user_id in ids if user_id in users_db}}), 200
+
+@app.route('/users/bulk', methods=['POST'])
+def bulk_users():
+    """Endpoint bulk de prueba: array de operaciones {method, path, body}"""
+    time.sleep(random.uniform(0.1, 0.3))
+
+    operations = request.get_json()
+
+    request_log.append({
+        "timestamp": datetime.now().isoformat(),
+        "method": "POST",
+        "endpoint": "/users/bulk",
+        "operations": len(operations)
+    })
+
+    results = []
+    for operation in operations:
+        # Fallo parcial simulado por operación
+        if random.random() < 0.1:
+            results.append({"status": 503, "body": {"error": "Service temporarily unavailable"}})
+            continue
+
+        body = operation.get("body") or {}
+        if operation["method"] == "POST" and operation["path"] == "/users":
+            user_id = str(len(users_db))
+            users_db[user_id] = {"id": user_id, **body}
+            results.append({"status": 201, "body": users_db[user_id]})
+            continue
+
+        user_id = operation["path"].rsplit("/", 1)[-1]
+        if operation["method"] == "PATCH" and user_id in users_db:
+            users_db[user_id].update(body)
+            results.append({"status": 200, "body": users_db[user_id]})
+        elif user_id in users_db:
+            results.append({"status": 405, "body": {"error": "Method not allowed"}})
+        else:
+            results.append({"status": 404, "body": {"error": "User not found"}})
+
+    return jsonify(results), 200
+
 @app.route('/stats', methods=['GET'])
 def get_stats():
     """Endpoint para ver estadísticas del servidor"""
@@ -0,0 +1,108 @@
+#!/usr/bin/env python
+"""
+Pruebas del logging asíncrono y del muestreo por tarea (no requieren el servidor de prueba)
+"""
+
+import os
+import sys
+import logging
+import subprocess
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from log_system.async_handler import AsyncLogDispatcher
+from log_system.logger import TransactionLogger, sampled
+from config.settings import config
+
+def file_handler(path: Path) -> logging.FileHandler:
+    handler = logging.FileHandler(path, delay=True)
+    handler.setFormatter(logging.Formatter("%(levelname)s %(message)s"))
+    return handler
+
+def test_dispatcher_writes_in_order():
+    """Los mensajes diferidos y los LogRecord se escriben en orden al hacer flush"""
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "app.log"
+        target = file_handler(path)
+        dispatcher = AsyncLogDispatcher(flush_interval=10)
+        dispatcher.start()
+
+        for i in range(1000):
+            dispatcher.log(target, "app", logging.INFO, "line %d", (i,))
+        logging_logger = logging.getLogger("test-async-dispatcher")
+        logging_logger.addHandler(dispatcher.handler(target))
+        logging_logger.warning("last %s", "line")
+
+        assert dispatcher.flush(timeout=5)
+        lines = path.read_text().splitlines()
+        assert lines[0] == "INFO line 0"
+        assert lines[999] == "INFO line 999"
+        assert lines[-1] == "WARNING last line"
+
+        dispatcher.close()
+        target.close()
+        assert not dispatcher.is_alive()
+
+def test_drop_backpressure():
+    """Con el buffer lleno y "drop" se descartan mensajes y se cuentan"""
+    dispatcher = AsyncLogDispatcher(buffer_size=10, backpressure="drop")
+    target = logging.StreamHandler()
+    for i in range(15):
+        dispatcher.log(target, "app", logging.INFO, "line %d", (i,))
+    assert len(dispatcher.buffer) == 10
+    assert dispatcher.dropped == 5
+
+class CapturingLogger(TransactionLogger):
+    """TransactionLogger sin ficheros: guarda las líneas formateadas"""
+
+    def __init__(self):
+        self.lines = []
+
+    def _log(self, level: int, message: str, args: tuple):
+        self.lines.append(message % args)
+
+def test_task_sampling():
+    """El muestreo es por tarea: todas las líneas de una tarea o ninguna"""
+    original = config.LOG_TASK_SAMPLE_RATE
+    try:
+        config.LOG_TASK_SAMPLE_RATE = 0.1
+        logger = CapturingLogger()
+        task_ids = [f"task-{i}" for i in range(2000)]
+        for task_id in task_ids:
+            logger.task_info(task_id, "Task %s queued", task_id)
+            logger.task_info(task_id, "Task %s completed", task_id)
+
+        sampled = {line.split()[1] for line in logger.lines}
+        assert 100 < len(sampled) < 300
+        assert len(logger.lines) == 2 * len(sampled)
+
+        config.LOG_TASK_SAMPLE_RATE = 0
+        logger.lines.clear()
+        logger.task_info("task-1", "Task %s queued", "task-1")
+        logger.info("Batch %s done", "b1")
+        assert logger.lines == ["Batch b1 done"]
+    finally:
+        config.LOG_TASK_SAMPLE_RATE = original
+
+def test_stable_sampling():
+    """La fracción muestreada respeta rate y no depende de PYTHONHASHSEED"""
+    task_ids = [f"task-{i}" for i in range(4000)]
+    assert 1400 < sum(sampled(task_id, 0.4) for task_id in task_ids) < 1800
+    assert 300 < sum(sampled(task_id, 0.1) for task_id in task_ids) < 500
+
+    here = [task_id for task_id in task_ids[:200] if sampled(task_id, 0.3)]
+    script = ("from log_system.logger import sampled; "
+              "print(','.join(f'task-{i}' for i in range(200) if sampled(f'task-{i}', 0.3)))")
+    output = subprocess.run([sys.executable, "-c", script], cwd=Path(__file__).resolve().parent.parent,
+                            env={**os.environ, "PYTHONHASHSEED": "12345"},
+                            capture_output=True, text=True, check=True).stdout
+    assert output.strip().split(",") == here
+
+if __name__ == "__main__":
+    test_dispatcher_writes_in_order()
+    test_drop_backpressure()
+    test_task_sampling()
+    test_stable_sampling()
+    print("✅ Pruebas del logging asíncrono completadas")
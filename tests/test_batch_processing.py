@@ -5,6 +5,7 @@ Script de prueba para el sistema de procesamiento por lotes
 
 import sys
 import os
+import tempfile
 from pathlib import Path
 
 # Añadir el directorio padre al path de Python
@@ -17,8 +18,13 @@ sys.path.insert(0, str(parent_dir))
 
 # Ahora sí importar los módulos
 from core.batch_processor import BatchProcessor
+from core.async_batch_processor import AsyncBatchProcessor
+from core.process_pool_processor import ProcessPoolBatchProcessor
+from core.cluster import ClusterCoordinator
 from models.task import Task, HTTPMethod
+from models.task_batch import TaskBatch
 from log_system.logger import logger
+from log_system.transaction_writer import iter_transactions
 from config.settings import config
 import requests
 import time
@@ -159,6 +165,10 @@ def test_high_volume():
         print(f"📊 Rendimiento: {len(tasks)/elapsed_time:.1f} tareas/segundo")
         print(f"📊 Tasa de éxito: {stats['success_rate']:.1f}%")
 
+        latency = stats["latency_ms"]["processing"]
+        print(f"📊 Latencia: p50 {latency['p50']:.0f} ms, p99 {latency['p99']:.0f} ms, max {latency['max']:.0f} ms")
+        print(f"📊 Intentos: {stats['attempts']}")
+
     finally:
         processor.stop()
 
@@ -219,10 +229,244 @@ def test_error_handling():
     finally:
         processor.stop()
 
+def test_async_engine():
+    """Prueba el motor asyncio con muchas peticiones simultáneas"""
+    print("\\n" + "="*60)
+    print("TEST 4: Motor Asyncio")
+    print("="*60)
+
+    config.API_BASE_URL = "http://localhost:5000"
+
+    processor = AsyncBatchProcessor(max_in_flight=50)
+    processor.start()
+
+    try:
+        tasks = [
+            Task(method=HTTPMethod.GET, endpoint=f"/users/{i % 10}")
+            for i in range(50)
+        ]
+
+        print(f"\\n⚙️  Procesando {len(tasks)} tareas con {processor.max_in_flight} peticiones en vuelo...")
+        start_time = time.time()
+
+        results = processor.process_batch_sync(tasks)
+
+        elapsed_time = time.time() - start_time
+
+        stats = processor.get_statistics()
+        print(f"\\n✅ Procesamiento completado en {elapsed_time:.2f} segundos")
+        print(f"📊 Rendimiento: {len(tasks)/elapsed_time:.1f} tareas/segundo")
+        print(f"📊 Tasa de éxito: {stats['success_rate']:.1f}%")
+
+        assert len(results) == len(tasks)
+        assert stats["in_flight"] == 0
+
+    finally:
+        processor.stop()
+
+def test_concurrent_batches():
+    """Prueba batches independientes sobre el mismo procesador"""
+    print("\\n" + "="*60)
+    print("TEST 5: Batches Concurrentes con BatchHandle")
+    print("="*60)
+
+    config.API_BASE_URL = "http://localhost:5000"
+
+    processor = BatchProcessor(num_workers=4)
+    processor.start()
+
+    try:
+        batch_a = [Task(method=HTTPMethod.GET, endpoint=f"/users/{i}") for i in range(6)]
+        batch_b = [Task(method=HTTPMethod.GET, endpoint=f"/users/{i}") for i in range(6, 9)]
+
+        handle_a = processor.submit_batch(batch_a)
+        handle_b = processor.submit_batch(batch_b)
+
+        print("\\n📋 Batch B según terminan:")
+        for task in handle_b.as_completed(timeout=60):
+            print(f"  - {task.method.value} {task.endpoint} - {task.status.value}")
+
+        results_a = handle_a.results(timeout=60)
+        results_b = handle_b.results(timeout=60)
+
+        print(f"\\n📊 Batch A: {len(results_a)} tareas, Batch B: {len(results_b)} tareas")
+
+        assert [t.task_id for t in results_a] == [t.task_id for t in batch_a]
+        assert [t.task_id for t in results_b] == [t.task_id for t in batch_b]
+        assert handle_a.done() and handle_b.done()
+
+    finally:
+        processor.stop()
+
+def test_streaming_results():
+    """Prueba el modo streaming sin retener resultados en memoria"""
+    print("\\n" + "="*60)
+    print("TEST 6: Resultados en Streaming")
+    print("="*60)
+
+    config.API_BASE_URL = "http://localhost:5000"
+
+    processor = BatchProcessor(num_workers=3, retention="none")
+    processor.start()
+
+    try:
+        tasks = [Task(method=HTTPMethod.GET, endpoint=f"/users/{i}") for i in range(10)]
+
+        stream = processor.stream_results(timeout=60)
+        processor.submit_batch(tasks)
+
+        received = []
+        for task in stream:
+            received.append(task)
+            print(f"  - {task.method.value} {task.endpoint} - {task.status.value}")
+            if len(received) == len(tasks):
+                break
+
+        stats = processor.get_statistics()
+        print(f"\\n📊 Recibidas: {len(received)}, retenidas en memoria: {len(processor.get_results())}")
+
+        assert {t.task_id for t in received} == {t.task_id for t in tasks}
+        assert processor.get_results() == []
+        assert stats["total_processed"] == len(tasks)
+
+    finally:
+        processor.stop()
+
+def test_process_pool():
+    """Prueba el modo multiproceso: varios procesos comparten un mismo batch"""
+    print("\\n" + "="*60)
+    print("TEST 7: Modo Multiproceso")
+    print("="*60)
+
+    config.API_BASE_URL = "http://localhost:5000"
+
+    processor = ProcessPoolBatchProcessor(num_processes=2, concurrency=5)
+    processor.start()
+
+    try:
+        tasks = [Task(method=HTTPMethod.GET, endpoint=f"/users/{i % 10}") for i in range(40)]
+
+        print(f"\\n⚙️  Procesando {len(tasks)} tareas en {processor.num_processes} procesos...")
+        start_time = time.time()
+
+        results = processor.process_batch_sync(tasks, timeout=120)
+
+        elapsed_time = time.time() - start_time
+        stats = processor.get_statistics()
+        print(f"\\n✅ Procesamiento completado en {elapsed_time:.2f} segundos")
+        print(f"📊 Tasa de éxito: {stats['success_rate']:.1f}%")
+
+        assert results == tasks
+        assert all(task.completed_at is not None for task in results)
+        assert stats["total_processed"] == len(tasks)
+        assert stats["pending"] == 0
+
+    finally:
+        processor.stop()
+
+def test_cluster():
+    """Prueba el modo distribuido con un cluster local de dos nodos"""
+    print("\\n" + "="*60)
+    print("TEST 8: Cluster Distribuido")
+    print("="*60)
+
+    config.API_BASE_URL = "http://localhost:5000"
+    config.CLUSTER_HEARTBEAT_INTERVAL = 0.5
+
+    coordinator = ClusterCoordinator(port=0)
+    coordinator.start()
+
+    try:
+        coordinator.spawn_local_nodes(2, num_workers=5)
+        assert coordinator.wait_for_nodes(2, timeout=30)
+        tasks = [Task(method=HTTPMethod.GET, endpoint=f"/users/{i % 10}") for i in range(40)]
+
+        print(f"\\n⚙️  Procesando {len(tasks)} tareas en 2 nodos ({coordinator.url})...")
+        results = coordinator.process_batch_sync(tasks, timeout=120)
+
+        time.sleep(1)
+        stats = coordinator.get_statistics()
+        print(f"📊 Tasa de éxito: {stats['success_rate']:.1f}%")
+        for node_id, node in stats["nodes"].items():
+            print(f"  - {node_id}: {node['completed']} tareas")
+
+        assert results == tasks
+        assert stats["total_processed"] == len(tasks)
+        assert stats["leased"] == 0
+
+    finally:
+        coordinator.stop()
+
+def test_task_batch():
+    """Prueba un TaskBatch columnar (las tareas se materializan por bloques)"""
+    print("\\n" + "="*60)
+    print("TEST 9: TaskBatch Compacto")
+    print("="*60)
+
+    processor = BatchProcessor(num_workers=10, retention="none")
+    processor.start()
+
+    try:
+        batch = TaskBatch(headers={"Authorization": "Bearer token123"})
+        for i in range(200):
+            batch.append(HTTPMethod.GET, f"/users/{i % 10}")
+
+        print(f"\\n⚙️  Procesando TaskBatch de {len(batch)} tareas ({batch.nbytes()} bytes en columnas)...")
+        handle = processor.submit_task_batch(batch, chunk_size=50)
+        assert handle.wait(timeout=120)
+
+        stats = processor.get_statistics()
+        print(f"📊 Terminadas: {handle.completed}, fallidas: {handle.failed}")
+        assert handle.completed == len(batch)
+        assert stats["total_processed"] == len(batch)
+        assert not processor.batch_handles
+
+    finally:
+        processor.stop()
+
+def test_stage_timings():
+    """Prueba los tiempos por etapa y la exportación a Chrome Trace"""
+    print("\\n" + "="*60)
+    print("TEST 10: Tiempos por Etapa")
+    print("="*60)
+
+    config.API_BASE_URL = "http://localhost:5000"
+
+    saved = config.TRACE_ENABLED
+    config.TRACE_ENABLED = True
+    try:
+        processor = BatchProcessor(num_workers=5)
+    finally:
+        config.TRACE_ENABLED = saved
+    processor.start()
+
+    try:
+        tasks = [Task(method=HTTPMethod.GET, endpoint=f"/users/{i}") for i in range(10)]
+        processor.submit_batch(tasks).wait(timeout=120)
+
+        stages = processor.get_statistics()["stages_ms"]
+        print(f"\\n⏱️  Tareas trazadas: {stages['traced']}")
+        for name, summary in stages["stages"].items():
+            print(f"  - {name:<10} p50 {summary['p50']:8.2f} ms  p99 {summary['p99']:8.2f} ms")
+        assert stages["traced"] == len(tasks)
+        assert {"queue_wait", "request", "collect"} <= set(stages["stages"])
+        assert tasks[0].timings[0][0] == "enqueued" and tasks[0].timings[-1][0] == "collected"
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "trace.json")
+            assert processor.export_trace(path, format="chrome") == len(tasks)
+            with open(path) as f:
+                events = json.load(f)["traceEvents"]
+            print(f"💾 {len(events)} eventos exportados a Chrome Trace")
+            assert all(event["ph"] == "X" and event["dur"] >= 0 for event in events)
+
+    finally:
+        processor.stop()
+
 def check_logs():
     """Verifica que los logs se estén generando correctamente"""
     print("\\n" + "="*60)
-    print("TEST 4: Verificación de Logs")
+    print("TEST 11: Verificación de Logs")
     print("="*60)
 
     log_dir = Path("logs")
@@ -247,14 +491,16 @@ def check_logs():
         # Verificar transacciones
         trans_dir = log_dir / "transactions"
         if trans_dir.exists():
-            trans_files = list(trans_dir.glob("*.json"))
-            print(f"\\n  📁 transactions/: {len(trans_files)} archivos")
-
-            if trans_files:
-                # Mostrar una transacción de ejemplo
-                with open(trans_files[-1]) as f:
-                    transaction = json.load(f)
-                print(f"\\n  📋 Ejemplo de transacción ({trans_files[-1].name}):")
+            logger.flush_transactions()
+            segments = [p for p in trans_dir.glob("segment_*.jsonl*") if not p.name.endswith(".idx")]
+            transactions = list(iter_transactions(str(trans_dir)))
+            print(f"\\n  📁 transactions/: {len(segments)} segmentos, {len(transactions)} transacciones")
+
+            if transactions:
+                # Mostrar una transacción de ejemplo, buscada por task_id en el índice
+                found = logger.get_transactions(transactions[-1]["task_id"])
+                transaction = found[-1]
+                print(f"\\n  📋 Ejemplo de transacción (índice: {len(found)} entradas):")
                 print(f"     - Task ID: {transaction.get('task_id', 'N/A')[:8]}...")
                 print(f"     - Status: {transaction.get('status', 'N/A')}")
                 print(f"     - Timestamp: {transaction.get('timestamp', 'N/A')}")
@@ -282,6 +528,27 @@ def main():
         test_error_handling()
         time.sleep(2)
 
+        test_async_engine()
+        time.sleep(2)
+
+        test_concurrent_batches()
+        time.sleep(2)
+
+        test_streaming_results()
+        time.sleep(2)
+
+        test_process_pool()
+        time.sleep(2)
+
+        test_cluster()
+        time.sleep(2)
+
+        test_task_batch()
+        time.sleep(2)
+
+        test_stage_timings()
+        time.sleep(2)
+
         check_logs()
 
         # Ver estadísticas del servidor
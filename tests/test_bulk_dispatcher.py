@@ -0,0 +1,119 @@
+#!/usr/bin/env python
+"""
+Pruebas del empaquetado en peticiones bulk (no requieren el servidor de prueba)
+"""
+
+import sys
+import threading
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core.bulk_dispatcher import BulkDispatcher
+from core.queue_backend import MemoryQueueBackend
+from services.batch_adapter import BatchAdapter, JSONArrayBatchAdapter, MultiGetBatchAdapter, EndpointTemplate
+from core.batch_processor import BatchProcessor
+from models.task import Task, TaskStatus, HTTPMethod
+from config.settings import config
+
+def complete(bulk: Task, response):
+    bulk.status = TaskStatus.COMPLETED
+    bulk.attempts = 1
+    bulk.completed_at = datetime.now()
+    bulk.response_data = {"status_code": 200, "response": response}
+
+def test_endpoint_template():
+    """Las plantillas extraen los parámetros del endpoint"""
+    template = EndpointTemplate("/users/{id}")
+    assert template.match("/users/42") == {"id": "42"}
+    assert template.match("/users/42/orders") is None
+    assert template.match("/orders/42") is None
+
+def test_incomplete_adapter_rejected():
+    """Un adapter sin todos los métodos falla al crearlo, no al primer envío"""
+    class GroupOnly(BatchAdapter):
+        def group_key(self, task):
+            return task.endpoint
+
+    try:
+        GroupOnly()
+        assert False, "should have raised TypeError"
+    except TypeError:
+        pass
+
+def test_batch_size_and_partial_failure():
+    """Un grupo lleno se envía enseguida y la respuesta se reparte por tarea"""
+    task_queue = MemoryQueueBackend()
+    adapter = JSONArrayBatchAdapter("/users/{id}", "/users/bulk", methods=[HTTPMethod.PATCH])
+    dispatcher = BulkDispatcher([adapter], task_queue, threading.Event(), batch_size=3, linger=60)
+
+    tasks = [Task(method=HTTPMethod.PATCH, endpoint=f"/users/{i}", data={"n": i}) for i in range(3)]
+    assert not dispatcher.route(Task(method=HTTPMethod.GET, endpoint="/users/1"))
+    assert all(dispatcher.route(task) for task in tasks)
+
+    bulk = task_queue.get_nowait()
+    assert bulk.method == HTTPMethod.POST and bulk.endpoint == "/users/bulk"
+    assert [op["body"] for op in bulk.data] == [{"n": 0}, {"n": 1}, {"n": 2}]
+
+    complete(bulk, [{"status": 200, "body": {"id": 0}},
+                    {"status": 404, "body": {"error": "User not found"}},
+                    {"status": 200, "body": {"id": 2}}])
+    finished = dispatcher.expand(bulk)
+
+    assert finished == tasks
+    assert [task.status for task in tasks] == [TaskStatus.COMPLETED, TaskStatus.FAILED, TaskStatus.COMPLETED]
+    assert tasks[0].response_data["response"] == {"id": 0}
+    assert "404" in tasks[1].error_message
+    assert dispatcher.stats()["bulk_requests"] == 1
+
+def test_linger_flushes_partial_group():
+    """Un grupo incompleto sale al vencer la ventana de espera"""
+    task_queue = MemoryQueueBackend()
+    stop_event = threading.Event()
+    adapter = MultiGetBatchAdapter("/users/{id}", "/users")
+    dispatcher = BulkDispatcher([adapter], task_queue, stop_event, batch_size=100, linger=0.05)
+    dispatcher.start()
+
+    try:
+        tasks = [Task(method=HTTPMethod.GET, endpoint=f"/users/{i % 2}") for i in range(3)]
+        for task in tasks:
+            dispatcher.route(task)
+
+        bulk = task_queue.get(timeout=2)
+        assert bulk.data == {"ids": "0,1"}
+
+        complete(bulk, {"items": {"0": {"id": 0}}})
+        dispatcher.expand(bulk)
+        assert [task.status for task in tasks] == [TaskStatus.COMPLETED, TaskStatus.FAILED, TaskStatus.COMPLETED]
+    finally:
+        stop_event.set()
+        dispatcher.stop()
+        dispatcher.join(timeout=2)
+
+def test_stop_fails_lingering_groups():
+    """Al parar, las tareas que esperaban su grupo fallan y el handle termina"""
+    saved = config.BATCH_LINGER
+    config.BATCH_LINGER = 60
+    processor = BatchProcessor(num_workers=1, retention="none",
+                               batch_adapters=[MultiGetBatchAdapter("/users/{id}", "/users")])
+    processor.start()
+    try:
+        handle = processor.submit_batch([Task(method=HTTPMethod.GET, endpoint=f"/users/{i}") for i in range(3)])
+        assert processor.bulk_dispatcher.stats()["lingering"] == 3
+    finally:
+        processor.stop()
+        config.BATCH_LINGER = saved
+
+    assert handle.wait(timeout=5)
+    assert all(task.status == TaskStatus.FAILED for task in handle.tasks)
+    assert "stopped" in handle.tasks[0].error_message
+    assert not processor.bulk_dispatcher.route(Task(method=HTTPMethod.GET, endpoint="/users/9"))
+
+if __name__ == "__main__":
+    test_endpoint_template()
+    test_incomplete_adapter_rejected()
+    test_batch_size_and_partial_failure()
+    test_linger_flushes_partial_group()
+    test_stop_fails_lingering_groups()
+    print("✅ Pruebas del empaquetado bulk completadas")
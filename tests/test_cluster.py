@@ -0,0 +1,160 @@
+#!/usr/bin/env python
+"""
+Pruebas del coordinador del modo distribuido (no requieren el servidor de prueba)
+"""
+
+import sys
+import dataclasses
+import time
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core.cluster import ClusterCoordinator
+from core.process_pool_processor import ProcessPoolBatchProcessor, apply_child_config
+from config.settings import config
+from models.task import Task, TaskStatus, HTTPMethod
+import requests
+
+def result_for(task_id: str) -> dict:
+    now = datetime.now().isoformat()
+    return {"task_id": task_id, "status": "completed", "attempts": 1, "started_at": now,
+            "completed_at": now, "error_message": None,
+            "response_data": {"status_code": 200, "response": {"ok": True}}}
+
+def test_expired_lease_is_redispatched():
+    """Las tareas de un nodo que deja de latir pasan a otro; el primer resultado gana"""
+    coordinator = ClusterCoordinator(port=0, lease_timeout=0.5)
+    coordinator.start()
+
+    try:
+        tasks = [Task(method=HTTPMethod.GET, endpoint=f"/users/{i}") for i in range(3)]
+        handle = coordinator.submit_batch(tasks)
+
+        lease_a = requests.post(f"{coordinator.url}/lease",
+                                json={"node_id": "a", "max_tasks": 10, "wait": 0}).json()
+        assert len(lease_a["tasks"]) == 3
+        assert coordinator.get_statistics()["leased"] == 3
+
+        # "a" no envía heartbeats: su lease vence y las tareas vuelven a la cola
+        time.sleep(1.2)
+        stats = coordinator.get_statistics()
+        assert stats["redispatched"] == 3
+        assert stats["nodes"]["a"]["alive"] is False
+
+        lease_b = requests.post(f"{coordinator.url}/lease",
+                                json={"node_id": "b", "max_tasks": 10, "wait": 0}).json()
+        assert len(lease_b["tasks"]) == 3
+
+        requests.post(f"{coordinator.url}/results",
+                      json={"node_id": "b", "results": [result_for(t.task_id) for t in tasks]})
+        results = handle.results(timeout=2)
+        assert all(task.status == TaskStatus.COMPLETED for task in results)
+        assert results[0].response_data["response"] == {"ok": True}
+
+        # El nodo "a" reaparece y reporta tarde: se ignora
+        reply = requests.post(f"{coordinator.url}/results",
+                              json={"node_id": "a", "results": [result_for(tasks[0].task_id)]}).json()
+        assert reply["accepted"] == 0
+
+        stats = coordinator.get_statistics()
+        assert stats["total_processed"] == 3
+        assert stats["duplicates"] == 1
+        assert stats["nodes"]["a"]["alive"] is True
+
+    finally:
+        coordinator.stop()
+
+def test_heartbeat_keeps_lease():
+    """Un nodo que envía heartbeats conserva sus tareas"""
+    coordinator = ClusterCoordinator(port=0, lease_timeout=0.5)
+    coordinator.start()
+
+    try:
+        coordinator.add_batch([Task(method=HTTPMethod.GET, endpoint="/users/1")])
+        requests.post(f"{coordinator.url}/lease", json={"node_id": "a", "max_tasks": 10, "wait": 0})
+
+        for _ in range(4):
+            time.sleep(0.25)
+            requests.post(f"{coordinator.url}/heartbeat",
+                          json={"node_id": "a", "stats": {"in_flight": 1}})
+
+        stats = coordinator.get_statistics()
+        assert stats["redispatched"] == 0
+        assert stats["leased"] == 1
+        assert stats["in_flight"] == 1
+
+        reply = requests.post(f"{coordinator.url}/lease",
+                              json={"node_id": "b", "max_tasks": 10, "wait": 0}).json()
+        assert reply["tasks"] == []
+
+    finally:
+        coordinator.stop()
+
+def test_idle_node_expires():
+    """Un nodo sin leases que deja de latir deja de contar como vivo"""
+    coordinator = ClusterCoordinator(port=0, lease_timeout=0.5)
+    coordinator.start()
+
+    try:
+        requests.post(f"{coordinator.url}/heartbeat", json={"node_id": "a", "stats": {"in_flight": 2}})
+        assert coordinator.get_statistics()["nodes"]["a"]["alive"] is True
+
+        time.sleep(1.2)
+        stats = coordinator.get_statistics()
+        assert stats["nodes"]["a"]["alive"] is False
+        assert stats["in_flight"] == 0
+    finally:
+        coordinator.stop()
+
+def test_child_config_overrides():
+    """Los nodos locales y procesos hijo no comparten journal, métricas ni ficheros de traza"""
+    saved = dataclasses.asdict(config)
+    try:
+        config.QUEUE_BACKEND = "sqlite"
+        config.METRICS_ENABLED = True
+        config.TRACE_EXPORT_PATH = "out/trace.json"
+        config.PROFILE_OUTPUT = ""
+        apply_child_config(dataclasses.asdict(config), "local-0")
+        assert config.QUEUE_BACKEND == "memory"
+        assert config.METRICS_ENABLED is False
+        assert config.TRACE_EXPORT_PATH == str(Path("out/trace.local-0.json"))
+        assert config.PROFILE_OUTPUT == ""
+    finally:
+        for name, value in saved.items():
+            setattr(config, name, value)
+
+def test_dead_child_fails_its_tasks():
+    """Si un proceso hijo muere, sus tareas fallan y el handle termina"""
+    saved = (config.API_BASE_URL, config.MAX_RETRIES, config.RETRY_DELAY, config.RETRY_MAX_DELAY)
+    # Puerto cerrado y backoff largo: el hijo se queda con las tareas esperando reintento
+    config.API_BASE_URL = "http://127.0.0.1:9"
+    config.MAX_RETRIES = 3
+    config.RETRY_DELAY = config.RETRY_MAX_DELAY = 600
+
+    processor = ProcessPoolBatchProcessor(num_processes=1, concurrency=2)
+    processor.stop()  # sin arrancar: no hace nada
+    processor.start()
+    try:
+        handle = processor.submit_batch([Task(method=HTTPMethod.GET, endpoint=f"/users/{i}") for i in range(5)])
+        deadline = time.monotonic() + 30
+        while len(processor.owners) < 5 and time.monotonic() < deadline:
+            time.sleep(0.05)
+        processor.processes[0].kill()
+
+        assert handle.wait(timeout=10)
+        assert all(task.status == TaskStatus.FAILED for task in handle.tasks)
+        assert "exited with code" in handle.tasks[0].error_message
+        assert processor.get_statistics()["pending"] == 0
+    finally:
+        processor.stop()
+        (config.API_BASE_URL, config.MAX_RETRIES, config.RETRY_DELAY, config.RETRY_MAX_DELAY) = saved
+
+if __name__ == "__main__":
+    test_expired_lease_is_redispatched()
+    test_heartbeat_keeps_lease()
+    test_idle_node_expires()
+    test_child_config_overrides()
+    test_dead_child_fails_its_tasks()
+    print("✅ Pruebas del coordinador distribuido completadas")
@@ -0,0 +1,66 @@
+#!/usr/bin/env python
+"""
+Pruebas del pool de conexiones compartido (usa un servidor HTTP local efímero)
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from services.connection_pool import ConnectionPool
+from config.settings import config
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import threading
+import time
+
+class KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        body = b'{"ok": true}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+def test_connections_are_reused_and_expire():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), KeepAliveHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}/health"
+
+    original_idle_timeout = config.POOL_IDLE_TIMEOUT
+    config.POOL_IDLE_TIMEOUT = 0.2
+    pool = ConnectionPool()
+
+    try:
+        session = pool.session()
+        assert pool.session() is session
+
+        for _ in range(10):
+            assert session.get(url, timeout=5).status_code == 200
+
+        stats = pool.stats()
+        assert stats["requests"] == 10
+        assert stats["opened"] == 1
+        assert stats["reused"] == 9
+
+        # Pasado el idle timeout la conexión se descarta y se abre otra
+        time.sleep(0.3)
+        session.get(url, timeout=5)
+        host_stats = next(iter(pool.stats()["hosts"].values()))
+        assert host_stats["idle_closed"] == 1
+        assert host_stats["opened"] == 2
+
+    finally:
+        config.POOL_IDLE_TIMEOUT = original_idle_timeout
+        pool.close()
+        server.shutdown()
+
+if __name__ == "__main__":
+    test_connections_are_reused_and_expire()
+    print("✅ Pruebas del pool de conexiones completadas")
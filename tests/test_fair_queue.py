@@ -0,0 +1,92 @@
+#!/usr/bin/env python
+"""
+Pruebas de la cola con prioridades y reparto justo (no requieren el servidor de prueba)
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core.queue_backend import FairMemoryQueueBackend, create_queue_backend
+from models.task import Task, HTTPMethod
+from config.settings import config
+
+def make_task(priority: int = 0, tenant: str = None, batch_id: str = None) -> Task:
+    return Task(method=HTTPMethod.GET, endpoint="/users/1",
+                priority=priority, tenant=tenant, batch_id=batch_id)
+
+def test_priority_first_and_sentinels():
+    """Las señales de parada salen antes que nada y luego la prioridad más alta"""
+    task_queue = FairMemoryQueueBackend()
+    backfill = [make_task(batch_id="backfill") for _ in range(100)]
+    task_queue.put_many(backfill)
+    urgent = make_task(priority=10, batch_id="urgent")
+    task_queue.put(urgent)
+    task_queue.put(None)
+
+    assert task_queue.qsize() == 102
+    assert task_queue.get_nowait() is None
+    assert task_queue.get_nowait() is urgent
+    assert task_queue.get_nowait() is backfill[0]
+
+    delays = task_queue.queue_delay_stats()
+    assert delays["10"]["count"] == 1 and delays["0"]["count"] == 1
+
+def test_round_robin_between_batches():
+    """Un batch pequeño no espera a que se vacíe uno grande de la misma prioridad"""
+    task_queue = FairMemoryQueueBackend()
+    task_queue.put_many([make_task(batch_id="big") for _ in range(1000)])
+    small = [make_task(batch_id="small") for _ in range(5)]
+    task_queue.put_many(small)
+
+    served = [task_queue.get_nowait() for _ in range(10)]
+    assert [task.batch_id for task in served] == ["big", "small"] * 5
+
+def test_tenant_weights():
+    """Un tenant con peso 3 recibe tres turnos por cada uno del resto"""
+    original = config.QUEUE_TENANT_WEIGHTS
+    config.QUEUE_TENANT_WEIGHTS = {"gold": 3.0}
+    try:
+        task_queue = FairMemoryQueueBackend()
+        task_queue.put_many([make_task(tenant="gold") for _ in range(30)])
+        task_queue.put_many([make_task(tenant="free") for _ in range(30)])
+
+        served = [task_queue.get_nowait().tenant for _ in range(40)]
+        assert served.count("gold") == 30
+        assert served.count("free") == 10
+    finally:
+        config.QUEUE_TENANT_WEIGHTS = original
+
+def test_non_positive_weights():
+    """Pesos <= 0 se rechazan al crear la cola; si cambian después, no bloquean el pop"""
+    original = config.QUEUE_TENANT_WEIGHTS
+    try:
+        config.QUEUE_TENANT_WEIGHTS = {"gold": 0.0}
+        try:
+            FairMemoryQueueBackend()
+            assert False, "should have raised ValueError"
+        except ValueError:
+            pass
+
+        config.QUEUE_TENANT_WEIGHTS = {}
+        task_queue = FairMemoryQueueBackend()
+        task_queue.put_many([make_task(tenant="gold"), make_task(tenant="free")])
+        config.QUEUE_TENANT_WEIGHTS = {"gold": 0.0, "free": -1.0}
+        served = [task_queue.get_nowait().tenant for _ in range(2)]
+        assert sorted(served) == ["free", "gold"]
+    finally:
+        config.QUEUE_TENANT_WEIGHTS = original
+
+def test_create_fair_backend():
+    """create_queue_backend respeta QUEUE_SCHEDULING"""
+    assert isinstance(create_queue_backend("memory", scheduling="fair"), FairMemoryQueueBackend)
+    assert not isinstance(create_queue_backend("memory", scheduling="fifo"), FairMemoryQueueBackend)
+
+if __name__ == "__main__":
+    test_priority_first_and_sentinels()
+    test_round_robin_between_batches()
+    test_tenant_weights()
+    test_non_positive_weights()
+    test_create_fair_backend()
+    print("✅ Pruebas de la cola con reparto justo completadas")
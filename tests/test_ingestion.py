@@ -0,0 +1,68 @@
+#!/usr/bin/env python
+"""
+Pruebas de la ingesta en streaming y los checkpoints (no requieren el servidor de prueba)
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core.ingestion import read_jsonl, read_csv, OffsetCheckpoint
+from models.task import HTTPMethod
+import json
+import os
+import tempfile
+
+def write_jsonl(path: str, count: int):
+    with open(path, "w") as f:
+        for i in range(count):
+            f.write(json.dumps({"method": "patch", "endpoint": f"/users/{i}", "data": {"n": i}}) + "\n")
+
+def test_read_jsonl_and_csv():
+    with tempfile.TemporaryDirectory() as directory:
+        jsonl_path = os.path.join(directory, "tasks.jsonl")
+        write_jsonl(jsonl_path, 3)
+        with open(jsonl_path, "rb") as f:
+            tasks = [task for task, _ in read_jsonl(f)]
+        assert [t.endpoint for t in tasks] == ["/users/0", "/users/1", "/users/2"]
+        assert tasks[2].method == HTTPMethod.PATCH and tasks[2].data == {"n": 2}
+
+        csv_path = os.path.join(directory, "tasks.csv")
+        with open(csv_path, "w") as f:
+            f.write('method,endpoint,data\nGET,/users/1,\nPOST,/users,"{""name"": ""x""}"\n')
+        with open(csv_path, "rb") as f:
+            tasks = [task for task, _ in read_csv(f)]
+        assert tasks[0].data is None
+        assert tasks[1].method == HTTPMethod.POST and tasks[1].data == {"name": "x"}
+
+def test_checkpoint_resume():
+    """El offset solo avanza hasta la primera tarea sin terminar"""
+    with tempfile.TemporaryDirectory() as directory:
+        input_path = os.path.join(directory, "tasks.jsonl")
+        checkpoint_path = os.path.join(directory, "tasks.checkpoint")
+        write_jsonl(input_path, 10)
+
+        checkpoint = OffsetCheckpoint(checkpoint_path, interval=0)
+        with open(input_path, "rb") as f:
+            read = list(read_jsonl(f))
+        for task, offset in read:
+            checkpoint.track(task, offset)
+
+        # Terminan 0-3 y 5-6; la 4 sigue en vuelo cuando "cae" el proceso
+        for i in [0, 1, 3, 2, 5, 6]:
+            checkpoint.task_done(read[i][0])
+        assert checkpoint.pending() == 6
+
+        resumed = OffsetCheckpoint(checkpoint_path)
+        assert resumed.committed == read[3][1]
+
+        with open(input_path, "rb") as f:
+            f.seek(resumed.committed)
+            remaining = [task.endpoint for task, _ in read_jsonl(f, resumed.committed)]
+        assert remaining == [f"/users/{i}" for i in range(4, 10)]
+
+if __name__ == "__main__":
+    test_read_jsonl_and_csv()
+    test_checkpoint_resume()
+    print("✅ Pruebas de ingesta completadas")
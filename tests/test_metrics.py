@@ -0,0 +1,106 @@
+#!/usr/bin/env python
+"""
+Pruebas del endpoint de métricas en formato Prometheus (no requieren el servidor de prueba)
+"""
+
+import sys
+import re
+import socket
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import requests
+from core.batch_processor import BatchProcessor
+from core.metrics import CONTENT_TYPE, render_metrics
+from core.statistics import LatencyHistogram
+from models.task import Task, HTTPMethod
+from config.settings import config
+
+SAMPLE = re.compile(r'^[a-z_]+(\{([a-z]+="[^"]*",?)+\})? -?[0-9.e+-]+$|^[a-z_]+(\{.*\})? \+Inf$')
+
+def parse(text: str):
+    """{(nombre, etiquetas): valor} de una exposición de texto"""
+    samples = {}
+    for line in text.splitlines():
+        if line.startswith("#"):
+            continue
+        assert SAMPLE.match(line), line
+        name_labels, value = line.rsplit(" ", 1)
+        samples[name_labels] = float(value)
+    return samples
+
+def test_cumulative_counts():
+    """Los buckets de Prometheus son acumulados y no decrecen"""
+    histogram = LatencyHistogram()
+    for value_ms in (0.5, 3, 3, 40, 900, 20000):
+        histogram.record(value_ms)
+    counts = histogram.cumulative_counts([1, 5, 50, 1000, 60000])
+    assert counts == [1, 3, 4, 5, 6]
+
+def test_metrics_endpoint():
+    """El endpoint expone cola, workers, errores por tipo, reintentos e histogramas"""
+    saved = (config.API_BASE_URL, config.MAX_RETRIES, config.RETRY_DELAY, config.METRICS_ENABLED, config.METRICS_PORT)
+    # Puerto cerrado: cada intento termina en un error de conexión
+    config.API_BASE_URL = "http://127.0.0.1:9"
+    config.MAX_RETRIES = 2
+    config.RETRY_DELAY = 0
+    config.METRICS_ENABLED = True
+    config.METRICS_PORT = 0
+
+    processor = BatchProcessor(num_workers=2, retention="none")
+    processor.start()
+    try:
+        handle = processor.submit_batch([Task(method=HTTPMethod.GET, endpoint=f"/users/{i}") for i in range(3)])
+        assert handle.wait(timeout=30)
+        time.sleep(0.05)
+
+        response = requests.get(processor.metrics_server.url, timeout=5)
+        assert response.status_code == 200
+        assert response.headers["Content-Type"] == CONTENT_TYPE
+        samples = parse(response.text)
+
+        assert samples["batch_processor_queue_depth"] == 0
+        assert samples["batch_processor_workers"] == 2
+        assert samples['batch_processor_tasks_total{status="failed"}'] == 3
+        assert samples['batch_processor_task_attempts_total{attempts="2"}'] == 3
+        assert samples["batch_processor_retries_scheduled_total"] == 3
+        assert samples['batch_processor_http_transport_errors_total{error="ConnectionError"}'] == 6
+        busy = samples['batch_processor_worker_busy_seconds_total{worker="0"}']
+        assert busy >= 0 and samples['batch_processor_worker_idle_seconds_total{worker="0"}'] > 0
+        assert samples['batch_processor_task_end_to_end_seconds_bucket{le="+Inf"}'] == 3
+        assert samples["batch_processor_task_end_to_end_seconds_count"] == 3
+
+        assert requests.get(processor.metrics_server.url.replace("/metrics", "/other"), timeout=5).status_code == 404
+        assert "batch_processor_in_flight" in render_metrics(processor)
+    finally:
+        processor.stop()
+        (config.API_BASE_URL, config.MAX_RETRIES, config.RETRY_DELAY,
+         config.METRICS_ENABLED, config.METRICS_PORT) = saved
+    assert processor.metrics_server is None
+
+def test_port_in_use():
+    """Si el puerto está ocupado el procesador arranca igual, sin endpoint"""
+    blocker = socket.socket()
+    blocker.bind(("127.0.0.1", 0))
+    blocker.listen()
+    saved = (config.METRICS_ENABLED, config.METRICS_PORT)
+    config.METRICS_ENABLED = True
+    config.METRICS_PORT = blocker.getsockname()[1]
+
+    processor = BatchProcessor(num_workers=1, retention="none")
+    try:
+        processor.start()
+        assert processor.metrics_server is None
+        assert processor.is_running and len(processor.workers) == 1
+    finally:
+        processor.stop()
+        config.METRICS_ENABLED, config.METRICS_PORT = saved
+        blocker.close()
+
+if __name__ == "__main__":
+    test_cumulative_counts()
+    test_metrics_endpoint()
+    test_port_in_use()
+    print("✅ Pruebas del endpoint de métricas completadas")
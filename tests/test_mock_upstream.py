@@ -0,0 +1,97 @@
+#!/usr/bin/env python
+"""
+Pruebas del upstream simulado de benchmarks (en proceso, sin el servidor de prueba)
+"""
+
+import sys
+import asyncio
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from aiohttp import test_utils
+
+from benchmarks.mock_upstream import create_app, parse_latency
+
+def run(scenario, **settings):
+    """Ejecuta ``scenario(client)`` contra una aplicación nueva"""
+    async def main():
+        async with test_utils.TestClient(test_utils.TestServer(create_app(**settings))) as client:
+            return await scenario(client)
+    return asyncio.run(main())
+
+async def statuses(client, requests: int = 200):
+    return [(await client.get(f"/users/{i % 20}")).status for i in range(requests)]
+
+def test_seeded_errors_are_deterministic():
+    """Con la misma semilla fallan las mismas peticiones; la tasa se respeta"""
+    first = run(statuses, error_rate=0.2, seed=42)
+    assert first == run(statuses, error_rate=0.2, seed=42)
+    assert first != run(statuses, error_rate=0.2, seed=7)
+    assert 10 <= first.count(503) <= 70
+    assert run(statuses, error_rate=0.0, seed=42).count(503) == 0
+
+def test_request_log_is_bounded():
+    """El log guarda solo las últimas ``log_size`` peticiones, el total sigue contando"""
+    async def scenario(client):
+        await statuses(client, 50)
+        return await (await client.get("/stats")).json()
+
+    stats = run(scenario, log_size=8)
+    assert stats["total_requests"] == 50
+    assert stats["logged_requests"] == 8
+    assert len(stats["last_requests"]) == 8
+    assert stats["last_requests"][-1]["endpoint"] == "/users/9"
+
+def test_routes():
+    """Mismas rutas que test_server.py: ETag/304, PATCH, POST, multi-GET y bulk"""
+    async def scenario(client):
+        response = await client.get("/users/1")
+        etag = response.headers["ETag"]
+        assert (await client.get("/users/1", headers={"If-None-Match": etag})).status == 304
+        assert (await client.get("/users/1000")).status == 404
+
+        patched = await client.patch("/users/1", json={"status": "active", "tags": ["a"], "meta": {"x": 1}})
+        assert (await patched.json())["status"] == "active"
+        response = await client.get("/users/1", headers={"If-None-Match": etag})
+        assert response.status == 200 and response.headers["ETag"] != etag
+
+        created = await client.post("/users", json={"name": "New"})
+        assert created.status == 201 and (await created.json())["id"] == "100"
+
+        items = await (await client.get("/users?ids=1,2,999")).json()
+        assert sorted(items["items"]) == ["1", "2"]
+
+        bulk = await (await client.post("/users/bulk", json=[
+            {"method": "PATCH", "path": "/users/2", "body": {"status": "active"}},
+            {"method": "POST", "path": "/users", "body": {"name": "Bulk"}},
+            {"method": "PATCH", "path": "/users/999", "body": {}}
+        ])).json()
+        assert [result["status"] for result in bulk] == [200, 201, 404]
+        assert (await (await client.get("/health")).json())["status"] == "healthy"
+
+    run(scenario)
+
+def test_etag_is_stable():
+    """El ETag no depende del proceso: dos instancias dan el mismo para el mismo registro"""
+    async def scenario(client):
+        return (await client.get("/users/7")).headers["ETag"]
+    assert run(scenario) == run(scenario)
+
+def test_parse_latency():
+    """Distribuciones de latencia soportadas"""
+    assert parse_latency("0")(None) == 0.0
+    assert parse_latency("fixed:5")(None) == 5.0
+    try:
+        parse_latency("normal:5")
+        assert False, "should have raised ValueError"
+    except ValueError:
+        pass
+
+if __name__ == "__main__":
+    test_seeded_errors_are_deterministic()
+    test_request_log_is_bounded()
+    test_routes()
+    test_etag_is_stable()
+    test_parse_latency()
+    print("✅ Pruebas del upstream simulado completadas")
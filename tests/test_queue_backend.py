@@ -0,0 +1,56 @@
+#!/usr/bin/env python
+"""
+Pruebas del backend de cola persistente (no requieren el servidor de prueba)
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core.queue_backend import SQLiteQueueBackend, MemoryQueueBackend, create_queue_backend
+from models.task import Task, TaskStatus, HTTPMethod
+import os
+import tempfile
+
+def test_recover_unfinished_tasks():
+    """Tras una caída se reentregan las pendientes y las que estaban en vuelo"""
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "queue.db")
+        tasks = [
+            Task(method=HTTPMethod.PATCH, endpoint=f"/users/{i}", data={"n": i})
+            for i in range(6)
+        ]
+
+        backend = SQLiteQueueBackend(path)
+        backend.put_many(tasks)
+
+        # 0-1 terminan, 2 queda en vuelo, 3-5 siguen en cola
+        for _ in range(3):
+            backend.get(timeout=1)
+        for task, status in ((tasks[0], TaskStatus.COMPLETED), (tasks[1], TaskStatus.FAILED)):
+            task.status = status
+            backend.ack(task)
+
+        assert backend.count_by_status() == {"completed": 1, "failed": 1, "processing": 1, "pending": 3}
+        backend.close()  # "caída": nada más se confirma
+
+        restarted = SQLiteQueueBackend(path)
+        try:
+            assert restarted.recover() == 4
+            recovered = [restarted.get(timeout=2) for _ in range(4)]
+            assert [t.task_id for t in recovered] == [t.task_id for t in tasks[2:]]
+            assert recovered[0].data == {"n": 2} and recovered[0].method == HTTPMethod.PATCH
+
+            assert restarted.purge_finished() == 2
+        finally:
+            restarted.close()
+
+def test_factory():
+    assert isinstance(create_queue_backend("memory"), MemoryQueueBackend)
+    assert MemoryQueueBackend().recover() == 0
+
+if __name__ == "__main__":
+    test_recover_unfinished_tasks()
+    test_factory()
+    print("✅ Pruebas del backend de cola completadas")
@@ -0,0 +1,92 @@
+#!/usr/bin/env python
+"""
+Pruebas del control de tasa y concurrencia adaptativa (no requieren el servidor de prueba)
+"""
+
+import sys
+import time
+from email.utils import format_datetime
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from services.rate_limiter import (
+    TokenBucket, AdaptiveConcurrencyLimit, RequestLimiter, parse_retry_after
+)
+from config.settings import config
+
+def test_parse_retry_after():
+    """Retry-After admite segundos y fechas HTTP, acotado a RETRY_AFTER_MAX"""
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("garbage") is None
+    assert parse_retry_after("3") == 3.0
+    assert parse_retry_after("100000") == config.RETRY_AFTER_MAX
+
+    future = format_datetime(datetime.now(timezone.utc) + timedelta(seconds=5), usegmt=True)
+    assert 3 <= parse_retry_after(future) <= 5
+
+def test_token_bucket_rate():
+    """Tras agotar la ráfaga el bucket deja pasar ``rate`` peticiones por segundo"""
+    bucket = TokenBucket(rate=50, burst=5)
+    start = time.monotonic()
+    for _ in range(15):
+        bucket.acquire()
+    elapsed = time.monotonic() - start
+
+    # 5 de ráfaga + 10 a 50/s => ~0.2s
+    assert 0.15 <= elapsed < 1.0
+    assert bucket.throttled > 0
+
+def test_longest_prefix_wins():
+    """Se aplica el límite del prefijo más largo que coincide"""
+    original = config.RATE_LIMITS
+    config.RATE_LIMITS = {"/users": 10.0, "/users/admin": (5.0, 2),
+                          "http://slow.example.com": 1.0}
+    try:
+        limiter = RequestLimiter()
+        assert limiter._bucket_for("http://a/users/admin/1", "/users/admin/1").rate == 5.0
+        assert limiter._bucket_for("http://a/users/1", "/users/1").rate == 10.0
+        assert limiter._bucket_for("http://slow.example.com/x", "/x").rate == 1.0
+        assert limiter._bucket_for("http://a/orders", "/orders") is None
+    finally:
+        config.RATE_LIMITS = original
+
+def test_aimd_limit():
+    """El límite crece con respuestas rápidas y se reduce ante 429"""
+    limit = AdaptiveConcurrencyLimit(initial=4, minimum=1, maximum=8, backoff_ratio=0.5,
+                                     latency_tolerance=2.0, error_threshold=0.2)
+    for _ in range(40):
+        limit.acquire()
+        limit.release(0.01, 200)
+    assert limit.limit > 4
+
+    grown = limit.limit
+    limit.acquire()
+    limit.release(0.01, 429)
+    assert limit.limit == grown * 0.5
+    assert limit.decreases == 1
+
+    # Un 503 aislado por debajo del umbral no reduce
+    limit.acquire()
+    limit.release(0.01, 503)
+    assert limit.decreases == 1
+
+def test_retry_after_pauses_host():
+    """Un Retry-After detiene las siguientes peticiones al mismo host"""
+    limiter = RequestLimiter()
+    permit = limiter.acquire("http://pause.example.com/users")
+    limiter.release(permit, 503, retry_after=0.2)
+
+    assert "pause.example.com" in limiter.stats()["paused_hosts"]
+    start = time.monotonic()
+    limiter.acquire("http://pause.example.com/users")
+    assert time.monotonic() - start >= 0.15
+
+if __name__ == "__main__":
+    test_parse_retry_after()
+    test_token_bucket_rate()
+    test_longest_prefix_wins()
+    test_aimd_limit()
+    test_retry_after_pauses_host()
+    print("✅ Pruebas del control de tasa completadas")
@@ -0,0 +1,102 @@
+#!/usr/bin/env python
+"""
+Pruebas de las plantillas de petición (no requieren el servidor de prueba)
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from models.request_template import RequestTemplate, get_template
+from models.task import Task, TaskStatus, HTTPMethod
+from core.queue_backend import serialize_task, deserialize_task
+from core.statistics import ProcessorStatistics
+from services.api_client import APIClient
+
+HEADERS = {"Authorization": "Bearer token123"}
+
+def test_tasks_share_template_state():
+    """Las tareas de una plantilla comparten cabeceras y se renderizan desde la columna de ids"""
+    template = RequestTemplate(HTTPMethod.GET, "/users/{id}", headers=HEADERS, name="get-user")
+    tasks = template.tasks(range(3), priority=2)
+
+    assert [task.endpoint for task in tasks] == ["/users/0", "/users/1", "/users/2"]
+    assert all(task.headers is HEADERS and task.template is template for task in tasks)
+    assert tasks[0].priority == 2
+    assert tasks[0].to_dict()["template"] == "get-user"
+    assert template.render({"id": 7}) == "/users/7"
+
+    batch = template.batch(range(3))
+    assert batch.headers is HEADERS
+    assert next(iter(batch)).template is template
+
+def test_body_schema():
+    """body_schema exige los campos y sus tipos"""
+    template = RequestTemplate(HTTPMethod.PATCH, "/users/{id}", body_schema={"status": str})
+    assert template.task(1, data={"status": "active"}).data == {"status": "active"}
+
+    for data in (None, {}, {"status": 1}):
+        try:
+            template.task(1, data=data)
+            assert False, "should have raised ValueError"
+        except ValueError:
+            pass
+
+def test_serialized_tasks_keep_template():
+    """Las tareas serializadas en la cola recuperan la plantilla registrada"""
+    template = RequestTemplate(HTTPMethod.GET, "/orders/{id}", headers=HEADERS, name="get-order")
+    restored = deserialize_task(serialize_task(template.task(5)), attempts=1)
+
+    assert restored.template is get_template("get-order")
+    assert restored.endpoint == "/orders/5"
+
+def test_duplicate_names():
+    """Un nombre ya usado por otra definición viva se rechaza; la misma definición se acepta"""
+    template = RequestTemplate(HTTPMethod.GET, "/accounts/{id}", headers=HEADERS, name="get-account")
+    same = RequestTemplate(HTTPMethod.GET, "/accounts/{id}", headers=dict(HEADERS), name="get-account")
+    assert get_template("get-account") is same
+    for kwargs in ({"headers": None}, {"headers": HEADERS, "decode_response": False}):
+        try:
+            RequestTemplate(HTTPMethod.GET, "/accounts/{id}", name="get-account", **kwargs)
+            assert False, "should have raised ValueError"
+        except ValueError:
+            pass
+    assert get_template("get-account") is same
+
+    # Sin referencias la plantilla deja libre su nombre
+    del template, same
+    assert get_template("get-account") is None
+    RequestTemplate(HTTPMethod.GET, "/accounts/{id}", name="get-account")
+
+def test_client_prepares_once_per_template():
+    """APIClient reutiliza el estado preparado salvo que la tarea cambie cabeceras"""
+    template = RequestTemplate(HTTPMethod.GET, "/users/{id}", headers=HEADERS, name="get-user")
+    client = APIClient()
+    first, second = template.tasks([1, 2])
+
+    assert client._prepared(first) is client._prepared(second)
+    assert client._prepared(Task(method=HTTPMethod.GET, endpoint="/users/1")) is None
+    custom = template.task(3)
+    custom.headers = {"Authorization": "Bearer other"}
+    assert client._prepared(custom) is None
+
+def test_statistics_by_template():
+    """Las estadísticas se desglosan por plantilla"""
+    template = RequestTemplate(HTTPMethod.GET, "/users/{id}", name="get-user")
+    statistics = ProcessorStatistics()
+    for status in (TaskStatus.COMPLETED, TaskStatus.COMPLETED, TaskStatus.FAILED):
+        task = template.task(1)
+        task.status = status
+        statistics.record_result(task)
+
+    assert statistics.snapshot()["templates"]["get-user"] == {"completed": 2, "failed": 1}
+
+if __name__ == "__main__":
+    test_tasks_share_template_state()
+    test_body_schema()
+    test_serialized_tasks_keep_template()
+    test_duplicate_names()
+    test_client_prepares_once_per_template()
+    test_statistics_by_template()
+    print("✅ Pruebas de las plantillas de petición completadas")
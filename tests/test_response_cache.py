@@ -0,0 +1,80 @@
+#!/usr/bin/env python
+"""
+Pruebas de la caché de respuestas GET (no requieren el servidor de prueba)
+"""
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from services.response_cache import ResponseCache, cache_key
+
+def test_hit_and_ttl_revalidation():
+    """Una entrada vigente se sirve de caché; caducada se revalida con su ETag"""
+    cache = ResponseCache(ttl=0.1, max_entries=10)
+    key = cache_key("http://api/users/1")
+    seen_etags = []
+
+    def loader(etag):
+        seen_etags.append(etag)
+        if etag == '"v1"':
+            return None, etag  # 304 Not Modified
+        return {"status_code": 200, "response": {"id": 1}}, '"v1"'
+
+    assert cache.fetch(key, loader)[1] == "miss"
+    result, source = cache.fetch(key, loader)
+    assert source == "hit" and result["response"] == {"id": 1}
+
+    time.sleep(0.15)
+    result, source = cache.fetch(key, loader)
+    assert source == "revalidated" and result["response"] == {"id": 1}
+    assert seen_etags == [None, '"v1"']
+    assert cache.stats()["revalidated"] == 1
+
+def test_lru_eviction_and_invalidate():
+    """Se expulsan las entradas menos usadas y se pueden invalidar por URL"""
+    cache = ResponseCache(ttl=60, max_entries=2)
+    loader = lambda etag: ({"status_code": 200, "response": None}, None)
+
+    for url in ("http://api/a", "http://api/b"):
+        cache.fetch(cache_key(url), loader)
+    cache.fetch(cache_key("http://api/a"), loader)  # "a" pasa a ser la más reciente
+    cache.fetch(cache_key("http://api/c"), loader)
+
+    assert cache.stats()["evictions"] == 1
+    assert cache.fetch(cache_key("http://api/a"), loader)[1] == "hit"
+    assert cache.fetch(cache_key("http://api/b"), loader)[1] == "miss"
+
+    cache.invalidate("http://api/a")
+    assert cache.fetch(cache_key("http://api/a"), loader)[1] == "miss"
+
+def test_single_flight():
+    """Los GET idénticos concurrentes comparten una única llamada"""
+    cache = ResponseCache(ttl=60, max_entries=10)
+    key = cache_key("http://api/slow", {"q": 1})
+    calls = []
+
+    def loader(etag):
+        calls.append(etag)
+        time.sleep(0.2)
+        return {"status_code": 200, "response": {"ok": True}}, None
+
+    sources = []
+    threads = [threading.Thread(target=lambda: sources.append(cache.fetch(key, loader)[1]))
+               for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert sorted(sources) == ["coalesced"] * 4 + ["miss"]
+
+if __name__ == "__main__":
+    test_hit_and_ttl_revalidation()
+    test_lru_eviction_and_invalidate()
+    test_single_flight()
+    print("✅ Pruebas de la caché de respuestas completadas")
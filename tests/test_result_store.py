@@ -0,0 +1,69 @@
+#!/usr/bin/env python
+"""
+Pruebas del almacén de resultados con retención acotada (no requieren el servidor de prueba)
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core.result_store import ResultStore, ResultRetention, read_spilled_results
+from core.batch_processor import BatchProcessor
+from core.process_pool_processor import ProcessPoolBatchProcessor
+from models.task import Task, TaskStatus, HTTPMethod
+import tempfile
+import os
+
+def make_task(i: int) -> Task:
+    task = Task(method=HTTPMethod.GET, endpoint=f"/users/{i}")
+    task.status = TaskStatus.FAILED if i % 4 == 0 else TaskStatus.COMPLETED
+    return task
+
+def test_retention_policies():
+    """Cada política acota lo que queda en memoria"""
+    tasks = [make_task(i) for i in range(100)]
+
+    for retention, expected in [
+        (ResultRetention.ALL, 100),
+        (ResultRetention.LAST_N, 10),
+        (ResultRetention.FAILURES, 25),
+        (ResultRetention.NONE, 0),
+    ]:
+        store = ResultStore(retention=retention, keep_last=10)
+        for task in tasks:
+            store.add(task)
+
+        assert len(store) == expected
+
+    assert store.snapshot() == []
+
+def test_listeners_and_spill():
+    """Los listeners y el volcado a disco reciben todas las tareas"""
+    with tempfile.TemporaryDirectory() as directory:
+        spill_path = os.path.join(directory, "results.jsonl")
+        seen = []
+
+        store = ResultStore(retention="none", spill_path=spill_path)
+        store.add_listener(seen.append)
+        for i in range(20):
+            store.add(make_task(i))
+        store.close()
+
+        spilled = list(read_spilled_results(spill_path))
+        assert len(seen) == 20
+        assert [r["task_id"] for r in spilled] == [t.task_id for t in seen]
+
+def test_explicit_keep_last_zero():
+    """keep_last=0 explícito no se sustituye por RESULTS_KEEP_LAST"""
+    for processor in (BatchProcessor(num_workers=1, retention="last_n", keep_last=0),
+                      ProcessPoolBatchProcessor(num_processes=1, retention="last_n", keep_last=0)):
+        processor.result_store.add(make_task(1))
+        assert processor.result_store.snapshot() == []
+        processor.result_store.close()
+
+if __name__ == "__main__":
+    test_retention_policies()
+    test_listeners_and_spill()
+    test_explicit_keep_last_zero()
+    print("✅ Pruebas del almacén de resultados completadas")
@@ -0,0 +1,107 @@
+#!/usr/bin/env python
+"""
+Pruebas del scheduler de reintentos (no requieren el servidor de prueba)
+"""
+
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core.retry_scheduler import RetryScheduler, compute_backoff
+from core.queue_backend import MemoryQueueBackend
+from core.batch_processor import BatchProcessor
+from core.async_batch_processor import AsyncBatchProcessor
+from models.task import Task, TaskStatus, HTTPMethod
+from config.settings import config
+import threading
+
+def test_backoff_bounds():
+    """El backoff crece exponencialmente y respeta RETRY_MAX_DELAY"""
+    for attempt in range(1, 10):
+        ceiling = min(config.RETRY_MAX_DELAY, config.RETRY_DELAY * 2 ** (attempt - 1))
+        for _ in range(20):
+            assert 0 <= compute_backoff(attempt) <= ceiling
+
+def test_requeue_in_due_order():
+    """Las tareas vuelven a la cola por orden de vencimiento"""
+    task_queue = MemoryQueueBackend()
+    stop_event = threading.Event()
+    scheduler = RetryScheduler(task_queue, stop_event)
+    scheduler.start()
+
+    try:
+        late = Task(method=HTTPMethod.GET, endpoint="/users/1")
+        early = Task(method=HTTPMethod.GET, endpoint="/users/2")
+
+        scheduler.schedule(late, delay=0.3)
+        scheduler.schedule(early, delay=0.05)
+
+        assert late.status == TaskStatus.RETRYING
+        assert scheduler.pending_count() == 2
+        assert task_queue.empty()
+
+        assert task_queue.get(timeout=2) is early
+        assert task_queue.get(timeout=2) is late
+        assert scheduler.pending_count() == 0
+
+    finally:
+        stop_event.set()
+        scheduler.stop()
+        scheduler.join(timeout=2)
+
+def test_stop_fails_pending_retries():
+    """Al parar, las tareas que esperaban su reintento fallan y el handle termina"""
+    saved = (config.API_BASE_URL, config.MAX_RETRIES, config.RETRY_DELAY, config.RETRY_MAX_DELAY)
+    # Puerto cerrado y backoff largo: las tareas se quedan esperando su reintento
+    config.API_BASE_URL = "http://127.0.0.1:9"
+    config.MAX_RETRIES = 3
+    config.RETRY_DELAY = config.RETRY_MAX_DELAY = 600
+
+    processor = BatchProcessor(num_workers=1, retention="none")
+    processor.stop()  # sin arrancar: no hace nada
+    processor.start()
+    try:
+        handle = processor.submit_batch([Task(method=HTTPMethod.GET, endpoint=f"/users/{i}") for i in range(3)])
+        deadline = time.monotonic() + 10
+        while processor.retry_scheduler.pending_count() < 3 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert processor.retry_scheduler.pending_count() == 3
+    finally:
+        processor.stop()
+        (config.API_BASE_URL, config.MAX_RETRIES, config.RETRY_DELAY, config.RETRY_MAX_DELAY) = saved
+
+    assert handle.wait(timeout=5)
+    assert all(task.status == TaskStatus.FAILED for task in handle.tasks)
+    assert handle.tasks[0].error_message.startswith("Processor stopped before retrying")
+    assert processor.retry_scheduler.pending_count() == 0
+
+def test_async_stop_fails_pending_tasks():
+    """El motor asyncio también completa como fallidas las tareas canceladas al parar"""
+    saved = (config.API_BASE_URL, config.MAX_RETRIES, config.RETRY_DELAY, config.RETRY_MAX_DELAY)
+    config.API_BASE_URL = "http://127.0.0.1:9"
+    config.MAX_RETRIES = 3
+    config.RETRY_DELAY = config.RETRY_MAX_DELAY = 600
+
+    processor = AsyncBatchProcessor(max_in_flight=2)
+    processor.start()
+    try:
+        handle = processor.submit_batch([Task(method=HTTPMethod.GET, endpoint=f"/users/{i}") for i in range(5)])
+        deadline = time.monotonic() + 10
+        while processor.retrying < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+    finally:
+        processor.stop()
+        (config.API_BASE_URL, config.MAX_RETRIES, config.RETRY_DELAY, config.RETRY_MAX_DELAY) = saved
+
+    assert handle.wait(timeout=5)
+    assert all(task.status == TaskStatus.FAILED for task in handle.tasks)
+    assert processor.statistics.failed == 5
+
+if __name__ == "__main__":
+    test_backoff_bounds()
+    test_requeue_in_due_order()
+    test_stop_fails_pending_retries()
+    test_async_stop_fails_pending_tasks()
+    print("✅ Pruebas del scheduler de reintentos completadas")
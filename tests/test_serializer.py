@@ -0,0 +1,156 @@
+#!/usr/bin/env python
+"""
+Pruebas de la capa de serialización JSON (no requieren el servidor de prueba)
+"""
+
+import sys
+import asyncio
+import threading
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from services.serializer import JSONSerializer, create_serializer, orjson
+from services.api_client import APIClient, RetryableRequestError, encoded_body, json_headers
+from services.async_api_client import AsyncAPIClient
+from config.settings import config
+from models.task import Task, HTTPMethod
+from log_system.logger import logger
+
+def serializers():
+    return [JSONSerializer()] + ([create_serializer("orjson")] if orjson is not None else [])
+
+def test_round_trip():
+    """Todos los serializadores producen JSON válido y equivalente"""
+    record = {"id": 1, "tags": ["a"], 2: "non-str key", "big": 2 ** 70, "at": datetime(2025, 9, 1)}
+    for serializer in serializers():
+        encoded = serializer.dumps(record)
+        assert isinstance(encoded, bytes)
+        decoded = JSONSerializer().loads(encoded)
+        assert decoded["id"] == 1 and decoded["big"] == 2 ** 70
+        assert decoded["2"] == "non-str key"
+        assert decoded["at"].startswith("2025-09-01")
+        assert serializer.loads(encoded)["tags"] == ["a"]
+
+def test_create_serializer():
+    """"auto" elige orjson si está instalado; nombres desconocidos fallan"""
+    assert create_serializer("json").name == "json"
+    assert create_serializer("auto").name == ("orjson" if orjson is not None else "json")
+    try:
+        create_serializer("yaml")
+        assert False, "should have raised ValueError"
+    except ValueError:
+        pass
+
+def test_body_encoded_once():
+    """El cuerpo se codifica en el primer intento y se reutiliza en los reintentos"""
+    task = Task(method=HTTPMethod.PATCH, endpoint="/users/1", data={"status": "active"})
+    first = encoded_body(task)
+    assert first is encoded_body(task)
+    assert JSONSerializer().loads(first) == {"status": "active"}
+    assert encoded_body(Task(method=HTTPMethod.POST, endpoint="/users")) is None
+
+class _EchoHandler(BaseHTTPRequestHandler):
+    """Devuelve las cabeceras Content-Type recibidas"""
+
+    def do_PATCH(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        body = JSONSerializer().dumps({"content_type": self.headers.get_all("Content-Type")})
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        # 200 con un cuerpo truncado
+        body = b'{"id": 1, "name": "Ju'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+def test_custom_content_type_kept():
+    """El Content-Type del llamador no se sobrescribe ni se duplica"""
+    assert json_headers(None) == {"Content-Type": "application/json"}
+    assert json_headers({"content-type": "text/plain"}) == {"content-type": "text/plain"}
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _EchoHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    saved = config.API_BASE_URL
+    config.API_BASE_URL = f"http://127.0.0.1:{server.server_address[1]}"
+    try:
+        for headers, expected in (({"Content-Type": "application/merge-patch+json"}, "application/merge-patch+json"),
+                                  ({"content-type": "application/merge-patch+json"}, "application/merge-patch+json"),
+                                  (None, "application/json")):
+            task = Task(method=HTTPMethod.PATCH, endpoint="/users/1", data={"status": "active"}, headers=headers)
+            assert APIClient().execute_request(task)["response"]["content_type"] == [expected]
+
+            async def send():
+                client = AsyncAPIClient()
+                await client.open()
+                try:
+                    async_task = Task(method=HTTPMethod.PATCH, endpoint="/users/1",
+                                      data={"status": "active"}, headers=headers)
+                    return await client.execute_request(async_task)
+                finally:
+                    await client.close()
+            assert asyncio.run(send())["response"]["content_type"] == [expected]
+    finally:
+        config.API_BASE_URL = saved
+        server.shutdown()
+        server.server_close()
+
+def test_invalid_json_response():
+    """Un 200 con JSON inválido se reintenta y, sin más intentos, se registra como fallido"""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _EchoHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    saved = (config.API_BASE_URL, config.MAX_RETRIES)
+    config.API_BASE_URL = f"http://127.0.0.1:{server.server_address[1]}"
+    config.MAX_RETRIES = 2
+    transactions = []
+    logger.log_transaction = lambda task_id, data: transactions.append(data)
+
+    async def send(task: Task):
+        client = AsyncAPIClient()
+        await client.open()
+        try:
+            return await client.execute_request(task)
+        finally:
+            await client.close()
+
+    try:
+        for execute in (APIClient().execute_request, lambda task: asyncio.run(send(task))):
+            transactions.clear()
+            task = Task(method=HTTPMethod.GET, endpoint="/users/1")
+            try:
+                execute(task)
+                assert False, "should have raised RetryableRequestError"
+            except RetryableRequestError:
+                pass
+            try:
+                execute(task)
+                assert False, "should have raised ValueError"
+            except ValueError:
+                pass
+            assert task.attempts == 2
+            assert [transaction["status"] for transaction in transactions] == ["failed"]
+    finally:
+        del logger.log_transaction
+        config.API_BASE_URL, config.MAX_RETRIES = saved
+        server.shutdown()
+        server.server_close()
+
+if __name__ == "__main__":
+    test_round_trip()
+    test_create_serializer()
+    test_body_encoded_once()
+    test_custom_content_type_kept()
+    test_invalid_json_response()
+    print("✅ Pruebas de la serialización completadas")
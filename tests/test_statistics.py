@@ -0,0 +1,81 @@
+#!/usr/bin/env python
+"""
+Pruebas de las estadísticas incrementales (no requieren el servidor de prueba)
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core.statistics import (LatencyHistogram, ThroughputWindow, ProcessorStatistics, endpoint_pattern,
+                             MAX_ENDPOINT_PATTERNS, OTHER_ENDPOINTS)
+from models.task import Task, TaskStatus, HTTPMethod
+from datetime import timedelta
+
+def test_endpoint_pattern():
+    assert endpoint_pattern("/users/42") == "/users/{id}"
+    assert endpoint_pattern("/users/42/orders/7?x=1") == "/users/{id}/orders/{id}"
+    assert endpoint_pattern("/orders/0c456478-f3f4-4d11-b4a2-4b14b76b8150") == "/orders/{id}"
+    assert endpoint_pattern("/health") == "/health"
+
+def test_histogram_percentiles():
+    """Los percentiles estimados quedan dentro del ~10% del valor real"""
+    histogram = LatencyHistogram()
+    for value in range(1, 1001):
+        histogram.record(float(value))
+
+    p50, p90, p99 = histogram.percentiles()
+    assert 500 <= p50 <= 550
+    assert 900 <= p90 <= 990
+    assert 990 <= p99 <= 1000
+    assert histogram.summary()["max"] == 1000.0
+
+def test_throughput_window():
+    window = ThroughputWindow()
+    for second in range(100, 110):
+        for _ in range(5):
+            window.record(now=second + 0.5)
+
+    assert window.rate(10, now=110) == 5.0
+    assert window.rate(60, now=200) == 0.0
+
+def test_processor_statistics():
+    statistics = ProcessorStatistics()
+    for i in range(10):
+        task = Task(method=HTTPMethod.GET if i % 2 else HTTPMethod.PATCH, endpoint=f"/users/{i}")
+        task.status = TaskStatus.COMPLETED if i < 8 else TaskStatus.FAILED
+        task.attempts = 1 if i < 6 else 3
+        task.started_at = task.created_at + timedelta(milliseconds=5)
+        task.completed_at = task.started_at + timedelta(milliseconds=100)
+        statistics.record_result(task)
+
+    stats = statistics.snapshot()
+    assert (stats["total_processed"], stats["completed"], stats["failed"]) == (10, 8, 2)
+    assert stats["attempts"] == {1: 6, 3: 4}
+    assert stats["latency_ms"]["by_method"]["GET"]["count"] == 5
+    assert stats["latency_ms"]["by_endpoint"]["/users/{id}"]["count"] == 10
+    assert 95 <= stats["latency_ms"]["processing"]["p50"] <= 110
+
+def test_endpoint_patterns_capped():
+    """Los patrones por encima del límite van al bucket "other" """
+    statistics = ProcessorStatistics()
+    for i in range(MAX_ENDPOINT_PATTERNS + 50):
+        task = Task(method=HTTPMethod.GET, endpoint=f"/search/term{i}")
+        task.status = TaskStatus.COMPLETED
+        task.started_at = task.created_at
+        task.completed_at = task.started_at + timedelta(milliseconds=10)
+        statistics.record_result(task)
+
+    by_endpoint = statistics.snapshot()["latency_ms"]["by_endpoint"]
+    assert len(by_endpoint) == MAX_ENDPOINT_PATTERNS + 1
+    assert by_endpoint[OTHER_ENDPOINTS]["count"] == 50
+    assert by_endpoint["/search/term0"]["count"] == 1
+
+if __name__ == "__main__":
+    test_endpoint_pattern()
+    test_histogram_percentiles()
+    test_throughput_window()
+    test_processor_statistics()
+    test_endpoint_patterns_capped()
+    print("✅ Pruebas de estadísticas completadas")
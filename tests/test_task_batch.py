@@ -0,0 +1,74 @@
+#!/usr/bin/env python
+"""
+Pruebas del batch columnar de tareas (no requieren el servidor de prueba)
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from models.task import Task, TaskStatus, HTTPMethod
+from models.task_batch import TaskBatch
+from core.batch_handle import TaskBatchHandle
+
+def test_round_trip():
+    """Los Task materializados conservan método, endpoint, cuerpo y datos del batch"""
+    batch = TaskBatch(headers={"Authorization": "Bearer token123"}, priority=5, tenant="acme")
+    batch.append(HTTPMethod.GET, "/users/42")
+    batch.append(HTTPMethod.PATCH, "/users/7/posts", data={"status": "active"})
+    batch.append(HTTPMethod.GET, "/users/007")
+    batch.append(HTTPMethod.DELETE, "/health")
+
+    tasks = list(batch)
+    assert [task.endpoint for task in tasks] == ["/users/42", "/users/7/posts", "/users/007", "/health"]
+    assert tasks[1].method == HTTPMethod.PATCH and tasks[1].data == {"status": "active"}
+    assert tasks[0].data is None
+    assert all(task.headers is batch.headers for task in tasks)
+    assert tasks[2].task_id == f"{batch.batch_id}:2"
+    assert tasks[3].priority == 5 and tasks[3].tenant == "acme"
+    assert tasks[3].batch_id == batch.batch_id
+    assert batch.to_dict(1)["endpoint"] == "/users/7/posts"
+    assert batch.to_dict(1)["created_at"] == tasks[1].created_at.isoformat()
+
+def test_templates_are_interned():
+    """Los endpoints con id numérico comparten plantilla"""
+    batch = TaskBatch.from_tasks(Task(method=HTTPMethod.GET, endpoint=f"/users/{i}") for i in range(1000))
+    assert len(batch) == 1000
+    assert len(batch._template_table) == 1
+    assert batch.nbytes() < 1000 * 32
+
+def test_wide_ids_and_invalid_methods():
+    """Un id mayor que int64 se guarda literal; un método inválido no deja el batch a medias"""
+    batch = TaskBatch()
+    batch.append(HTTPMethod.GET, "/orders/123456789012345678901234")
+    batch.append(HTTPMethod.GET, f"/orders/{2 ** 63 - 1}/items")
+    assert batch.task(0).endpoint == "/orders/123456789012345678901234"
+    assert batch.task(1).endpoint == f"/orders/{2 ** 63 - 1}/items"
+
+    try:
+        batch.append("TRACE", "/orders/1")
+        assert False, "should have raised KeyError"
+    except KeyError:
+        pass
+    assert len(batch) == 2
+    assert [task.endpoint for task in batch][-1] == f"/orders/{2 ** 63 - 1}/items"
+
+def test_handle_counts_results():
+    """TaskBatchHandle termina cuando ha contado todas las tareas"""
+    handle = TaskBatchHandle("batch", 2)
+    ok = Task(method=HTTPMethod.GET, endpoint="/users/1", status=TaskStatus.COMPLETED)
+    failed = Task(method=HTTPMethod.GET, endpoint="/users/2", status=TaskStatus.FAILED)
+
+    handle._task_done(ok)
+    assert not handle.wait(timeout=0.01)
+    handle._task_done(failed)
+    assert handle.wait(timeout=0.01)
+    assert handle.failed == 1 and handle.pending_count() == 0
+
+if __name__ == "__main__":
+    test_round_trip()
+    test_templates_are_interned()
+    test_wide_ids_and_invalid_methods()
+    test_handle_counts_results()
+    print("✅ Pruebas del batch columnar completadas")
@@ -0,0 +1,134 @@
+#!/usr/bin/env python
+"""
+Pruebas de los tiempos por etapa y del profiler por muestreo (no requieren el servidor de prueba)
+"""
+
+import sys
+import json
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core.tracing import StageTracer, mark, spans
+from core.profiler import SamplingProfiler
+from models.task import Task, HTTPMethod
+
+def traced_task(tracer: StageTracer) -> Task:
+    """Tarea que recorre todas las etapas con un intento fallido"""
+    task = Task(method=HTTPMethod.GET, endpoint="/users/42")
+    tracer.start(task)
+    for stage in ("dequeued", "request_sent", "response_received"):
+        mark(task, stage)
+    mark(task, "enqueued")  # reintento
+    for stage in ("dequeued", "request_sent", "response_received", "decoded", "logged"):
+        mark(task, stage)
+    task.attempts = 2
+    tracer.record(task)
+    return task
+
+def test_disabled_tracer_is_noop():
+    """Sin TRACE_ENABLED las tareas no llevan marcas"""
+    tracer = StageTracer(enabled=False)
+    task = Task(method=HTTPMethod.GET, endpoint="/users/1")
+    tracer.start(task)
+    mark(task, "dequeued")
+    tracer.record(task)
+    assert task.timings is None
+    assert tracer.summary()["traced"] == 0
+
+def test_stage_histograms():
+    """Cada marca cierra un tramo; los tramos son monotónicos y se acumulan por nombre"""
+    tracer = StageTracer(enabled=True)
+    task = traced_task(tracer)
+
+    assert [stage for stage, _, _ in task.timings][-1] == "collected"
+    names = [name for name, _, _, _ in spans(task.timings)]
+    assert names == ["queue_wait", "dispatch", "request", "retry_wait",
+                     "queue_wait", "dispatch", "request", "decode", "log", "collect"]
+    assert all(end >= start for _, start, end, _ in spans(task.timings))
+
+    summary = tracer.summary()
+    assert summary["traced"] == 1
+    assert summary["stages"]["queue_wait"]["count"] == 2
+    assert list(summary["stages"])[0] == "retry_wait"
+
+def test_sampling():
+    """Con sample_rate solo se traza una fracción de las tareas"""
+    tracer = StageTracer(enabled=True, sample_rate=0.1)
+    tasks = [Task(method=HTTPMethod.GET, endpoint="/users/1") for _ in range(1000)]
+    for task in tasks:
+        tracer.start(task)
+    traced = sum(1 for task in tasks if task.timings is not None)
+    assert 30 < traced < 200
+
+    # Fracciones que no son 1/n también se respetan
+    tracer = StageTracer(enabled=True, sample_rate=0.4)
+    for task in tasks:
+        task.timings = None
+        tracer.start(task)
+    assert 300 < sum(1 for task in tasks if task.timings is not None) < 500
+
+def test_export_formats():
+    """Chrome Trace: eventos "X" en µs; OTLP: una traza por tarea con un span por tramo"""
+    tracer = StageTracer(enabled=True, buffer_size=2)
+    for _ in range(3):
+        traced_task(tracer)
+
+    with tempfile.TemporaryDirectory() as directory:
+        chrome_path = Path(directory) / "trace.json"
+        assert tracer.export(str(chrome_path)) == 2
+        events = json.loads(chrome_path.read_text())["traceEvents"]
+        assert len(events) == 2 * 10
+        assert {event["ph"] for event in events} == {"X"}
+        assert events[0]["args"]["endpoint"] == "/users/{id}"
+        assert abs(events[0]["ts"] / 1e6 - time.time()) < 60
+
+        otlp_path = Path(directory) / "trace.otlp.json"
+        tracer.export(str(otlp_path), format="otlp")
+        otlp_spans = json.loads(otlp_path.read_text())["resourceSpans"][0]["scopeSpans"][0]["spans"]
+        assert len(otlp_spans) == 2 * 11
+        root = otlp_spans[0]
+        assert root["name"] == "GET /users/{id}" and len(root["traceId"]) == 32
+        assert all(span["parentSpanId"] == root["spanId"] for span in otlp_spans[1:11])
+
+        try:
+            tracer.export(str(chrome_path), format="pprof")
+            assert False, "should have raised ValueError"
+        except ValueError:
+            pass
+
+def test_sampling_profiler():
+    """El profiler cuenta las pilas de los threads vigilados y las exporta en formato collapsed"""
+    stop = threading.Event()
+
+    def busy_loop():
+        while not stop.is_set():
+            sum(range(1000))
+
+    thread = threading.Thread(target=busy_loop, daemon=True)
+    thread.start()
+    profiler = SamplingProfiler(interval=0.001, threads=[thread])
+    profiler.start()
+    time.sleep(0.2)
+    profiler.stop()
+    stop.set()
+    thread.join()
+
+    assert profiler.total_samples > 0
+    assert any("test_tracing:busy_loop" in stack for stack in profiler.samples)
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "profile.folded"
+        assert profiler.export(str(path)) == profiler.total_samples
+        line = path.read_text().splitlines()[0]
+        assert line.rsplit(" ", 1)[1].isdigit() and ";" in line
+
+if __name__ == "__main__":
+    test_disabled_tracer_is_noop()
+    test_stage_histograms()
+    test_sampling()
+    test_export_formats()
+    test_sampling_profiler()
+    print("✅ Pruebas de los tiempos por etapa completadas")
@@ -0,0 +1,88 @@
+#!/usr/bin/env python
+"""
+Pruebas del escritor de transacciones por segmentos (no requieren el servidor de prueba)
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from log_system.transaction_writer import TransactionWriter, find_transactions, iter_transactions
+from log_system.transaction_store import TransactionStore
+import tempfile
+
+def test_segments_rotate_and_index_lookup():
+    """Los registros se escriben en segmentos rotados y se localizan por task_id"""
+    with tempfile.TemporaryDirectory() as directory:
+        writer = TransactionWriter(directory, segment_max_bytes=200, flush_batch=2)
+        writer.start()
+
+        for i in range(20):
+            writer.write({"task_id": f"task-{i % 5}", "status": "success", "attempt": i})
+        writer.close()
+
+        segments = list(Path(directory).glob("segment_*.jsonl"))
+        assert len(segments) > 1
+        assert len(list(iter_transactions(directory))) == 20
+
+        found = find_transactions(directory, "task-3")
+        assert [t["attempt"] for t in found] == [3, 8, 13, 18]
+
+def test_gzip_segments():
+    """Los segmentos comprimidos se leen igual que los planos"""
+    with tempfile.TemporaryDirectory() as directory:
+        writer = TransactionWriter(directory, compression="gzip")
+        writer.start()
+
+        for i in range(10):
+            writer.write({"task_id": f"task-{i}", "status": "failed"})
+        assert writer.flush(timeout=5)
+
+        assert find_transactions(directory, "task-7")[0]["status"] == "failed"
+        writer.close()
+
+        assert list(Path(directory).glob("segment_*.jsonl.gz"))
+
+def test_drop_backpressure():
+    """Con el buffer lleno la política 'drop' descarta en vez de bloquear"""
+    with tempfile.TemporaryDirectory() as directory:
+        writer = TransactionWriter(directory, buffer_size=5, backpressure="drop")
+
+        # Sin arrancar el thread el buffer no se vacía
+        accepted = [writer.write({"task_id": str(i)}) for i in range(8)]
+        assert accepted.count(True) == 5
+        assert writer.dropped == 3
+
+def test_store_queries():
+    """El índice filtra por estado, endpoint (glob) y rango temporal"""
+    with tempfile.TemporaryDirectory() as directory:
+        writer = TransactionWriter(directory)
+        writer.start()
+
+        for i in range(30):
+            writer.write({
+                "timestamp": f"2025-09-01T15:{i:02d}:00",
+                "task_id": f"task-{i}",
+                "endpoint": f"/users/{i}" if i % 2 else "/orders",
+                "request": {"method": "GET"},
+                "status": "failed" if i % 3 == 0 else "success"
+            })
+        writer.close()
+
+        store = TransactionStore(directory)
+        try:
+            failed = store.find(status="failed", endpoint="/users/*",
+                                since="2025-09-01T15:05", until="2025-09-01T15:20")
+            assert [t["task_id"] for t in failed] == ["task-9", "task-15"]
+            assert store.count(endpoint="/orders") == 15
+            assert store.find(task_id="task-4")[0]["endpoint"] == "/orders"
+        finally:
+            store.close()
+
+if __name__ == "__main__":
+    test_segments_rotate_and_index_lookup()
+    test_gzip_segments()
+    test_drop_backpressure()
+    test_store_queries()
+    print("✅ Pruebas del escritor de transacciones completadas")
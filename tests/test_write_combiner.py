@@ -0,0 +1,96 @@
+#!/usr/bin/env python
+"""
+Pruebas de la fusión de PATCH al mismo recurso (no requieren el servidor de prueba)
+"""
+
+import sys
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core.write_combiner import WriteCombiner
+from models.task import Task, TaskStatus, HTTPMethod
+from models.request_template import RequestTemplate
+
+def test_combine_in_submission_order():
+    """Los PATCH consecutivos al mismo endpoint se fusionan; gana la última escritura por clave"""
+    combiner = WriteCombiner()
+    tasks = [
+        Task(method=HTTPMethod.PATCH, endpoint="/users/1", data={"status": "active", "name": "A"}),
+        Task(method=HTTPMethod.PATCH, endpoint="/users/2", data={"status": "active"}),
+        Task(method=HTTPMethod.PATCH, endpoint="/users/1", data={"status": "inactive"}),
+    ]
+
+    dispatch = combiner.combine(tasks)
+
+    assert len(dispatch) == 2
+    combined = dispatch[0]
+    assert combined.task_id not in {task.task_id for task in tasks}
+    assert combined.data == {"status": "inactive", "name": "A"}
+    assert dispatch[1] is tasks[1]
+    assert combiner.stats()["saved_requests"] == 1
+
+def test_other_method_breaks_run():
+    """Un GET entre dos PATCH al mismo recurso no ve la segunda escritura adelantada"""
+    combiner = WriteCombiner()
+    tasks = [
+        Task(method=HTTPMethod.PATCH, endpoint="/users/1", data={"status": "active"}),
+        Task(method=HTTPMethod.GET, endpoint="/users/1?fields=status"),
+        Task(method=HTTPMethod.PATCH, endpoint="/users/1", data={"status": "inactive"}),
+        Task(method=HTTPMethod.PATCH, endpoint="/users/1", data={"name": "B"}),
+    ]
+
+    dispatch = combiner.combine(tasks)
+
+    assert dispatch[:2] == tasks[:2]
+    assert dispatch[2].data == {"status": "inactive", "name": "B"}
+    assert len(dispatch) == 3
+
+def test_different_headers_not_combined():
+    """PATCH con cabeceras distintas no se mezclan"""
+    combiner = WriteCombiner()
+    tasks = [
+        Task(method=HTTPMethod.PATCH, endpoint="/users/1", data={"a": 1}, headers={"X-Tenant": "a"}),
+        Task(method=HTTPMethod.PATCH, endpoint="/users/1", data={"a": 2}, headers={"X-Tenant": "b"}),
+    ]
+    assert combiner.combine(tasks) == tasks
+
+def test_different_templates_not_combined():
+    """PATCH con plantillas distintas no se mezclan"""
+    combiner = WriteCombiner()
+    first = RequestTemplate(HTTPMethod.PATCH, "/users/{id}", name="combiner-a")
+    second = RequestTemplate(HTTPMethod.PATCH, "/users/{id}", name="combiner-b", decode_response=False)
+    tasks = [first.task(1, data={"a": 1}), second.task(1, data={"a": 2})]
+    assert combiner.combine(tasks) == tasks
+
+def test_expand_fans_out_result():
+    """El resultado de la petición combinada se copia a cada tarea original"""
+    combiner = WriteCombiner()
+    originals = [Task(method=HTTPMethod.PATCH, endpoint="/users/3", data={"n": i}) for i in range(3)]
+    combined = combiner.combine(originals)[0]
+
+    combined.status = TaskStatus.COMPLETED
+    combined.attempts = 2
+    combined.completed_at = datetime.now()
+    combined.response_data = {"status_code": 200, "response": {"n": 2}}
+
+    expanded = combiner.expand(combined)
+    assert expanded == originals
+    for task in expanded:
+        assert task.status == TaskStatus.COMPLETED
+        assert task.attempts == 2
+        assert task.response_data["response"] == {"n": 2}
+
+    # Una tarea no combinada se devuelve tal cual
+    single = Task(method=HTTPMethod.GET, endpoint="/users/3")
+    assert combiner.expand(single) == [single]
+    assert combiner.stats()["pending_groups"] == 0
+
+if __name__ == "__main__":
+    test_combine_in_submission_order()
+    test_other_method_breaks_run()
+    test_different_headers_not_combined()
+    test_different_templates_not_combined()
+    test_expand_fans_out_result()
+    print("✅ Pruebas de la fusión de escrituras completadas")